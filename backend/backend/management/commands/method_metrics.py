@@ -0,0 +1,82 @@
+"""
+This module contains a Django management command for exporting metrics of
+methods decorated with log_method.
+
+For detailed usage instructions, refer to the docstring of the Command class.
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend.shared_utils.metrics.method_metrics import MethodMetricsRegistry
+
+
+class Command(BaseCommand):
+    """
+    Merges and prints metrics of methods decorated with log_method.
+
+    Processes running with LOG_METHOD_METRICS = True dump their metrics
+    (call counts, error counts and latency histograms) into
+    LOG_METHOD_METRICS_DIR when they exit. This command merges all dumps
+    and prints them as a table sorted by total time spent in each method,
+    with p50/p95/p99 latencies.
+
+    Example usage:
+        ```bash
+        $ python manage.py method_metrics
+        $ python manage.py method_metrics --json
+        $ python manage.py method_metrics --clear
+        ```
+
+    Note:
+        Metrics of a running web process are available at
+        /metrics/methods/ when LOG_METHOD_METRICS_ENDPOINT is enabled.
+    """
+
+    help = 'Print merged metrics of methods decorated with log_method'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            type=Path,
+            default=getattr(settings, 'LOG_METHOD_METRICS_DIR', None),
+            help='Directory with metrics dumps (LOG_METHOD_METRICS_DIR)',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the merged snapshot as JSON',
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete the dumps after printing them',
+        )
+
+    def handle(self, *args, **options):
+        directory = options['dir']
+        if not directory or not Path(directory).is_dir():
+            self.stdout.write(self.style.WARNING(
+                f"No metrics directory found: {directory}. "
+                "Enable LOG_METHOD_METRICS and LOG_METHOD_METRICS_DIR."))
+            return
+
+        registry = MethodMetricsRegistry()
+        merged = registry.load_dumps(directory)
+        if not merged:
+            self.stdout.write(self.style.WARNING(
+                f"No metrics dumps found in {directory}."))
+            return
+
+        if options['json']:
+            self.stdout.write(json.dumps(registry.snapshot(), indent=2))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged metrics from {merged} process(es):"))
+            self.stdout.write(registry.render_text())
+
+        if options['clear']:
+            for file_path in Path(directory).glob('method_metrics_*.json'):
+                file_path.unlink()
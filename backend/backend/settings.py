@@ -1,5 +1,8 @@
 from pathlib import Path
 import logging
+import os
+
+from backend.shared_utils.database.database_config import postgres_database
 
 # Base directory path
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -14,6 +17,7 @@ AUTH_USER_MODEL = 'users.CustomUser'
 
 # Installed applications
 INSTALLED_APPS = [
+    'backend',
     'users',
     'img_manager',
 
@@ -59,17 +63,33 @@ TEMPLATES = [
 # WSGI application
 WSGI_APPLICATION = 'backend.wsgi.application'
 
-# Database configuration (PostgreSQL)
+# Database configuration (PostgreSQL). Connection parameters can be
+# overridden by DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT.
+# Connections persist for DB_CONN_MAX_AGE seconds (60) and are checked before
+# reuse (DB_CONN_HEALTH_CHECKS). DB_POOL=true switches to a psycopg 3
+# connection pool per process (pip install "psycopg[pool]") sized by
+# DB_POOL_MIN_SIZE (2) and DB_POOL_MAX_SIZE (10); keep MAX_SIZE x processes
+# below max_connections of the server.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+    'default': postgres_database(defaults={
         'NAME': 'custom_user_base',
         'USER': 'postgres',
         'PASSWORD': 'QPYM#&@ds24$-x',
         'HOST': 'localhost',
         'PORT': '5432',
-    }
+    }),
 }
+# Read replica used by read-only maintenance scans and reports (integrity
+# check, report generator) when DB_REPLICA_HOST is set. Other DB_REPLICA_*
+# variables default to the primary ones. Writes always go to the primary.
+if os.environ.get('DB_REPLICA_HOST'):
+    DATABASES['replica'] = postgres_database(
+        defaults=DATABASES['default'], prefix='DB_REPLICA_')
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = [
+    'backend.shared_utils.database.primary_replica_router.PrimaryReplicaRouter',
+]
+PROFILE_IMAGE_READ_DATABASE = 'replica' if 'replica' in DATABASES else 'default'
 
 # Password validation settings
 AUTH_PASSWORD_VALIDATORS = [
@@ -99,6 +119,74 @@ STATIC_URL = 'static/'
 # Default auto field setting
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Logging of methods decorated with log_method. Methods are only wrapped when
+# the 'backend.shared_utils.decorators.log_method' logger is enabled for DEBUG;
+# False strips the decorator entirely (e.g. in production).
+LOG_METHOD_ENABLED = DEBUG
+
+# In-process metrics of methods decorated with log_method (call and error
+# counts, latency histograms), collected independently of the logging level.
+# Every process dumps its metrics into LOG_METHOD_METRICS_DIR at exit,
+# `python manage.py method_metrics` merges and prints them.
+LOG_METHOD_METRICS = False
+LOG_METHOD_METRICS_DIR = BASE_DIR / 'method_metrics'
+# Serve metrics of the running web process as text at /metrics/methods/
+# (only for staff users and addresses listed in INTERNAL_IPS).
+LOG_METHOD_METRICS_ENDPOINT = False
+
+# Deferred processing of uploaded profile images. When enabled, the request
+# only stores the upload and `python manage.py process_profile_image_queue`
+# creates the images; users keep their previous images until then.
+PROFILE_IMAGE_UPLOAD_DEFERRED = False
+# Attempts per upload, delay before the first retry (doubled for every next
+# one) and seconds after which a job left running by a crashed worker is
+# claimed again.
+PROFILE_IMAGE_QUEUE_MAX_ATTEMPTS = 3
+PROFILE_IMAGE_QUEUE_RETRY_DELAY = 30
+PROFILE_IMAGE_QUEUE_LOCK_TIMEOUT = 600
+# Uploads are rejected from their header when they declare more pixels than
+# this multiple of the master area (400 x 400 x 400 = 64 Mpx).
+PROFILE_IMAGE_UPLOAD_PIXEL_FACTOR = 400
+# New users reference default images stored once in MEDIA_ROOT (named by
+# content hash) instead of getting their own copies.
+PROFILE_IMAGE_SHARED_DEFAULTS = True
+# Fan-out of profile image directories: images are stored in SHARD_LEVELS
+# levels of subdirectories named by SHARD_WIDTH characters of the hash of the
+# image name (e.g. master/3f/a0/<name> with 2 levels); 0 keeps all files of a
+# type in one directory. After changing the layout run
+# `python manage.py migrate_profile_image_layout`.
+PROFILE_IMAGE_SHARD_LEVELS = 0
+PROFILE_IMAGE_SHARD_WIDTH = 2
+# Storage of profile images: 'local' (MEDIA_ROOT) or 'object_store', a
+# bucket-like key/value layout so web nodes need no shared filesystem. The
+# object store is stood in for by a local directory (ROOT/BUCKET/<key>);
+# UPLOAD_CONCURRENCY is the size of the thread pool uploading images.
+PROFILE_IMAGE_STORAGE_BACKEND = 'local'
+PROFILE_IMAGE_OBJECT_STORE_ROOT = BASE_DIR / 'object_store'
+PROFILE_IMAGE_OBJECT_STORE_BUCKET = 'profile-images'
+PROFILE_IMAGE_UPLOAD_CONCURRENCY = 4
+# Thumbnails appended into large segment files with an offset index keyed by
+# image name (read through mmap) instead of one file per thumbnail. Space of
+# replaced thumbnails is reclaimed by `python manage.py compact_thumbnail_pack`,
+# which keeps entries younger than GRACE seconds even when not yet assigned.
+PROFILE_IMAGE_THUMBNAIL_PACK = False
+PROFILE_IMAGE_THUMBNAIL_PACK_DIR = BASE_DIR / 'thumbnail_pack'
+PROFILE_IMAGE_THUMBNAIL_PACK_SEGMENT_SIZE = 256 * 1024 * 1024
+PROFILE_IMAGE_THUMBNAIL_PACK_GRACE = 3600
+# Avatars are served at /avatars/. Versioned URLs (containing the image name)
+# are cached as immutable for CACHE_MAX_AGE seconds. Bodies of local media
+# files are offloaded to the web server with SENDFILE = 'x-sendfile' (Apache
+# mod_xsendfile) or 'x-accel-redirect' (nginx internal location SENDFILE_PREFIX
+# aliased to MEDIA_ROOT); '' streams them from Django.
+PROFILE_IMAGE_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+PROFILE_IMAGE_SENDFILE = ''
+PROFILE_IMAGE_SENDFILE_PREFIX = '/protected-media/'
+# Batch lookup of avatar URLs (/avatars/lookup/): most users per call, and
+# size and lifetime (seconds) of the per-process cache of looked up users.
+PROFILE_IMAGE_LOOKUP_MAX = 100
+PROFILE_IMAGE_LOOKUP_CACHE_SIZE = 10000
+PROFILE_IMAGE_LOOKUP_CACHE_TTL = 60
+
 # # Logging to console
 # LOGGING = {
 #     'version': 1,
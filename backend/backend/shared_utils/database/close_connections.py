@@ -0,0 +1,16 @@
+from django.db import connections
+
+
+def close_connections_before_fork() -> None:
+    """Close all database connections and pools before forking workers.
+
+    Forked worker processes must not share the sockets of this process.
+    ``connections.close_all()`` only returns pooled connections to their
+    pool, so the pools (DATABASES OPTIONS 'pool') are closed as well; they
+    are opened again on the next query of this process.
+    """
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        close_pool = getattr(connection, 'close_pool', None)
+        if close_pool is not None and connection.settings_dict['OPTIONS'].get('pool'):
+            close_pool()
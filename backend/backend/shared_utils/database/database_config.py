@@ -0,0 +1,95 @@
+import os
+from typing import Any, Dict, Mapping, Optional
+
+from django.core.exceptions import ImproperlyConfigured
+
+# Connection parameters read from <prefix><parameter> (e.g. DB_HOST)
+CONNECTION_KEYS = ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')
+
+# Options of the psycopg 3 pool, their variables (after the prefix) and
+# defaults
+POOL_ENV = {
+    'min_size': ('POOL_MIN_SIZE', 2),
+    'max_size': ('POOL_MAX_SIZE', 10),
+    'timeout': ('POOL_TIMEOUT', 10),
+    'max_idle': ('POOL_MAX_IDLE', 600),
+    'max_lifetime': ('POOL_MAX_LIFETIME', 3600),
+}
+
+# Lifetime of persistent connections (seconds) when pooling is disabled
+DEFAULT_CONN_MAX_AGE = 60
+
+
+def postgres_database(defaults: Mapping[str, str],
+                      environ: Optional[Mapping[str, str]] = None,
+                      prefix: str = 'DB_') -> Dict[str, Any]:
+    """Return the DATABASES entry of PostgreSQL configured by environment.
+
+    Connection parameters are read from DB_NAME, DB_USER, DB_PASSWORD,
+    DB_HOST and DB_PORT (``defaults`` otherwise). With DB_POOL each process
+    keeps a psycopg 3 connection pool (requires ``psycopg[pool]``) sized by
+    DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE, waiting at most DB_POOL_TIMEOUT
+    seconds for a free connection; Django then needs CONN_MAX_AGE = 0.
+    Without a pool connections persist for DB_CONN_MAX_AGE seconds. Both
+    are checked before reuse unless DB_CONN_HEALTH_CHECKS is false.
+    Another database (e.g. a read replica) uses another ``prefix``
+    (DB_REPLICA_HOST, ...).
+
+    Args:
+        defaults (Mapping[str, str]): Connection parameters used when their
+            variable is not set (keys of CONNECTION_KEYS).
+        environ (Optional[Mapping[str, str]]): Environment (os.environ if
+            None).
+        prefix (str): Prefix of the variables.
+
+    Returns:
+        Dict[str, Any]: Settings of one database.
+
+    Raises:
+        ImproperlyConfigured: If a variable has an invalid value.
+    """
+    environ = os.environ if environ is None else environ
+    database: Dict[str, Any] = {'ENGINE': 'django.db.backends.postgresql'}
+    for key in CONNECTION_KEYS:
+        database[key] = environ.get(prefix + key, defaults.get(key, ''))
+
+    database['CONN_HEALTH_CHECKS'] = _env_bool(
+        environ, f'{prefix}CONN_HEALTH_CHECKS', True)
+    if _env_bool(environ, f'{prefix}POOL', False):
+        pool = {option: _env_int(environ, prefix + variable, default)
+                for option, (variable, default) in POOL_ENV.items()}
+        if pool['min_size'] > pool['max_size']:
+            raise ImproperlyConfigured(
+                f"{prefix}POOL_MIN_SIZE must not be larger than "
+                f"{prefix}POOL_MAX_SIZE.")
+        database['OPTIONS'] = {'pool': pool}
+        database['CONN_MAX_AGE'] = 0
+    else:
+        database['OPTIONS'] = {}
+        database['CONN_MAX_AGE'] = _env_int(
+            environ, f'{prefix}CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE)
+    return database
+
+
+def _env_bool(environ: Mapping[str, str], name: str, default: bool) -> bool:
+    value = environ.get(name)
+    if value is None or value == '':
+        return default
+    if value.lower() in ('true', '1', 't', 'yes', 'on'):
+        return True
+    if value.lower() in ('false', '0', 'f', 'no', 'off'):
+        return False
+    raise ImproperlyConfigured(f"{name} must be a boolean, not {value!r}.")
+
+
+def _env_int(environ: Mapping[str, str], name: str, default: int) -> int:
+    value = environ.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} must be an integer, not {value!r}.")
+    if number < 0:
+        raise ImproperlyConfigured(f"{name} must not be negative.")
+    return number
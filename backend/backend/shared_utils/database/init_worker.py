@@ -0,0 +1,11 @@
+def init_worker() -> None:
+    """Set up Django in a worker process started without fork.
+
+    Used as the ``initializer`` of process pools; forked workers inherit
+    the set-up apps and skip it. Their database connections must be closed
+    beforehand with ``close_connections_before_fork``.
+    """
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
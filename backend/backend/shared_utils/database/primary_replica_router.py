@@ -0,0 +1,50 @@
+from typing import Optional
+
+from django.db import DEFAULT_DB_ALIAS
+
+from backend.shared_utils.environment.get_setting import get_setting
+
+# Alias of the database receiving all writes
+PRIMARY_DATABASE = DEFAULT_DB_ALIAS
+
+
+def get_read_database(using: Optional[str] = None) -> str:
+    """Return the alias for read-only scans of maintenance and reports.
+
+    Args:
+        using (Optional[str]): Alias chosen by the caller.
+
+    Returns:
+        str: ``using``, or PROFILE_IMAGE_READ_DATABASE (the primary if not
+            set).
+    """
+    if using:
+        return using
+    return get_setting('PROFILE_IMAGE_READ_DATABASE', PRIMARY_DATABASE)
+
+
+class PrimaryReplicaRouter:
+    """Database router keeping writes on the primary database.
+
+    Reads stay on the primary (or on the database of the instance they
+    come from) unless a service asks for a replica with ``using``. Writes
+    always go to the primary, also for instances loaded from a replica, so
+    a replica alias may be used for read-only scans without any risk of
+    writing to it.
+
+    Example:
+        DATABASE_ROUTERS = [
+            'backend.shared_utils.database.primary_replica_router.'
+            'PrimaryReplicaRouter',
+        ]
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        return None
+
+    def db_for_write(self, model, **hints) -> str:
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Replicas hold the same data as the primary
+        return True
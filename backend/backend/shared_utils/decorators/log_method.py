@@ -1,14 +1,49 @@
+import atexit
 import logging
 from typing import Any, Callable, TypeVar
 from functools import wraps
 import time
 
+from backend.shared_utils.environment.get_setting import get_setting
+from backend.shared_utils.metrics.method_metrics import metrics_registry
+
 # Type variable for generic function types
 F = TypeVar('F', bound=Callable[..., Any])
 
 # Get the logger for the current module
 logger = logging.getLogger(__name__)
 
+# Set once the metrics dump of this process is registered with atexit
+_metrics_dump_registered = False
+
+def is_log_method_enabled() -> bool:
+    """
+    Check the LOG_METHOD_ENABLED setting.
+
+    Returns:
+        bool: False if logging of decorated methods is stripped entirely.
+    """
+    return bool(get_setting('LOG_METHOD_ENABLED', True))
+
+def is_method_metrics_enabled() -> bool:
+    """
+    Check the LOG_METHOD_METRICS setting.
+
+    Returns:
+        bool: True if decorated methods feed the metrics registry.
+    """
+    return bool(get_setting('LOG_METHOD_METRICS', False))
+
+def _register_metrics_dump() -> None:
+    """Dump the metrics registry at exit if LOG_METHOD_METRICS_DIR is set."""
+    global _metrics_dump_registered
+    if _metrics_dump_registered:
+        return
+    _metrics_dump_registered = True
+    directory = get_setting('LOG_METHOD_METRICS_DIR', None)
+    if directory:
+        atexit.register(metrics_registry.dump, directory)
+
 def log_method(func: F) -> F:
     """
     A decorator that logs method entry, exit, and any exceptions raised.
@@ -18,28 +53,61 @@ def log_method(func: F) -> F:
     - When the method exits, including the method name and execution time.
     - Any exceptions raised during method execution.
 
+    With the LOG_METHOD_METRICS setting every call is also recorded into
+    ``metrics_registry`` (call count, error count and latency histogram),
+    independently of the logging level.
+
+    The decision whether to wrap is made once, at decoration time. If
+    metrics are off and either the LOG_METHOD_ENABLED setting is False or
+    the logger is not enabled for DEBUG, the function is returned unchanged
+    and costs nothing per call. Otherwise log messages are formatted lazily
+    by the logging module and the execution time is measured with
+    ``time.perf_counter_ns``.
+
     Args:
         func (Callable): The function to be decorated.
 
     Returns:
-        Callable: The wrapped function.
+        Callable: The wrapped function, or ``func`` itself when logging is off.
 
     Raises:
         Exception: Re-raises any exception caught during the function execution.
     """
+    logging_enabled = is_log_method_enabled()
+    record = None
+    if is_method_metrics_enabled():
+        record = metrics_registry.record
+        _register_metrics_dump()
+    elif not logging_enabled or not logger.isEnabledFor(logging.DEBUG):
+        return func
+
+    func_name = func.__name__
+    metric_name = f"{func.__module__}.{func.__qualname__}"
+
     @wraps(func)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        func_name = func.__name__
+        debug = logging_enabled and logger.isEnabledFor(logging.DEBUG)
+        if record is None and not debug:
+            return func(*args, **kwargs)
+        if debug:
+            logger.debug("Entering %s - Args: %s, Kwargs: %s",
+                         func_name, args, kwargs)
+        start_time = time.perf_counter_ns()
         try:
-            logger.debug(f"Entering {func_name} - Args: {args}, Kwargs: {kwargs}")
-            start_time = time.time()
             result = func(*args, **kwargs)
-            execution_time = time.time() - start_time
-            logger.debug(f"Exiting {func_name} - Execution time: {execution_time:.2f} seconds")
-            return result
         except Exception as e:
-            logger.exception(f"Exception in {func_name}: {str(e)}")
+            if record is not None:
+                record(metric_name, time.perf_counter_ns() - start_time, True)
+            if logging_enabled:
+                logger.exception("Exception in %s: %s", func_name, e)
             raise
+        execution_time = time.perf_counter_ns() - start_time
+        if record is not None:
+            record(metric_name, execution_time, False)
+        if debug:
+            logger.debug("Exiting %s - Execution time: %.3f ms",
+                         func_name, execution_time / 1_000_000)
+        return result
     return wrapper
 
 # Example usage
@@ -69,4 +137,4 @@ if __name__ == "__main__":
     try:
         example_function(-1, 3)
     except ValueError:
-        pass  # Exception will be logged by the decorator
\ No newline at end of file
+        pass  # Exception will be logged by the decorator
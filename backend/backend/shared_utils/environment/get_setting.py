@@ -0,0 +1,25 @@
+from typing import Any
+
+def get_setting(name: str, default: Any) -> Any:
+    """Return a Django setting, or the default outside of a Django project.
+
+    Scripts and plain unit tests import modules that read settings without
+    a configured Django project; for them the default value is returned.
+
+    Args:
+        name (str): Name of the setting.
+        default (Any): Value used when the setting is not defined.
+
+    Returns:
+        Any: The value of the setting or the default.
+    """
+    try:
+        from django.conf import settings
+        from django.core.exceptions import ImproperlyConfigured
+    except ImportError:
+        return default
+
+    try:
+        return getattr(settings, name, default)
+    except ImproperlyConfigured:
+        return default
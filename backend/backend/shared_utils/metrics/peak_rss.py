@@ -0,0 +1,27 @@
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def get_peak_rss() -> Optional[int]:
+    """Return the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: Peak RSS in bytes, None where the ``resource``
+            module is not available.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def format_peak_rss() -> str:
+    """Return the peak RSS formatted in megabytes (or 'n/a')."""
+    peak = get_peak_rss()
+    if peak is None:
+        return "n/a"
+    return f"{peak / (1024 * 1024):.1f} MB"
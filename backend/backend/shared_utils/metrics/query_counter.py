@@ -0,0 +1,45 @@
+from contextlib import ExitStack
+import time
+from typing import Any, Callable
+
+from django.db import connections
+
+
+class QueryCounter:
+    """
+    Context manager counting SQL queries and measuring elapsed time.
+
+    Queries are counted with ``connection.execute_wrapper`` on every
+    configured database, so nothing is kept in memory and DEBUG does not
+    have to be enabled.
+
+    Example:
+        with QueryCounter() as counter:
+            run_report()
+        print(counter.count, counter.elapsed)
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.elapsed = 0.0
+        self._stack = ExitStack()
+        self._start = 0.0
+
+    def __call__(self, execute: Callable, sql: str, params: Any,
+                 many: bool, context: dict) -> Any:
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> 'QueryCounter':
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        self._stack.close()
+
+    def summary(self) -> str:
+        """Return e.g. 'Queries: 12, elapsed: 0.35 s'."""
+        return f"Queries: {self.count}, elapsed: {self.elapsed:.2f} s"
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+
+from backend.shared_utils.metrics.method_metrics import metrics_registry
+
+
+def method_metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Return metrics of methods decorated with log_method as plain text.
+
+    The metrics belong to the process serving the request. Access is
+    limited to staff users and addresses listed in INTERNAL_IPS.
+
+    Args:
+        request (HttpRequest): The incoming request.
+
+    Returns:
+        HttpResponse: Text table of the metrics, 403 for other clients.
+    """
+    user = getattr(request, 'user', None)
+    is_staff = bool(user and user.is_staff)
+    is_internal = request.META.get('REMOTE_ADDR') in getattr(
+        settings, 'INTERNAL_IPS', ()
+    )
+    if not (is_staff or is_internal):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        metrics_registry.render_text(),
+        content_type='text/plain; charset=utf-8'
+    )
@@ -0,0 +1,65 @@
+"""
+This file contains tests for the database configuration from environment.
+
+The TestDatabaseConfig class inherits from `unittest.TestCase`
+and implements individual tests for `postgres_database`:
+
+* persistent connections with health checks by default
+* psycopg 3 pool options sized by environment variables
+* connection parameters overridden by environment variables
+* invalid values reported as ImproperlyConfigured
+"""
+
+import unittest
+
+from django.core.exceptions import ImproperlyConfigured
+
+from backend.shared_utils.database.database_config import postgres_database
+
+DEFAULTS = {'NAME': 'app', 'USER': 'postgres', 'PASSWORD': 'secret',
+            'HOST': 'localhost', 'PORT': '5432'}
+
+
+class TestDatabaseConfig(unittest.TestCase):
+    """Test cases for postgres_database."""
+
+    def test_persistent_connections(self):
+        """Test the default configuration without a pool."""
+        database = postgres_database(DEFAULTS, environ={})
+
+        self.assertEqual(database['NAME'], 'app')
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS'], {})
+
+    def test_pool(self):
+        """Test pool options and CONN_MAX_AGE required by pooling."""
+        database = postgres_database(DEFAULTS, environ={
+            'DB_POOL': 'true', 'DB_POOL_MIN_SIZE': '1',
+            'DB_POOL_MAX_SIZE': '20', 'DB_CONN_MAX_AGE': '300',
+        })
+
+        pool = database['OPTIONS']['pool']
+        self.assertEqual((pool['min_size'], pool['max_size']), (1, 20))
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+
+    def test_environment_overrides(self):
+        """Test connection parameters and checks set by environment."""
+        database = postgres_database(DEFAULTS, environ={
+            'DB_HOST': 'db.internal', 'DB_CONN_MAX_AGE': '0',
+            'DB_CONN_HEALTH_CHECKS': 'false',
+        })
+
+        self.assertEqual(database['HOST'], 'db.internal')
+        self.assertEqual(database['PORT'], '5432')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+
+    def test_invalid_values(self):
+        """Test that invalid values raise ImproperlyConfigured."""
+        for environ in ({'DB_CONN_MAX_AGE': 'forever'},
+                        {'DB_POOL': 'maybe'},
+                        {'DB_POOL': '1', 'DB_POOL_MIN_SIZE': '5',
+                         'DB_POOL_MAX_SIZE': '2'}):
+            with self.assertRaises(ImproperlyConfigured):
+                postgres_database(DEFAULTS, environ=environ)
@@ -0,0 +1,118 @@
+"""
+This file contains tests for metrics collected by the log_method decorator.
+
+The TestMethodMetrics class inherits from `unittest.TestCase`
+and implements individual tests for:
+
+* `LatencyHistogram` (bucketing, percentiles, merging)
+* `MethodMetricsRegistry` (recording, snapshots, dumps)
+* `log_method` with metrics enabled
+"""
+
+import atexit
+from pathlib import Path
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from backend.shared_utils.decorators import log_method as log_method_module
+from backend.shared_utils.metrics.method_metrics import (
+    LatencyHistogram,
+    MethodMetricsRegistry,
+    bucket_index,
+    bucket_upper_bound,
+)
+
+
+class TestMethodMetrics(unittest.TestCase):
+    """Test cases for the method metrics registry."""
+
+    def test_bucket_bounds_contain_value(self):
+        """Test that every value falls below its bucket upper bound."""
+        for value in list(range(0, 300)) + [10 ** 6, 10 ** 9 + 7, 2 ** 40]:
+            upper = bucket_upper_bound(bucket_index(value))
+            self.assertLessEqual(value, upper)
+            self.assertLess(upper - value, max(value, 64) * 0.04)
+
+    def test_percentiles(self):
+        """Test percentiles of a uniform distribution."""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+
+        self.assertEqual(histogram.count, 10000)
+        self.assertEqual(histogram.min, 1000)
+        self.assertEqual(histogram.max, 10_000_000)
+        for percent in (50, 95, 99):
+            expected = percent * 100_000
+            self.assertAlmostEqual(histogram.percentile(percent), expected,
+                                   delta=expected * 0.04)
+
+    def test_merge(self):
+        """Test that merged histograms equal one recorded histogram."""
+        first, second, combined = (LatencyHistogram() for _ in range(3))
+        for value in range(0, 5000, 7):
+            (first if value % 2 else second).record(value)
+            combined.record(value)
+        first.merge(LatencyHistogram.from_dict(second.to_dict()))
+
+        self.assertEqual(first.to_dict(), combined.to_dict())
+
+    def test_registry_dump_and_load(self):
+        """Test that dumped snapshots merge into another registry."""
+        registry = MethodMetricsRegistry()
+        registry.record('module.func', 1500, False)
+        registry.record('module.func', 2500, True)
+
+        with tempfile.TemporaryDirectory() as directory:
+            first = registry.dump(directory)
+            second = registry.dump(directory)
+            self.assertNotEqual(first, second)
+            first.unlink()
+            loaded = MethodMetricsRegistry()
+            self.assertEqual(loaded.load_dumps(directory), 1)
+
+        snapshot = loaded.snapshot()['module.func']
+        self.assertEqual(snapshot['calls'], 2)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertIn('module.func', loaded.render_text())
+
+    def test_log_method_records_metrics(self):
+        """Test that decorated calls are recorded when metrics are on."""
+        registry = MethodMetricsRegistry()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        with override_settings(LOG_METHOD_METRICS_DIR=directory.name), \
+                patch.object(log_method_module, 'is_method_metrics_enabled',
+                             return_value=True), \
+                patch.object(log_method_module, 'metrics_registry', registry), \
+                patch.object(log_method_module, '_metrics_dump_registered',
+                             False):
+            decorated = log_method_module.log_method(
+                log_method_module.example_function
+            )
+        # Do not dump the test registry when the test run exits
+        atexit.unregister(registry.dump)
+
+        decorated(1, 2)
+        with self.assertRaises(ValueError):
+            decorated(-1, 2)
+
+        metrics = registry.snapshot()
+        self.assertEqual(len(metrics), 1)
+        snapshot = next(iter(metrics.values()))
+        self.assertEqual(snapshot['calls'], 2)
+        self.assertEqual(snapshot['errors'], 1)
+        self.assertEqual(list(Path(directory.name).iterdir()), [])
+
+    def test_log_method_returns_raw_function(self):
+        """Test that nothing is wrapped with metrics and DEBUG off."""
+        def func():
+            return 1
+
+        with patch.object(log_method_module, 'is_method_metrics_enabled',
+                          return_value=False):
+            self.assertIs(log_method_module.log_method(func), func)
@@ -14,9 +14,18 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
+
+from backend.shared_utils.metrics.views import method_metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('avatars/', include('img_manager.urls')),
 ]
+
+if getattr(settings, 'LOG_METHOD_METRICS_ENDPOINT', False):
+    urlpatterns.append(
+        path('metrics/methods/', method_metrics_view, name='method_metrics')
+    )
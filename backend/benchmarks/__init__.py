@@ -0,0 +1,7 @@
+"""
+Benchmarks for performance sensitive parts of the project.
+
+Every module is a standalone script, run it from the ``backend`` directory:
+
+    $ python -m benchmarks.<module_name> --help
+"""
@@ -0,0 +1,80 @@
+"""
+Benchmark of memory used to hold the assigned image names of all users.
+
+Compares a list of ``values()`` dicts (the former checker), a
+name -> user_id dict and the compact ``AssignedImageIndex`` used by the
+manifest rebuild. Memory is measured with ``tracemalloc``.
+
+Usage:
+    $ python -m benchmarks.bench_assigned_index
+    $ python -m benchmarks.bench_assigned_index --count 5000000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from img_manager.services.profile_images.assigned_index import \
+    AssignedImageIndex
+
+
+def _name(user_id: int) -> str:
+    return f"AAEBAAAAZm7Cg{user_id:08d}.jpg"
+
+
+def _user_rows(count: int):
+    """Return rows shaped like ``CustomUser.objects.values()``."""
+    return [
+        {
+            'id': user_id,
+            'username': f"user{user_id}",
+            'last_login': None,
+            'profile_image': f"users/profile_images/master/{_name(user_id)}",
+            'profile_image_thumbnail': '',
+        }
+        for user_id in range(1, count + 1)
+    ]
+
+
+def _name_dict(count: int):
+    return {_name(user_id): user_id for user_id in range(1, count + 1)}
+
+
+def _index(count: int):
+    index = AssignedImageIndex()
+    for user_id in range(1, count + 1):
+        index.add(_name(user_id), user_id)
+    index.freeze()
+    return index
+
+
+def _measure(build, count: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(count)
+    elapsed = time.perf_counter() - start
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    print(f"users: {options.count}")
+    for label, build in (
+        ("values() dicts", _user_rows),
+        ("name -> user_id dict", _name_dict),
+        ("AssignedImageIndex", _index),
+    ):
+        size, peak, elapsed = _measure(build, options.count)
+        print(f"{label:<22} {size / 2**20:>8.1f} MB kept "
+              f"{peak / 2**20:>8.1f} MB peak {elapsed:>7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark of importing users with CustomUserManager.bulk_create_users.
+
+Compares ``create_user`` called per row (a password hash, username queries
+and one INSERT per user) with ``bulk_create_users`` (passwords hashed in
+``--workers`` processes, names allocated in memory, batched INSERTs).
+``--fast-hashing`` switches to the MD5 hasher to show the database part
+alone. Tables are created in a test database and default images are read
+from the project's ``static`` directory.
+
+Usage:
+    $ DJANGO_SETTINGS_MODULE=<sqlite settings> \\
+        python -m benchmarks.bench_bulk_create_users
+    $ python -m benchmarks.bench_bulk_create_users --users 2000 --workers 8
+"""
+import argparse
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from benchmarks.django_setup import setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from users.models.custom_user import CustomUser  # noqa: E402
+
+STATIC_ROOT = Path(__file__).resolve().parents[1] / 'static'
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def _rows(count: int, domain: str):
+    # Half of the users share a local part to exercise suffix allocation
+    return [
+        {'email': f"info@d{i}.{domain}" if i % 2 else f"user{i}@{domain}",
+         'password': f"secret-{i}"}
+        for i in range(count)
+    ]
+
+
+def _per_row(rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        CustomUser.objects.create_user(**row)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--fast-hashing', action='store_true')
+    options = parser.parse_args()
+
+    overrides = {'STATIC_ROOT': str(STATIC_ROOT)}
+    if options.fast_hashing:
+        overrides['PASSWORD_HASHERS'] = FAST_HASHERS
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        with tempfile.TemporaryDirectory() as media_root, \
+                override_settings(MEDIA_ROOT=media_root, **overrides):
+            per_row = _per_row(_rows(options.users, 'example.com'))
+            report = CustomUser.objects.bulk_create_users(
+                _rows(options.users, 'example.org'),
+                batch_size=options.batch_size, workers=options.workers,
+            )
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"users: {options.users}, workers: {options.workers}, "
+          f"hasher: {'MD5' if options.fast_hashing else 'project default'}")
+    print(f"create_user per row: {per_row:.2f} s "
+          f"({options.users / per_row:.0f} users/s)")
+    print(f"bulk_create_users:   {report}")
+
+
+if __name__ == "__main__":
+    main()
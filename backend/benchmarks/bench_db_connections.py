@@ -0,0 +1,151 @@
+"""
+Benchmark of request latency with and without reused DB connections.
+
+Concurrent clients request the avatar of a user with a matching
+``If-None-Match`` (one indexed query, then 304) through Django's WSGI
+handler, so connections are opened and closed by the request signals as
+in a real server (the test client disables that). Compared modes:
+
+* ``new``: a new connection per request (CONN_MAX_AGE = 0)
+* ``persistent``: connections kept per thread (CONN_MAX_AGE, health checks)
+* ``pool``: a psycopg 3 pool (PostgreSQL with ``psycopg[pool]`` only)
+
+With SQLite settings a file database stands in for the server; opening a
+SQLite connection is far cheaper than a PostgreSQL one (TCP, auth, backend
+start), so the differences are a lower bound.
+
+Usage:
+    $ DJANGO_SETTINGS_MODULE=<sqlite settings> \\
+        python -m benchmarks.bench_db_connections
+    $ python -m benchmarks.bench_db_connections --clients 16 --requests 500
+"""
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+
+from benchmarks.django_setup import setup_django
+
+setup_django()
+
+from django.core.handlers.wsgi import WSGIHandler  # noqa: E402
+from django.db import connection, connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from users.models.custom_user import CustomUser  # noqa: E402
+from img_manager.services.profile_images.avatars import avatar_etag  # noqa: E402
+
+MODES = ('new', 'persistent', 'pool')
+
+
+def _configure(mode: str, clients: int) -> None:
+    """Switch the default database to a mode (read by new connections)."""
+    settings_dict = connections.settings['default']
+    settings_dict['OPTIONS'].pop('pool', None)
+    settings_dict['CONN_HEALTH_CHECKS'] = mode != 'new'
+    settings_dict['CONN_MAX_AGE'] = 60 if mode == 'persistent' else 0
+    if mode == 'pool':
+        settings_dict['OPTIONS']['pool'] = {
+            'min_size': clients, 'max_size': clients}
+
+
+def _client(handler: WSGIHandler, users, requests: int,
+            latencies: list) -> None:
+    factory = RequestFactory()
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append(status)
+
+    try:
+        for index in range(requests):
+            user_id, etag = users[index % len(users)]
+            environ = factory._base_environ(
+                PATH_INFO=f'/avatars/id/{user_id}/master/',
+                REQUEST_METHOD='GET', HTTP_IF_NONE_MATCH=etag)
+            start = time.perf_counter()
+            # close() sends request_finished (closes or returns the connection)
+            handler(environ, start_response).close()
+            latencies.append(time.perf_counter() - start)
+            assert statuses[-1].startswith('304'), statuses[-1]
+    finally:
+        connection.close()
+
+
+def _run(mode: str, users, clients: int, requests: int):
+    _configure(mode, clients)
+    opened = []
+
+    def count(sender, connection, **kwargs):
+        opened.append(connection.alias)
+
+    handler = WSGIHandler()
+    latencies: list = []
+    connection_created.connect(count, weak=False)
+    try:
+        threads = [threading.Thread(target=_client,
+                                    args=(handler, users, requests, latencies))
+                   for _ in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        connection_created.disconnect(count)
+        if mode == 'pool':
+            connection.close_pool()
+    return latencies, elapsed, len(opened)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200,
+                        help="requests per client")
+    parser.add_argument('--users', type=int, default=1000)
+    options = parser.parse_args()
+
+    settings_dict = connections.settings['default']
+    modes = [mode for mode in MODES
+             if mode != 'pool' or settings_dict['ENGINE'].endswith('postgresql')]
+    temp_dir = tempfile.TemporaryDirectory()
+    if settings_dict['ENGINE'].endswith('sqlite3'):
+        # A file database: in-memory test databases are never closed
+        settings_dict.setdefault('TEST', {})['NAME'] = f"{temp_dir.name}/bench.db"
+    old_name = settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        CustomUser.objects.bulk_create(
+            (CustomUser(email=f"user{i}@example.com", username=f"user{i}",
+                        slug=f"user{i}", profile_image=f"users/master-{i}.jpg")
+             for i in range(options.users)),
+            batch_size=1000,
+        )
+        users = list(CustomUser.objects.values_list('id', 'profile_image'))
+        users = [(user_id, avatar_etag(path)) for user_id, path in users]
+        connection.close()
+
+        print(f"{settings_dict['ENGINE'].rsplit('.', 1)[1]}: "
+              f"{options.clients} clients x {options.requests} requests")
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for mode in modes:
+                latencies, elapsed, opened = _run(
+                    mode, users, options.clients, options.requests)
+                latencies.sort()
+                p95 = latencies[int(len(latencies) * 0.95)]
+                print(f"{mode:<11} p50 {statistics.median(latencies) * 1000:6.2f} ms "
+                      f"p95 {p95 * 1000:6.2f} ms "
+                      f"{len(latencies) / elapsed:8.0f} req/s "
+                      f"{opened:>6} connections opened")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of batch image name decoding/encoding against the per-name path.
+
+Compares ``ImageNameProcessor(base64_name=...)`` / ``generate_image_name()``
+with ``ImageNameProcessor.decode_many()`` / ``encode_many()``.
+
+Usage:
+    $ python -m benchmarks.bench_image_name_batch
+    $ python -m benchmarks.bench_image_name_batch --count 100000
+"""
+import argparse
+import random
+import time
+
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+
+
+def _make_records(count: int):
+    """Return ``count`` records with random user IDs and timestamps."""
+    rng = random.Random(42)
+    return [
+        {
+            "app_id": 1,
+            "type_id": rng.randint(0, 1),
+            "timestamp": rng.randint(1_600_000_000, 1_800_000_000),
+            "user_id": rng.randint(1, 5_000_000),
+        }
+        for _ in range(count)
+    ]
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _encode_per_name(records):
+    names = []
+    for record in records:
+        processor = ImageNameProcessor(
+            app_id=record['app_id'],
+            type_id=record['type_id'],
+            user_id=record['user_id'],
+        )
+        processor.data['timestamp'] = record['timestamp']
+        names.append(processor.generate_image_name())
+    return names
+
+
+def _decode_per_name(names):
+    return [ImageNameProcessor(base64_name=name).data for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    records = _make_records(options.count)
+
+    batch, encode_batch = _timed(ImageNameProcessor.encode_many, records)
+    names, encode_single = _timed(_encode_per_name, records)
+    assert names == batch.names, "Batch and per-name encoding differ."
+
+    decoded, decode_batch = _timed(ImageNameProcessor.decode_many, names)
+    _, decode_single = _timed(_decode_per_name, names)
+    assert decoded.failed_count == 0
+
+    print(f"Names: {options.count}")
+    for label, single, batched in (
+        ("encode", encode_single, encode_batch),
+        ("decode", decode_single, decode_batch),
+    ):
+        print(
+            f"{label}: per-name {single:.2f} s, batch {batched:.2f} s, "
+            f"speedup {single / batched:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
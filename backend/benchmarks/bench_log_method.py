@@ -0,0 +1,81 @@
+"""
+Microbenchmark of the log_method decorator overhead.
+
+Compares the cost of one call of a trivial function:
+    - raw (undecorated) function,
+    - the previous eager implementation (f-strings + time.time()),
+    - log_method with the logger disabled for DEBUG (resolved to raw),
+    - log_method with DEBUG enabled (lazy formatting, NullHandler).
+
+Usage:
+    $ python -m benchmarks.bench_log_method
+    $ python -m benchmarks.bench_log_method --number 200000
+"""
+import argparse
+import logging
+import time
+import timeit
+from functools import wraps
+
+from backend.shared_utils.decorators import log_method as log_method_module
+
+logger = log_method_module.logger
+
+
+def _eager_log_method(func):
+    """Copy of the decorator before it resolved at decoration time."""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        func_name = func.__name__
+        try:
+            logger.debug(f"Entering {func_name} - Args: {args}, Kwargs: {kwargs}")
+            start_time = time.time()
+            result = func(*args, **kwargs)
+            execution_time = time.time() - start_time
+            logger.debug(f"Exiting {func_name} - Execution time: {execution_time:.2f} seconds")
+            return result
+        except Exception as e:
+            logger.exception(f"Exception in {func_name}: {str(e)}")
+            raise
+    return wrapper
+
+
+def get_size(img_type: str):
+    """Stand-in for ProfileImageConfig.get_size."""
+    return {'master': (400, 400), 'thumbnail': (64, 64)}[img_type]
+
+
+def _decorate_with_level(level: int):
+    logger.setLevel(level)
+    return log_method_module.log_method(get_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--number', type=int, default=1_000_000)
+    options = parser.parse_args()
+
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    variants = (
+        ('raw', get_size, logging.INFO),
+        ('eager (previous)', _eager_log_method(get_size), logging.INFO),
+        ('log_method, DEBUG off',
+         _decorate_with_level(logging.INFO), logging.INFO),
+        ('log_method, DEBUG on',
+         _decorate_with_level(logging.DEBUG), logging.DEBUG),
+    )
+
+    baseline = None
+    for label, func, level in variants:
+        logger.setLevel(level)
+        seconds = timeit.timeit(lambda: func('thumbnail'),
+                                number=options.number)
+        per_call = seconds / options.number * 1e9
+        baseline = baseline or per_call
+        print(f"{label:<24} {per_call:8.1f} ns/call "
+              f"({per_call / baseline:.1f}x raw)")
+
+if __name__ == "__main__":
+    main()
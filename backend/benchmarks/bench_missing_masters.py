@@ -0,0 +1,92 @@
+"""
+Benchmark of finding the newest unassigned master of users missing images.
+
+Compares the former per-user scan of all unassigned masters (one decode
+per file and user, O(users x files)) with the one-pass index built by
+``MissingProfileImageProcessor`` (O(users + files)). The per-user scan is
+measured on ``--scan-users`` users and extrapolated.
+
+Usage:
+    $ python -m benchmarks.bench_missing_masters
+    $ python -m benchmarks.bench_missing_masters --users 100000 --files 1000000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.django_setup import setup_django
+
+setup_django()
+
+from img_manager.core.processors.base64_processor import ImageNameProcessor  # noqa: E402
+from img_manager.services.profile_images.fill_missing import \
+    MissingProfileImageProcessor  # noqa: E402
+
+
+def _make_files(count: int, users: int):
+    """Return ``count`` master names of random users (a few per user)."""
+    rng = random.Random(42)
+    batch = ImageNameProcessor.encode_many(
+        {
+            "app_id": 1,
+            "type_id": 0,
+            "timestamp": rng.randint(1_600_000_000, 1_800_000_000),
+            "user_id": rng.randint(1, users * 2),
+        }
+        for _ in range(count)
+    )
+    return [f"{name}.jpg" for name in batch.names]
+
+
+def _scan_per_user(user_ids, file_names):
+    """The former lookup: decode every file for every user."""
+    result = {}
+    for user_id in user_ids:
+        candidates = [
+            name for name in file_names
+            if ImageNameProcessor(
+                base64_name=name.split('.', 1)[0]
+            ).data['user_id'] == user_id
+        ]
+        if candidates:
+            result[user_id] = max(
+                candidates,
+                key=lambda name: ImageNameProcessor(
+                    base64_name=name.split('.', 1)[0]
+                ).data['timestamp']
+            )
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--files', type=int, default=1_000_000)
+    parser.add_argument('--scan-users', type=int, default=3)
+    options = parser.parse_args()
+
+    file_names = _make_files(options.files, options.users)
+    user_ids = set(range(1, options.users + 1))
+
+    start = time.perf_counter()
+    index = MissingProfileImageProcessor._index_newest_masters(
+        file_names, user_ids
+    )
+    indexed = time.perf_counter() - start
+
+    sample = sorted(user_ids)[:options.scan_users]
+    start = time.perf_counter()
+    scanned = _scan_per_user(sample, file_names)
+    per_user = (time.perf_counter() - start) / len(sample)
+    for user_id in sample:
+        assert scanned.get(user_id) == index.get(user_id), user_id
+
+    print(f"users: {options.users}, orphan files: {options.files}, "
+          f"users with a master: {len(index)}")
+    print(f"index: {indexed:.2f} s")
+    print(f"per-user scan: {per_user:.2f} s per user, "
+          f"~{per_user * options.users / 3600:.1f} h extrapolated")
+
+
+if __name__ == "__main__":
+    main()
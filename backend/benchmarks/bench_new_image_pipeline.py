@@ -0,0 +1,114 @@
+"""
+Benchmark of creating the profile images from one uploaded photo.
+
+Compares the former pipeline (full decode, square crop, LANCZOS from the
+crop once for the master and again for the thumbnail) with the current
+``NewImageProcessor`` pipeline (JPEG draft decode, one resize to the master,
+thumbnail from the master). Each variant runs in its own process with the
+same imports, so the peak RSS of the processes can be compared directly.
+
+Usage:
+    $ python -m benchmarks.bench_new_image_pipeline
+    $ python -m benchmarks.bench_new_image_pipeline --width 5472 --height 3648
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageDraw
+
+from backend.shared_utils.metrics.peak_rss import get_peak_rss
+from img_manager.core.processors.new_image_processor import NewImageProcessor
+from img_manager.utils.pil.resize_image import resize_image
+from img_manager.utils.pil.square_crop_center import square_crop_center
+
+VARIANTS = ('former', 'current')
+
+
+def _create_upload(path: str, width: int, height: int) -> None:
+    """Save a JPEG photo-like upload (gradient with shapes)."""
+    img = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+    draw = ImageDraw.Draw(img)
+    for i in range(0, min(width, height) // 2, max(1, min(width, height) // 40)):
+        draw.ellipse((i, i, width - i, height - i), outline=(i % 256, 80, 160))
+    img.save(path, format='JPEG', quality=90)
+
+
+def _save(img: Image.Image) -> None:
+    img.save(io.BytesIO(), format=NewImageProcessor.IMG_OUTPUT_FORMAT,
+             dpi=NewImageProcessor.IMG_OUTPUT_DPI)
+
+
+def _former(path: str) -> None:
+    with Image.open(path) as img:
+        img = square_crop_center(img)
+        for img_type in ('master', 'thumbnail'):
+            _save(resize_image(img, NewImageProcessor.SIZE[img_type]))
+
+
+def _current(path: str) -> None:
+    master = NewImageProcessor.create_master(path)
+    _save(master)
+    _save(NewImageProcessor._resize_image(master, 'thumbnail'))
+
+
+def _run_variant(variant: str, path: str, repeat: int) -> None:
+    """Run one variant and print its timings as JSON (child process)."""
+    process = _former if variant == 'former' else _current
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process(path)
+        timings.append(time.perf_counter() - start)
+    print(json.dumps({
+        'mean': sum(timings) / len(timings),
+        'best': min(timings),
+        'peak_rss': get_peak_rss() or 0,
+    }))
+
+
+def _measure(variant: str, path: str, repeat: int) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_new_image_pipeline',
+         '--run', variant, '--image', path, '--repeat', str(repeat)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--width', type=int, default=5472)
+    parser.add_argument('--height', type=int, default=3648)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--image', help="Use this upload instead of a generated one")
+    parser.add_argument('--run', choices=VARIANTS, help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.run:
+        _run_variant(options.run, options.image, options.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = options.image
+        if path is None:
+            path = os.path.join(temp_dir, 'upload.jpg')
+            _create_upload(path, options.width, options.height)
+        with Image.open(path) as img:
+            width, height = img.size
+        print(f"upload: {width}x{height} ({os.path.getsize(path) / 2**20:.1f} MB), "
+              f"repeat: {options.repeat}")
+        for variant in VARIANTS:
+            result = _measure(variant, path, options.repeat)
+            print(f"{variant:<8} {result['mean'] * 1000:>8.1f} ms mean "
+                  f"{result['best'] * 1000:>8.1f} ms best "
+                  f"{result['peak_rss'] / 2**20:>8.1f} MB peak RSS")
+
+
+if __name__ == "__main__":
+    main()
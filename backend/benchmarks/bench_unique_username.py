@@ -0,0 +1,91 @@
+"""
+Benchmark of generating a username for a common e-mail local part.
+
+Compares the former generator (one ``exists()`` query per counter value)
+with ``unique_username_from_email`` (one prefix query, suffix computed in
+Python) when ``--count`` users already share the prefix (``info``,
+``info1``, ...). Tables are created in a test database.
+
+Usage:
+    $ DJANGO_SETTINGS_MODULE=<sqlite settings> \\
+        python -m benchmarks.bench_unique_username
+    $ python -m benchmarks.bench_unique_username --count 100000
+"""
+import argparse
+import time
+
+from benchmarks.django_setup import setup_django
+
+setup_django()
+
+from django.db import connection  # noqa: E402
+
+from users.models.custom_user import CustomUser  # noqa: E402
+from users.utils.username_utils import unique_username_from_email  # noqa: E402
+
+
+def _per_counter_queries(email: str) -> str:
+    """The former generator: one query per tried username."""
+    base_username = email.split('@')[0].lower()
+    username = base_username
+    counter = 1
+    while CustomUser.objects.filter(username=username).exists():
+        username = f"{base_username}{counter}"
+        counter += 1
+    return username
+
+
+def _create_users(prefix: str, count: int) -> None:
+    usernames = [prefix] + [f"{prefix}{i}" for i in range(1, count)]
+    CustomUser.objects.bulk_create(
+        (CustomUser(email=f"{username}@example.com", username=username,
+                    slug=username)
+         for username in usernames),
+        batch_size=1000,
+    )
+
+
+def _measure(generate, email: str):
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        start = time.perf_counter()
+        username = generate(email)
+        elapsed = time.perf_counter() - start
+    return username, elapsed, queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--prefix', default='info')
+    options = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        _create_users(options.prefix, options.count)
+        email = f"{options.prefix}@example.org"
+
+        print(f"users with prefix '{options.prefix}': {options.count}")
+        results = set()
+        for label, generate in (
+            ("query per counter", _per_counter_queries),
+            ("prefix query", unique_username_from_email),
+        ):
+            username, elapsed, queries = _measure(generate, email)
+            results.add(username)
+            print(f"{label:<18} {elapsed * 1000:>9.1f} ms "
+                  f"{queries:>7} queries -> {username}")
+        assert len(results) == 1, results
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Django setup shared by benchmarks that import models.
+
+``DJANGO_SETTINGS_MODULE`` defaults to the project settings; point it to
+other settings (e.g. with SQLite) to run a benchmark without PostgreSQL.
+"""
+import os
+
+import django
+
+
+def setup_django() -> None:
+    """Configure Django for a standalone benchmark script."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    django.setup()
@@ -24,7 +24,7 @@ class AppsMapConfig:
         IMAGE_APPS_MAP: Slovník s aplikacemi.
     """
     IMAGE_APPS_MAP = {
-        0: "Users",
+        1: "Users",
         # Add additional values as needed
     }
 
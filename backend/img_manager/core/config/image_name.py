@@ -0,0 +1,34 @@
+"""
+Tento soubor slouží k definici konfigurace pro dekódování jmen obrázků.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict
+
+from .apps_map import AppsMapConfig
+from .profile_images.constants import ProfileImageConfig
+
+
+@dataclass(frozen=True)
+class ImageNameConfig:
+    """
+    Definuje konfiguraci pro výpis informací z dekódovaného jména obrázku.
+
+    Attributes:
+        IMAGE_APP_MAP (Dict[int, str]): Textová reprezentace aplikací.
+        IMAGE_TYPE_MAP (Dict[int, str]): Textová reprezentace typů obrázků.
+        DATE_TIME_FORMAT (str): Formát pro výpis data a času.
+        DATE_FORMAT (str): Formát pro výpis data.
+        DATE_MIN (datetime): Nejstarší platné datum vytvoření obrázku.
+        DATE_MAX (datetime): Nejmladší platné datum vytvoření obrázku.
+    """
+    IMAGE_APP_MAP: Dict[int, str] = field(
+        default_factory=lambda: dict(AppsMapConfig.IMAGE_APPS_MAP)
+    )
+    IMAGE_TYPE_MAP: Dict[int, str] = field(
+        default_factory=lambda: dict(ProfileImageConfig().IMAGE_TYPE)
+    )
+    DATE_TIME_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+    DATE_FORMAT: str = '%Y-%m-%d'
+    DATE_MIN: datetime = datetime(2024, 1, 1)
+    DATE_MAX: datetime = datetime(2100, 1, 1)
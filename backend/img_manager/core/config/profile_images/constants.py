@@ -3,9 +3,10 @@ Tento soubor slouží k definici konstant pro profilové obrázky uživatele.
 """
 import inspect
 from dataclasses import dataclass, field
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 from backend.shared_utils.decorators.log_method import log_method
+from img_manager.exceptions.default_images_errors import UnknownImageTypeError
 from img_manager.exceptions.config_errors import (
     MissingAttributeError,
     # InvalidAttributeTypeError,
@@ -19,18 +20,20 @@ class ProfileImageConfig():
     Definuje konfiguraci pro zpracování profilových obrázků uživatelů.
 
     Attributes:
-        APP_ID (int): Identifikátor aplikace.
+        APP_ID (int): Identifikátor aplikace (viz AppsMapConfig).
         IMAGE_TYPE (Dict[int, str]: Textová reprezentace jednotlivých typů profilových obrázků.
         ALLOWED_TYPES (List[str]): Seznam povolených typů profilových obrázků.
         TYPE_ID (Dict[str, int]): Slovník ID pro různé velikosti obrázků.
         SIZE (Dict[str, Tuple[int, int]]): Slovník rozměrů pro různé typy obrázků.
     """
-    APP_ID: int = 0
+    APP_ID: int = 1
     IMAGE_TYPE: Dict[str, str] = field(default_factory=lambda: {
         0: "Profile picture - master - 400 x 400 - 72 dpi",
         1: "Profile picture - thumbnail - 64 x 64 - 72 dpi",
     })
-    ALLOWED_TYPES: List[str] = ['master', 'thumbnail']
+    ALLOWED_TYPES: List[str] = field(default_factory=lambda: [
+        'master', 'thumbnail'
+    ])
     TYPE_ID: Dict[str, int] = field(default_factory=lambda: {
         'master': 0,
         'thumbnail': 1,
@@ -44,7 +47,7 @@ class ProfileImageConfig():
     @log_method
     def get_app_id() -> int:
         """
-        Vrátí ID aplikace v ktré je obrázek použit (0=CustomUser).
+        Vrátí ID aplikace v ktré je obrázek použit (1=CustomUser).
 
         Returns:
             int: Identifikátor aplikace.
@@ -1,10 +1,15 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Dict
 from pathlib import Path
 
-from users.models.services.utils.log_method import log_method
+from django.conf import settings
+
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.utils.os.shard_layout import shard_directories
 from .constants import ProfileImageConfig
-from ..errors.default_images_errors import (
+from img_manager.exceptions.default_images_errors import (
     MissingAttributeError,
     UnknownImageTypeError
 )
@@ -17,8 +22,19 @@ class ProfileImagePaths:
     Attributes:
         PATH_FROM_MEDIA (Path): Relativní cesta od media adresáře k profilovým obrázkům.
         DEFAULT_IMAGES_PATH (Dict[str, Path]): Slovník cest k výchozím obrázkům pro různé typy.
+        SHARED_DEFAULTS_DIR (str): Složka (v PATH_FROM_MEDIA) se sdílenými
+            výchozími obrázky, na které odkazují všichni noví uživatelé.
+        SHARD_LEVELS (int): Počet úrovní podsložek pod složkou typu obrázku
+            (PROFILE_IMAGE_SHARD_LEVELS, 0 = všechny soubory v jedné složce).
+        SHARD_WIDTH (int): Počet znaků jména jedné podsložky
+            (PROFILE_IMAGE_SHARD_WIDTH).
     """
     PATH_FROM_MEDIA: Path = Path('users/profile_images/')
+    SHARED_DEFAULTS_DIR: str = 'default'
+    SHARD_LEVELS: int = field(
+        default_factory=lambda: get_setting('PROFILE_IMAGE_SHARD_LEVELS', 0))
+    SHARD_WIDTH: int = field(
+        default_factory=lambda: get_setting('PROFILE_IMAGE_SHARD_WIDTH', 2))
     DEFAULT_IMAGES_PATH: Dict[str, Path] = field(default_factory=lambda: {
         'master': Path('images/profile_image_default_master[400x400].jpg'),
         'thumbnail': Path('images/profile_image_default_thumbnail[64x64].jpg'),
@@ -87,6 +103,41 @@ class ProfileImagePaths:
             class_name = self.__class__.__name__
             raise MissingAttributeError('PATH_FROM_MEDIA', class_name) from e
 
+    def get_shard_dir(self, image_name: str) -> str:
+        """
+        Vrátí podsložku obrázku pod složkou jeho typu podle rozložení složek.
+
+        Jediné místo, které určuje umístění obrázku; používá ho path handler,
+        kontrola integrity, oprava i mazání obrázků.
+
+        Args:
+            image_name (str): Jméno souboru obrázku.
+
+        Returns:
+            str: Podsložka oddělená '/' ('' bez podsložek).
+        """
+        return "/".join(shard_directories(
+            image_name, self.SHARD_LEVELS, self.SHARD_WIDTH))
+
+    def get_image_rel_path(self, img_type: str, image_name: str) -> Path:
+        """
+        Vrátí relativní cestu (od media) k obrázku podle rozložení složek.
+
+        Args:
+            img_type (str): Typ obrázku ('master' nebo 'thumbnail').
+            image_name (str): Jméno souboru obrázku.
+
+        Returns:
+            Path: Např. ``users/profile_images/master/3f/a0/<jméno>``.
+        """
+        shard_dir = self.get_shard_dir(image_name)
+        return self.PATH_FROM_MEDIA / img_type / shard_dir / image_name
+
+    def get_image_abs_path(self, img_type: str, image_name: str) -> Path:
+        """Vrátí absolutní cestu k obrázku podle rozložení složek."""
+        relative_path = self.get_image_rel_path(img_type, image_name)
+        return Path(settings.MEDIA_ROOT) / relative_path
+
     @log_method
     def get_profile_images_abs_path(self, img_type: str) -> int:
         """
@@ -95,9 +146,34 @@ class ProfileImagePaths:
         Returns:
             Path: Absolutní cestu do složky s profilovými obrázky.
         """
-        try:
-            relative_path = self.get_profile_images_rel_path(img_type)
-            return Path(settings.MEDIA_ROOT) / relative_path
+        relative_path = self.get_profile_images_rel_path(img_type)
+        return Path(settings.MEDIA_ROOT) / relative_path
+
+    @log_method
+    def get_shared_defaults_rel_path(self) -> Path:
+        """
+        Vrátí relativní cestu (od media) ke složce sdílených výchozích obrázků.
+
+        Returns:
+            Path: Relativní cesta ke sdíleným výchozím obrázkům.
+        """
+        return self.PATH_FROM_MEDIA / self.SHARED_DEFAULTS_DIR
+
+    def is_shared_default(self, relative_path) -> bool:
+        """
+        Ověří, zda cesta (relativní od media) vede ke sdílenému výchozímu
+        obrázku.
+
+        Sdílené výchozí obrázky nepatří žádnému uživateli a nesmí být smazány.
+
+        Args:
+            relative_path (str | Path): Cesta uložená v poli obrázku uživatele.
+
+        Returns:
+            bool: True pro sdílený výchozí obrázek.
+        """
+        return str(relative_path).startswith(self._shared_defaults_prefix)
 
-        except ... as e:
-            pass
\ No newline at end of file
+    @cached_property
+    def _shared_defaults_prefix(self) -> str:
+        return f"{self.PATH_FROM_MEDIA / self.SHARED_DEFAULTS_DIR}/"
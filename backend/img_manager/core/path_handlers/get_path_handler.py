@@ -0,0 +1,37 @@
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.exceptions.object_store_errors import \
+    UnknownStorageBackendError
+from .path_handler_local import PathHandlerLocal
+from .path_handler_object_store import PathHandlerObjectStore
+from .path_handler_protocol import PathHandlerProtocol
+from .path_handler_thumbnail_pack import PathHandlerThumbnailPack
+
+# Implementace PathHandlerProtocol podle PROFILE_IMAGE_STORAGE_BACKEND
+PATH_HANDLERS = {
+    'local': PathHandlerLocal,
+    'object_store': PathHandlerObjectStore,
+}
+
+
+def get_path_handler() -> PathHandlerProtocol:
+    """
+    Vrátí path handler úložiště nastaveného v PROFILE_IMAGE_STORAGE_BACKEND.
+
+    S PROFILE_IMAGE_THUMBNAIL_PACK se náhledy ukládají do segmentů
+    (``PathHandlerThumbnailPack``), ostatní obrázky do nastaveného úložiště.
+
+    Returns:
+        PathHandlerProtocol: Nová instance handleru ('local' ve výchozím stavu).
+
+    Raises:
+        UnknownStorageBackendError: Pokud nastavení neodpovídá žádnému úložišti.
+    """
+    backend = get_setting('PROFILE_IMAGE_STORAGE_BACKEND', 'local')
+    try:
+        handler_class = PATH_HANDLERS[backend]
+    except KeyError as e:
+        raise UnknownStorageBackendError(backend, ", ".join(PATH_HANDLERS)) from e
+    handler = handler_class()
+    if get_setting('PROFILE_IMAGE_THUMBNAIL_PACK', False):
+        handler = PathHandlerThumbnailPack(handler)
+    return handler
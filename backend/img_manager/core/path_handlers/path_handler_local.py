@@ -1,17 +1,27 @@
+from functools import lru_cache
 from pathlib import Path
-from django.conf import settings
-from django.core.files.storage import default_storage
+from typing import Dict, Iterator, List, Set, Tuple, Union
+import hashlib
 import os
 
-from users.models.services.utils.log_method import log_method
-from users.models.services.utils.is_debug_mode import is_debug_mode
-from .protocols.path_handler_protocol import PathHandlerProtocol
-from .constants.image_paths import ImagePaths
-from .constants.image_config import ImageConfig
-
+from django.conf import settings
+from django.core.files.storage import default_storage
 
-from .utils.generate_image_name import generate_image_name
-from .errors.default_images_errors import (
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.is_debug_mode import is_debug_mode
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.config.profile_images.constants import ProfileImageConfig
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.exceptions.base64_processor_errors import \
+    ImageNameProcessingError
+from img_manager.exceptions.base64_validation_errors import \
+    ImageNameProcessingError as ImageNameValidationError
+from img_manager.utils.os.atomic_write import write_file_atomic
+from img_manager.utils.os.local_object_store import LocalObjectStore
+from img_manager.utils.os.scan_directory import ScanEntry
+from .path_handler_protocol import PathHandlerProtocol
+from img_manager.exceptions.default_images_errors import (
+    ImageProcessingError,
     UnknownImageTypeError,
     NonexistentImagePathError,
     ImagePathError,
@@ -19,20 +29,43 @@ from .errors.default_images_errors import (
     ImageNameError
 )
 
+@lru_cache(maxsize=None)
+def _load_shared_default(img_type: str, source: str,
+                         directory: str) -> Tuple[Path, bytes]:
+    """
+    Načte výchozí obrázek a vrátí jeho relativní cestu ve sdílené složce
+    a obsah.
+
+    Jméno obsahuje hash obsahu, takže změněný výchozí obrázek dostane nový
+    soubor a uživatelé se starým obrázkem nejsou ovlivněni. Výsledek je
+    uložen v cache, takže soubory se čtou nejvýše jednou za proces.
+    """
+    with open(source, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:16]
+    relative_path = Path(directory) / f"{img_type}-{digest}{Path(source).suffix}"
+    return relative_path, data
+
+
+# Sdílené výchozí obrázky už uložené tímto procesem (podle umístění úložiště)
+_installed_shared_defaults: Set[Tuple[str, str]] = set()
+
+
 class PathHandlerLocal(PathHandlerProtocol):
     """
     Implementace PathHandlerProtocol pro lokální správu cest k profilovým obrázkům.
 
     Tato třída poskytuje konkrétní implementaci pro vytváření a správu cest
     k profilovým obrázkům uživatelů v lokálním souborovém systému.
+    Obrázky se ukládají do media (MEDIA_ROOT) pod svou relativní cestou.
     """
 
     def __init__(self) -> None:
         """Inicializuje PathHandlerLocal s cestami a konfigurací."""
-        self.paths = ImagePaths()
-        self.config = ImageConfig()
-        self.image_types_list = self.config.get_img_types_list()
-        self.image_types_str = self.config.get_img_types_str()
+        self.paths = ProfileImagePaths()
+        self.config = ProfileImageConfig()
+        self.image_types_list = self.config.ALLOWED_TYPES
+        self.image_types_str = ", ".join(self.image_types_list)
         self.debug_mode = is_debug_mode()
 
     @log_method
@@ -54,6 +87,39 @@ class PathHandlerLocal(PathHandlerProtocol):
         except ImageProcessingError as e:
             raise ImagePathError(img_type) from e
 
+    @log_method
+    def get_shared_default(self, img_type: str) -> Path:
+        """
+        Vrátí relativní cestu od media ke sdílenému výchozímu obrázku.
+
+        Výchozí obrázek je v úložišti uložen jen jednou a noví uživatelé na
+        něj odkazují. Obrázek se uloží při prvním použití v procesu, další
+        volání už s úložištěm nepracují.
+
+        Args:
+            img_type (str): Typ obrázku ('master' nebo 'thumbnail').
+
+        Returns:
+            Path: Relativní cesta ke sdílenému výchozímu obrázku.
+
+        Raises:
+            UnknownImageTypeError: Pokud je zadán neznámý typ obrázku.
+            OSError: Pokud výchozí obrázek nelze načíst nebo uložit.
+        """
+        if img_type not in self.image_types_list:
+            raise UnknownImageTypeError(img_type, self.image_types_str)
+        source = Path(settings.STATIC_ROOT) / self.paths.get_default_image_path(img_type)
+        relative_path, data = _load_shared_default(
+            img_type, str(source),
+            str(self.paths.get_shared_defaults_rel_path()),
+        )
+        installed = (self.get_location(), str(relative_path))
+        if installed not in _installed_shared_defaults:
+            if not self.exists(relative_path):
+                self.put(relative_path, data)
+            _installed_shared_defaults.add(installed)
+        return relative_path
+
     @log_method
     def create_new_relative(self, img_type: str, user_id: int) -> Path:
         """
@@ -78,7 +144,7 @@ class PathHandlerLocal(PathHandlerProtocol):
 
         try:
             image_name = self.get_new_image_name(img_type, user_id)
-            return self.paths.PATH_FROM_MEDIA / img_type / image_name
+            return self.paths.get_image_rel_path(img_type, image_name)
 
         except ImageProcessingError as e:
             raise ImagePathError(img_type) from e
@@ -96,6 +162,48 @@ class PathHandlerLocal(PathHandlerProtocol):
         """
         return Path(default_storage.path(str(relative_path)))
 
+    def get_location(self) -> str:
+        """Vrátí umístění úložiště (kořenovou složku obrázků)."""
+        return str(settings.MEDIA_ROOT)
+
+    def put(self, relative_path: Union[str, Path], data: bytes) -> None:
+        """Atomicky uloží obrázek do media pod relativní cestou."""
+        write_file_atomic(self.get_absolute_media(relative_path), data)
+
+    def put_many(self, files: Dict[Union[str, Path], bytes]) -> None:
+        """Uloží obrázky do media jeden po druhém (lokální zápis je rychlý)."""
+        for relative_path, data in files.items():
+            self.put(relative_path, data)
+
+    def get(self, relative_path: Union[str, Path]) -> bytes:
+        """Načte obsah obrázku z media."""
+        return self.get_absolute_media(relative_path).read_bytes()
+
+    def exists(self, relative_path: Union[str, Path]) -> bool:
+        return self.get_absolute_media(relative_path).is_file()
+
+    def move(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        """Přejmenuje obrázek v media (``os.replace``, bez kopie obsahu)."""
+        target_path = self.get_absolute_media(target)
+        os.makedirs(target_path.parent, exist_ok=True)
+        os.replace(self.get_absolute_media(source), target_path)
+
+    def delete(self, relative_path: Union[str, Path]) -> bool:
+        """Smaže obrázek z media a vrátí True, pokud existoval."""
+        try:
+            os.remove(self.get_absolute_media(relative_path))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def list_prefix(self, prefix: Union[str, Path]) -> List[str]:
+        """Vrátí seřazené relativní cesty obrázků v media začínající prefixem."""
+        return LocalObjectStore(settings.MEDIA_ROOT, '').list(str(prefix))
+
+    def scan(self, prefix: Union[str, Path]) -> Iterator[ScanEntry]:
+        """Postupně vrátí obrázky a podsložky jedné složky v media."""
+        return LocalObjectStore(settings.MEDIA_ROOT, '').scan(str(prefix))
+
     @log_method
     def get_new_image_name(self, img_type: str, user_id: int) -> str:
         """
@@ -109,15 +217,23 @@ class PathHandlerLocal(PathHandlerProtocol):
             str: Nové jméno obrázku.
 
         Raises:
-            KeyError: Pokud je zadán neznámý typ obrázku.
-            ValueError: Pokud je zadáno neplatné ID uživatele.
+            UnknownImageTypeError: Pokud je zadán neznámý typ obrázku.
+            InvalidUserIDError: Pokud je zadáno neplatné ID uživatele.
+            ImageNameError: Pokud se jméno nepodaří vygenerovat.
         """
-        if user_id <= 0:
-            raise ...
+        if not isinstance(user_id, int) or user_id <= 0:
+            raise InvalidUserIDError(user_id)
+
+        try:
+            type_id = self.config.TYPE_ID[img_type]
+        except KeyError as e:
+            raise UnknownImageTypeError(img_type, self.image_types_str) from e
 
         try:
-            app_id = self.config.APP_ID
-            type_id = self.config.get_type_id(img_type)
-            return generate_image_name(app_id, type_id, user_id)
-        except ... as e:
-            raise ...
\ No newline at end of file
+            return ImageNameProcessor(
+                app_id=self.config.APP_ID,
+                type_id=type_id,
+                user_id=user_id
+            ).generate_image_name()
+        except (ImageNameProcessingError, ImageNameValidationError) as e:
+            raise ImageNameError(img_type) from e
@@ -0,0 +1,119 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+import os
+
+from django.conf import settings
+
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.utils.os.local_object_store import LocalObjectStore
+from img_manager.utils.os.scan_directory import ScanEntry
+from .path_handler_local import PathHandlerLocal
+
+
+@lru_cache(maxsize=None)
+def _upload_pool(workers: int, pid: int) -> ThreadPoolExecutor:
+    """
+    Vrátí sdílený pool vláken pro nahrávání obrázků.
+
+    Pool je vytvořen jednou za proces (``pid`` v klíči cache), protože
+    vlákna poolu vytvořeného před forkem v potomkovi neexistují.
+    """
+    return ThreadPoolExecutor(max_workers=workers,
+                              thread_name_prefix='profile-image-upload')
+
+
+class PathHandlerObjectStore(PathHandlerLocal):
+    """
+    Implementace PathHandlerProtocol ukládající obrázky do objektového úložiště.
+
+    Jména a relativní cesty obrázků jsou stejné jako u ``PathHandlerLocal``;
+    relativní cesta je klíčem objektu v bucketu. Webové uzly tak nepotřebují
+    sdílený souborový systém. Úložiště zastupuje ``LocalObjectStore``
+    (PROFILE_IMAGE_OBJECT_STORE_ROOT / PROFILE_IMAGE_OBJECT_STORE_BUCKET),
+    klient skutečného úložiště nabízí stejné operace.
+
+    ``put_many`` nahrává obrázky souběžně ve sdíleném poolu
+    PROFILE_IMAGE_UPLOAD_CONCURRENCY vláken, protože u vzdáleného úložiště
+    převažuje čekání na síť.
+    """
+
+    def __init__(self, store: LocalObjectStore = None) -> None:
+        """
+        Inicializuje handler s cestami, konfigurací a úložištěm.
+
+        Args:
+            store (LocalObjectStore): Úložiště objektů
+                (None = podle nastavení).
+        """
+        super().__init__()
+        if store is None:
+            store = LocalObjectStore(
+                get_setting('PROFILE_IMAGE_OBJECT_STORE_ROOT',
+                            Path(settings.BASE_DIR) / 'object_store'),
+                get_setting('PROFILE_IMAGE_OBJECT_STORE_BUCKET', 'profile-images'),
+            )
+        self.store = store
+        self.upload_concurrency = get_setting('PROFILE_IMAGE_UPLOAD_CONCURRENCY', 4)
+
+    @log_method
+    def get_absolute_media(self, relative_path: Path) -> Path:
+        """
+        Vrátí cestu k souboru objektu v lokální náhradě úložiště.
+
+        Skutečné objektové úložiště žádnou cestu nemá; obrázky se čtou
+        a zapisují jen přes ``get`` a ``put``.
+        """
+        return self.store.object_path(str(relative_path))
+
+    def get_location(self) -> str:
+        """Vrátí umístění úložiště (složku bucketu)."""
+        return str(self.store.location)
+
+    def put(self, relative_path: Union[str, Path], data: bytes) -> None:
+        self.store.put(self._key(relative_path), data)
+
+    def put_many(self, files: Dict[Union[str, Path], bytes]) -> None:
+        """
+        Nahraje obrázky souběžně a počká na dokončení všech.
+
+        Raises:
+            OSError: První chyba nahrávání (ostatní obrázky se dokončí).
+        """
+        if len(files) <= 1 or self.upload_concurrency <= 1:
+            super().put_many(files)
+            return
+        pool = _upload_pool(self.upload_concurrency, os.getpid())
+        futures = [pool.submit(self.put, relative_path, data)
+                   for relative_path, data in files.items()]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    def get(self, relative_path: Union[str, Path]) -> bytes:
+        return self.store.get(self._key(relative_path))
+
+    def exists(self, relative_path: Union[str, Path]) -> bool:
+        return self.store.exists(self._key(relative_path))
+
+    def move(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        """Zkopíruje objekt na nový klíč a smaže původní (bez rename)."""
+        self.put(target, self.get(source))
+        self.delete(source)
+
+    def delete(self, relative_path: Union[str, Path]) -> bool:
+        return self.store.delete(self._key(relative_path))
+
+    def list_prefix(self, prefix: Union[str, Path]) -> List[str]:
+        return self.store.list(str(prefix))
+
+    def scan(self, prefix: Union[str, Path]) -> Iterator[ScanEntry]:
+        return self.store.scan(str(prefix))
+
+    @staticmethod
+    def _key(relative_path: Union[str, Path]) -> str:
+        """Převede relativní cestu na klíč objektu (oddělovač '/')."""
+        return Path(relative_path).as_posix()
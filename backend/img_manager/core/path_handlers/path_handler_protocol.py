@@ -1,6 +1,8 @@
-from typing import Protocol
+from typing import Dict, Iterator, List, Protocol, Union
 from pathlib import Path
-from .default_images_constants_image_paths import ImagePaths, ImageConfig
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.config.profile_images.constants import ProfileImageConfig
+from img_manager.utils.os.scan_directory import ScanEntry
 
 class PathHandlerProtocol(Protocol):
     """
@@ -8,10 +10,16 @@ class PathHandlerProtocol(Protocol):
 
     Tento handler je použit k nastavení cest potřebných pro třídu DefaultImageHandler,
     která se stará o vytvoření kopie defaultního obrázku při založení instance uživatele.
+
+    Veškeré čtení, zápis a mazání obrázků probíhá přes metody ``put``,
+    ``put_many``, ``get``, ``exists``, ``move``, ``delete``, ``list_prefix``
+    a ``scan``. Obrázky jsou adresovány relativní cestou od media (klíčem),
+    takže úložiště lze vyměnit (PROFILE_IMAGE_STORAGE_BACKEND) bez změny
+    procesorů.
     """
 
-    paths: ImagePaths
-    config: ImageConfig
+    paths: ProfileImagePaths
+    config: ProfileImageConfig
 
     def __init__(self) -> None:
         """
@@ -20,7 +28,7 @@ class PathHandlerProtocol(Protocol):
         Atributy paths a config by měly být nastaveny v konstruktoru konkrétní implementace.
         """
 
-    def get_absolute_path_for_default(self, img_type: str) -> Path:
+    def get_absolute_default(self, img_type: str) -> Path:
         """
         Vrátí absolutní cestu k výchozímu obrázku daného typu.
 
@@ -35,7 +43,19 @@ class PathHandlerProtocol(Protocol):
         """
         ...
 
-    def create_relative_path_from_media(self, img_type: str, user_id: int) -> Path:
+    def get_shared_default(self, img_type: str) -> Path:
+        """
+        Vrátí relativní cestu od media ke sdílenému výchozímu obrázku.
+
+        Args:
+            img_type (str): Typ obrázku ('master' nebo 'thumbnail').
+
+        Returns:
+            Path: Relativní cesta ke sdílenému výchozímu obrázku.
+        """
+        ...
+
+    def create_new_relative(self, img_type: str, user_id: int) -> Path:
         """
         Vytvoří relativní cestu od media adresáře pro obrázek uživatele.
 
@@ -52,7 +72,7 @@ class PathHandlerProtocol(Protocol):
         """
         ...
 
-    def get_absolute_path_for_media(self, relative_path: Path) -> Path:
+    def get_absolute_media(self, relative_path: Path) -> Path:
         """
         Převede relativní cestu na absolutní cestu v media adresáři.
 
@@ -79,4 +99,115 @@ class PathHandlerProtocol(Protocol):
             KeyError: Pokud je zadán neznámý typ obrázku.
             ValueError: Pokud je zadáno neplatné ID uživatele.
         """
-        ...
\ No newline at end of file
+        ...
+
+    def put(self, relative_path: Union[str, Path], data: bytes) -> None:
+        """
+        Uloží obrázek pod relativní cestou; existující obrázek přepíše.
+
+        Zápis je atomický: ostatní procesy nikdy neuvidí rozepsaný obrázek.
+
+        Args:
+            relative_path (str | Path): Relativní cesta (klíč) obrázku.
+            data (bytes): Obsah obrázku.
+
+        Raises:
+            OSError: Pokud se obrázek nepodaří uložit.
+        """
+        ...
+
+    def put_many(self, files: Dict[Union[str, Path], bytes]) -> None:
+        """
+        Uloží více obrázků najednou (implementace je může nahrávat souběžně).
+
+        Args:
+            files (Dict[str | Path, bytes]): Obsah obrázků podle relativní cesty.
+
+        Raises:
+            OSError: Pokud se některý obrázek nepodaří uložit.
+        """
+        ...
+
+    def get(self, relative_path: Union[str, Path]) -> bytes:
+        """
+        Načte obsah obrázku.
+
+        Args:
+            relative_path (str | Path): Relativní cesta (klíč) obrázku.
+
+        Returns:
+            bytes: Obsah obrázku.
+
+        Raises:
+            FileNotFoundError: Pokud obrázek neexistuje.
+        """
+        ...
+
+    def move(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        """
+        Přesune obrázek na jinou relativní cestu; existující cíl přepíše.
+
+        Lokální úložiště soubor jen přejmenuje (atomicky, bez čtení obsahu);
+        objektové úložiště objekt zkopíruje a zdroj smaže.
+
+        Args:
+            source (str | Path): Relativní cesta (klíč) obrázku.
+            target (str | Path): Nová relativní cesta (klíč).
+
+        Raises:
+            FileNotFoundError: Pokud zdrojový obrázek neexistuje.
+            OSError: Pokud se obrázek nepodaří přesunout.
+        """
+        ...
+
+    def exists(self, relative_path: Union[str, Path]) -> bool:
+        """Ověří, zda obrázek s relativní cestou existuje."""
+        ...
+
+    def delete(self, relative_path: Union[str, Path]) -> bool:
+        """
+        Smaže obrázek, pokud existuje.
+
+        Args:
+            relative_path (str | Path): Relativní cesta (klíč) obrázku.
+
+        Returns:
+            bool: True, pokud byl obrázek smazán, False, pokud neexistoval.
+        """
+        ...
+
+    def list_prefix(self, prefix: Union[str, Path]) -> List[str]:
+        """
+        Vrátí seřazené relativní cesty všech obrázků začínajících prefixem.
+
+        Prefix se porovnává jako řetězec (jako u objektových úložišť), cesty
+        používají oddělovač '/'.
+
+        Args:
+            prefix (str | Path): Začátek relativní cesty.
+
+        Returns:
+            List[str]: Relativní cesty nalezených obrázků.
+        """
+        ...
+
+    def scan(self, prefix: Union[str, Path]) -> Iterator[ScanEntry]:
+        """
+        Postupně vrací obrázky a podsložky přímo pod prefixem (bez zanoření).
+
+        Na rozdíl od ``list_prefix`` výpis nenačítá do paměti a vrací
+        i velikost a čas změny obrázků, takže se hodí pro průchod velkých
+        složek (integrity check, migrace rozložení).
+
+        Args:
+            prefix (str | Path): Relativní cesta složky ('' nebo končící '/').
+
+        Yields:
+            ScanEntry: Klíč, velikost a čas změny (ns) obrázku; podsložky
+                mají klíč končící '/' a velikost i čas None. Neexistující
+                složka je prázdná.
+
+        Raises:
+            OSError: Pokud se výpis nepodaří.
+        """
+        ...
@@ -0,0 +1,190 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+import os
+
+from django.conf import settings
+
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.utils.os.pack_store import PackStore
+from img_manager.utils.os.scan_directory import ScanEntry
+from .path_handler_protocol import PathHandlerProtocol
+
+
+@lru_cache(maxsize=None)
+def _pack_store(directory: str, segment_size: int, pid: int) -> PackStore:
+    """
+    Vrátí úložiště náhledů sdílené v rámci procesu.
+
+    Index se tak načítá jednou za proces; ``pid`` v klíči cache zajistí,
+    že proces vzniklý forkem nesdílí zámek a mapy s rodičem.
+    """
+    return PackStore(directory, segment_size)
+
+
+def get_thumbnail_pack() -> Optional[PackStore]:
+    """
+    Vrátí úložiště náhledů v segmentech, pokud je zapnuté.
+
+    Returns:
+        Optional[PackStore]: Úložiště z PROFILE_IMAGE_THUMBNAIL_PACK_DIR,
+            None bez PROFILE_IMAGE_THUMBNAIL_PACK.
+    """
+    if not get_setting('PROFILE_IMAGE_THUMBNAIL_PACK', False):
+        return None
+    return _configured_pack()
+
+
+def _configured_pack() -> PackStore:
+    return _pack_store(
+        str(get_setting('PROFILE_IMAGE_THUMBNAIL_PACK_DIR',
+                        Path(settings.BASE_DIR) / 'thumbnail_pack')),
+        get_setting('PROFILE_IMAGE_THUMBNAIL_PACK_SEGMENT_SIZE',
+                    PackStore.SEGMENT_SIZE),
+        os.getpid(),
+    )
+
+
+class PathHandlerThumbnailPack(PathHandlerProtocol):
+    """
+    Implementace PathHandlerProtocol ukládající náhledy do segmentů.
+
+    Náhledy (klíče pod složkou ``thumbnail``) se ukládají do ``PackStore``
+    pod svým kódovaným jménem; ostatní obrázky a všechny cesty obsluhuje
+    obalený handler (lokální media nebo objektové úložiště). Relativní
+    cesta náhledu uložená u uživatele se nemění.
+
+    Náhledy uložené jako soubory před zapnutím segmentů se dál čtou
+    z obaleného handleru, dokud je ``compact_thumbnail_pack --import-files``
+    nepřesune do segmentů.
+
+    Args:
+        base (PathHandlerProtocol): Handler pro ostatní obrázky.
+        pack (PackStore): Úložiště náhledů (None = podle nastavení).
+    """
+
+    def __init__(self, base: PathHandlerProtocol, pack: PackStore = None) -> None:
+        self.base = base
+        self.pack = pack if pack is not None else _configured_pack()
+        self.paths = base.paths
+        self.config = base.config
+        # Klíče náhledů (ukládaných do segmentů) začínají tímto prefixem
+        thumbnails = self.paths.get_profile_images_rel_path('thumbnail')
+        self.thumbnail_prefix = f"{thumbnails.as_posix()}/"
+
+    def get_absolute_default(self, img_type: str) -> Path:
+        return self.base.get_absolute_default(img_type)
+
+    def get_shared_default(self, img_type: str) -> Path:
+        return self.base.get_shared_default(img_type)
+
+    def create_new_relative(self, img_type: str, user_id: int) -> Path:
+        return self.base.create_new_relative(img_type, user_id)
+
+    def get_absolute_media(self, relative_path: Path) -> Path:
+        return self.base.get_absolute_media(relative_path)
+
+    def get_new_image_name(self, img_type: str, user_id: int) -> str:
+        return self.base.get_new_image_name(img_type, user_id)
+
+    def put(self, relative_path: Union[str, Path], data: bytes) -> None:
+        name = self.get_pack_name(relative_path)
+        if name is None:
+            self.base.put(relative_path, data)
+        else:
+            self.pack.put(name, data)
+
+    def put_many(self, files: Dict[Union[str, Path], bytes]) -> None:
+        packed = {}
+        other = {}
+        for relative_path, data in files.items():
+            name = self.get_pack_name(relative_path)
+            if name is None:
+                other[relative_path] = data
+            else:
+                packed[name] = data
+        if packed:
+            self.pack.put_many(packed)
+        if other:
+            self.base.put_many(other)
+
+    def get(self, relative_path: Union[str, Path]) -> bytes:
+        name = self.get_pack_name(relative_path)
+        if name is not None and self.pack.exists(name):
+            return self.pack.get(name)
+        return self.base.get(relative_path)
+
+    def exists(self, relative_path: Union[str, Path]) -> bool:
+        name = self.get_pack_name(relative_path)
+        if name is not None and self.pack.exists(name):
+            return True
+        return self.base.exists(relative_path)
+
+    def move(self, source: Union[str, Path], target: Union[str, Path]) -> None:
+        """
+        Přesune obrázek; náhled v segmentech se přesouvá jen při změně jména.
+
+        Segmenty ukládají náhledy podle jména, takže cesta náhledu na jeho
+        umístění nemá vliv.
+        """
+        name = self.get_pack_name(source)
+        if name is not None and self.pack.exists(name):
+            if self.get_pack_name(target) != name:
+                self.put(target, self.pack.get(name))
+                self.pack.delete(name)
+            return
+        self.base.move(source, target)
+
+    def delete(self, relative_path: Union[str, Path]) -> bool:
+        name = self.get_pack_name(relative_path)
+        deleted = name is not None and self.pack.delete(name)
+        return self.base.delete(relative_path) or deleted
+
+    def list_prefix(self, prefix: Union[str, Path]) -> List[str]:
+        prefix = str(prefix)
+        keys = self.base.list_prefix(prefix)
+        if (self.thumbnail_prefix.startswith(prefix)
+                or prefix.startswith(self.thumbnail_prefix)):
+            keys.extend(
+                key for key in (
+                    self.paths.get_image_rel_path('thumbnail', name).as_posix()
+                    for name in self.pack.names()
+                ) if key.startswith(prefix)
+            )
+        return sorted(set(keys))
+
+    def scan(self, prefix: Union[str, Path]) -> Iterator[ScanEntry]:
+        """
+        Vrátí výpis obaleného handleru doplněný o náhledy v segmentech.
+
+        Náhledy se vypíšou pod svou relativní cestou s délkou a časem
+        zápisu z indexu segmentů.
+        """
+        prefix = str(prefix)
+        if not (self.thumbnail_prefix.startswith(prefix)
+                or prefix.startswith(self.thumbnail_prefix)):
+            yield from self.base.scan(prefix)
+            return
+        directories = set()
+        for entry in self.base.scan(prefix):
+            if entry.key.endswith('/'):
+                directories.add(entry.key)
+            yield entry
+        for name, pack_entry in self.pack.entries().items():
+            key = self.paths.get_image_rel_path('thumbnail', name).as_posix()
+            if not key.startswith(prefix):
+                continue
+            child, separator, _ = key[len(prefix):].partition('/')
+            if not separator:
+                yield ScanEntry(key, pack_entry.length,
+                                pack_entry.written_at * 1_000_000_000)
+            elif f"{prefix}{child}/" not in directories:
+                directories.add(f"{prefix}{child}/")
+                yield ScanEntry(f"{prefix}{child}/", None, None)
+
+    def get_pack_name(self, relative_path: Union[str, Path]) -> Optional[str]:
+        """Vrátí jméno náhledu v segmentech (None pro ostatní obrázky)."""
+        key = Path(relative_path).as_posix()
+        if key.startswith(self.thumbnail_prefix):
+            return key.rpartition('/')[2]
+        return None
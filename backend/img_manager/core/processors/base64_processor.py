@@ -1,27 +1,110 @@
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
+import base64
+import binascii
+import struct
 import time
 
-from users.models.services.utils.log_method import log_method
-from users.models.services.utils.is_debug_mode import is_debug_mode
-from .processor_utils.base64_utils import (
-    encode_int_to_base64,
-    decode_base64_to_int
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.is_debug_mode import is_debug_mode
+from img_manager.utils.base64.image_name_layout import (
+    HEADER,
+    HEADER_SIZE,
+    LAYOUT_MARKER,
+    LAYOUT_VERSION,
+    MAX_USER_ID,
+    pack_image_name,
+    unpack_image_name,
+    encode_varint,
+    decode_varint,
+    is_binary_layout,
+    name_to_bytes,
+    bytes_to_name,
 )
-from .processor_utils.processor_validation_utils import (
+from img_manager.utils.base64.processor_validation_utils import (
     validate_app_id,
     validate_type_id,
     validate_user_id,
     validate_timestamp
 )
-from .errors.processor_errors import (
-    InvalidBase64StringError,
+from img_manager.exceptions.image_name_layout_errors import (
+    ImageNameLayoutError
+)
+from img_manager.exceptions.base64_processor_errors import (
     MissingParametersError,
     EmptyImageNameError,
+    GenerateImageNameError,
     DecodedStringTooShortError,
-    ExpectedIntegerError
+    DekodeImageNameError
+)
+
+
+@dataclass
+class ImageNameBatch:
+    """
+    Columnar result of batch image name encoding or decoding.
+
+    Every column has the same length as the input; row ``i`` of each column
+    belongs to the ``i``-th input name (or record). Rows that failed to
+    encode or decode are marked with ``0`` in ``valid`` and hold zeroes
+    in the numeric columns.
+
+    Attributes:
+        names (List[str]): Base64 encoded image names ('' for failed encodes).
+        app_id (array): Application IDs ('B').
+        type_id (array): Image type IDs ('B').
+        timestamp (array): Creation timestamps ('q').
+        user_id (array): User IDs ('q').
+        valid (bytearray): Mask of successfully processed rows (1 = valid).
+    """
+    names: List[str] = field(default_factory=list)
+    app_id: array = field(default_factory=lambda: array('B'))
+    type_id: array = field(default_factory=lambda: array('B'))
+    timestamp: array = field(default_factory=lambda: array('q'))
+    user_id: array = field(default_factory=lambda: array('q'))
+    valid: bytearray = field(default_factory=bytearray)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def failed_count(self) -> int:
+        """Number of rows that failed to encode or decode."""
+        return len(self.valid) - sum(self.valid)
+
+    def row(self, index: int) -> Optional[Dict[str, int]]:
+        """
+        Return one row in the same shape as ``ImageNameProcessor.data``.
+
+        Args:
+            index (int): Row index.
+
+        Returns:
+            Optional[Dict[str, int]]: Decoded data, or None for a failed row.
+        """
+        if not self.valid[index]:
+            return None
+        return {
+            "app_id": self.app_id[index],
+            "type_id": self.type_id[index],
+            "timestamp": self.timestamp[index],
+            "user_id": self.user_id[index],
+        }
+
+
+# Largest timestamp accepted by datetime.utcfromtimestamp (9999-12-31).
+_MAX_TIMESTAMP = 253402300799
+
+# The batch path rejects rows with the same exceptions the validators and
+# base64 utils would raise, but without constructing them.
+_BATCH_ERRORS = (
+    binascii.Error, ValueError, TypeError, OverflowError, IndexError,
+    struct.error, ImageNameLayoutError
 )
 
+
 class ImageNameProcessor:
     """Processor for generating and decoding image names."""
 
@@ -65,6 +148,9 @@ class ImageNameProcessor:
         """
         Generate a base64-encoded image name.
 
+        The name uses the binary layout described in
+        ``img_manager.utils.base64.image_name_layout``.
+
         Returns:
             str: Base64 encoded image name.
 
@@ -73,22 +159,20 @@ class ImageNameProcessor:
             GenerateImageNameError: If the method crash.
         """
         try:
-            string = (
-                f"{self.data['app_id']}"
-                f"{self.data['type_id']}"
-                f"{self.data['timestamp']}"
-                f"{self.data['user_id']}"
-            )
-            integer = int(string)
-            image_name = encode_int_to_base64(integer)
+            image_name = bytes_to_name(pack_image_name(
+                self.data['app_id'],
+                self.data['type_id'],
+                self.data['timestamp'],
+                self.data['user_id'],
+            ))
 
             if self.debug_mode:
                 if not image_name:
                     raise EmptyImageNameError()
 
             return image_name
-        except (ValueError, Base64ProcessingError) as e:
-            raise GenerateImageNameError() from e
+        except (ValueError, ImageNameLayoutError) as e:
+            raise GenerateImageNameError(e) from e
 
     @staticmethod
     @log_method
@@ -96,6 +180,9 @@ class ImageNameProcessor:
         """
         Decode a base64 encoded image name.
 
+        Names in the binary layout are unpacked directly, legacy names
+        (decimal fields concatenated into one integer) are still accepted.
+
         Args:
             base64_name (str): Base64 encoded image name.
 
@@ -107,8 +194,20 @@ class ImageNameProcessor:
             DekodeImageNameError: If the method crash.
         """
         try:
-            decoded_number = decode_base64_to_int(base64_name)
-            decoded_string = str(decoded_number)
+            decoded_bytes = name_to_bytes(base64_name)
+
+            if is_binary_layout(decoded_bytes):
+                app_id, type_id, timestamp, user_id = unpack_image_name(
+                    decoded_bytes
+                )
+                return {
+                    "app_id": app_id,
+                    "type_id": type_id,
+                    "timestamp": timestamp,
+                    "user_id": user_id
+                }
+
+            decoded_string = str(int.from_bytes(decoded_bytes, 'big'))
 
             if len(decoded_string) < 13:
                 raise DecodedStringTooShortError(base64_name, decoded_string)
@@ -119,8 +218,8 @@ class ImageNameProcessor:
                 "timestamp": int(decoded_string[2:12]),
                 "user_id": int(decoded_string[12:])
             }
-        except (Base64ProcessingError, ValueError) as e:
-            raise DekodeImageNameError(base64_name) from e
+        except (binascii.Error, ValueError, ImageNameLayoutError) as e:
+            raise DekodeImageNameError(base64_name, e) from e
 
     @log_method
     def _validate_data(self) -> None:
@@ -137,3 +236,147 @@ class ImageNameProcessor:
         validate_type_id(self.data['type_id'])
         validate_user_id(self.data['user_id'])
         validate_timestamp(self.data['timestamp'])
+
+    @staticmethod
+    def decode_many(names: Iterable[str]) -> ImageNameBatch:
+        """
+        Decode many base64 image names into a columnar batch.
+
+        Unlike ``ImageNameProcessor(base64_name=...)`` this path bypasses
+        ``log_method``, ``is_debug_mode()`` and the per-field validators.
+        The same constraints are checked inline and names that do not
+        satisfy them are flagged in ``valid`` instead of raising.
+
+        Args:
+            names (Iterable[str]): Base64 encoded image names.
+
+        Returns:
+            ImageNameBatch: Decoded columns and validity mask.
+        """
+        names = names if isinstance(names, list) else list(names)
+        batch = ImageNameBatch(names=names)
+        b64decode = base64.urlsafe_b64decode
+        from_bytes = int.from_bytes
+        unpack_header = HEADER.unpack_from
+        single_byte_user_id = HEADER_SIZE + 1
+        padding = ('', '===', '==', '=')
+        app_ids = array('B')
+        type_ids = array('B')
+        timestamps = array('q')
+        user_ids = array('q')
+        valid = bytearray()
+
+        for name in names:
+            try:
+                decoded_bytes = b64decode(name + padding[len(name) & 3])
+                if decoded_bytes[0] == LAYOUT_MARKER:
+                    (_, version, app_id, type_id,
+                     ts_high, ts_low) = unpack_header(decoded_bytes)
+                    timestamp = (ts_high << 32) | ts_low
+                    if len(decoded_bytes) == single_byte_user_id:
+                        user_id = decoded_bytes[HEADER_SIZE]
+                        if user_id & 0x80:
+                            raise ValueError(name)
+                    else:
+                        user_id = decode_varint(decoded_bytes, HEADER_SIZE)
+                    if version != LAYOUT_VERSION:
+                        raise ValueError(version)
+                else:
+                    decoded_string = str(from_bytes(decoded_bytes, 'big'))
+                    app_id = ord(decoded_string[0]) - 48
+                    type_id = ord(decoded_string[1]) - 48
+                    timestamp = int(decoded_string[2:12])
+                    user_id = int(decoded_string[12:])
+                is_valid = (
+                    1 <= app_id <= 9 and 0 <= type_id <= 9
+                    and 0 < user_id <= MAX_USER_ID
+                    and timestamp <= _MAX_TIMESTAMP
+                )
+            except _BATCH_ERRORS:
+                is_valid = False
+
+            if is_valid:
+                app_ids.append(app_id)
+                type_ids.append(type_id)
+                timestamps.append(timestamp)
+                user_ids.append(user_id)
+                valid.append(1)
+            else:
+                app_ids.append(0)
+                type_ids.append(0)
+                timestamps.append(0)
+                user_ids.append(0)
+                valid.append(0)
+
+        batch.app_id = app_ids
+        batch.type_id = type_ids
+        batch.timestamp = timestamps
+        batch.user_id = user_ids
+        batch.valid = valid
+        return batch
+
+    @staticmethod
+    def encode_many(records: Iterable[Mapping[str, Any]]) -> ImageNameBatch:
+        """
+        Generate base64 image names for many records at once.
+
+        Each record has the same keys as ``ImageNameProcessor.data``;
+        ``timestamp`` is optional and defaults to the current time (taken
+        once for the whole batch). Invalid records are flagged in ``valid``
+        and get an empty name instead of raising.
+
+        Args:
+            records (Iterable[Mapping[str, Any]]): Records with app_id,
+                type_id, user_id and optionally timestamp.
+
+        Returns:
+            ImageNameBatch: Generated names, their columns and validity mask.
+        """
+        b64encode = base64.urlsafe_b64encode
+        pack_header = HEADER.pack
+        now = int(time.time())
+        names = []
+        app_ids = array('B')
+        type_ids = array('B')
+        timestamps = array('q')
+        user_ids = array('q')
+        valid = bytearray()
+
+        for record in records:
+            try:
+                app_id = record['app_id']
+                type_id = record['type_id']
+                user_id = record['user_id']
+                timestamp = record.get('timestamp', now)
+                if not (type(app_id) is int and 1 <= app_id <= 9
+                        and type(type_id) is int and 0 <= type_id <= 9
+                        and type(user_id) is int
+                        and 0 < user_id <= MAX_USER_ID
+                        and type(timestamp) is int
+                        and 0 <= timestamp <= _MAX_TIMESTAMP):
+                    raise ValueError(record)
+                name = b64encode(
+                    pack_header(LAYOUT_MARKER, LAYOUT_VERSION, app_id,
+                                type_id, timestamp >> 32,
+                                timestamp & 0xFFFFFFFF)
+                    + (bytes((user_id,)) if user_id < 0x80
+                       else encode_varint(user_id))
+                ).decode('ascii').rstrip('=')
+            except (KeyError, AttributeError) + _BATCH_ERRORS:
+                names.append('')
+                app_ids.append(0)
+                type_ids.append(0)
+                timestamps.append(0)
+                user_ids.append(0)
+                valid.append(0)
+                continue
+
+            names.append(name)
+            app_ids.append(app_id)
+            type_ids.append(type_id)
+            timestamps.append(timestamp)
+            user_ids.append(user_id)
+            valid.append(1)
+
+        return ImageNameBatch(names, app_ids, type_ids, timestamps, user_ids,
+                              valid)
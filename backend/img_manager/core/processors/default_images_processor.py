@@ -1,23 +1,36 @@
-from ._default_data.protocols.path_handler_protocol import PathHandlerProtocol
-from users.models.services.utils.os_copy_file import copy_file
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.core.path_handlers.path_handler_protocol import PathHandlerProtocol
 
 class DefaultImageProcessor:
+    """
+    Nastavení výchozích profilových obrázků uživateli.
+
+    S PROFILE_IMAGE_SHARED_DEFAULTS (výchozí) uživatel odkazuje na sdílené
+    výchozí obrázky uložené v media jen jednou, takže registrace nepracuje
+    se soubory. Jinak se výchozí obrázky kopírují pro každého uživatele.
+    """
+
     def __init__(self, path_handler: PathHandlerProtocol, user):
         self.paths = path_handler
         self.user = user
+        self.shared = get_setting('PROFILE_IMAGE_SHARED_DEFAULTS', True)
 
     def set_default_images(self):
         try:
-            relative_path_master = self._copy_default('master')
-            relative_path_thumbnail = self._copy_default('thumbnail')
-            self.user.profile_image = relative_path_master
-            self.user.profile_image_thumbnail = relative_path_thumbnail
+            relative_path_master = self._get_default('master')
+            relative_path_thumbnail = self._get_default('thumbnail')
+            self.user.profile_image = str(relative_path_master)
+            self.user.profile_image_thumbnail = str(relative_path_thumbnail)
         except Exception as e:
             print(f"Error setting default images: {e}")
 
+    def _get_default(self, img_type):
+        if self.shared:
+            return self.paths.get_shared_default(img_type)
+        return self._copy_default(img_type)
+
     def _copy_default(self, img_type):
         default_image_path = self.paths.get_absolute_default(img_type)
         relative_path = self.paths.create_new_relative(img_type, self.user.id)
-        absolute_path = self.paths.get_absolute_media(relative_path)
-        copy_file(default_image_path, absolute_path)
+        self.paths.put(relative_path, default_image_path.read_bytes())
         return relative_path
@@ -1,53 +1,213 @@
+import io
+import os
+from PIL import Image
+from django.core.exceptions import ValidationError
+
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.core.config.profile_images.constants import ProfileImageConfig
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.utils.os.validate_file_size import validate_size
+from img_manager.utils.pil.draft_image import draft_square
+from img_manager.utils.pil.resize_image import resize_image
+from img_manager.utils.pil.save_image import encode_image
+from img_manager.utils.pil.square_crop_center import square_crop_box
+from img_manager.utils.pil.validate_image_header import validate_image_header
+
+
 class NewImageProcessor:
+    """
+    Zpracování nově nahraného profilového obrázku.
+
+    Nahraný obrázek se zpracuje v paměti (``UploadedFile``, bajty nebo
+    cesta k souboru) a dekóduje se jen jednou: JPEG rovnou zmenšený
+    dekodérem (``draft``) na nejmenší velikost, ze které lze ještě vyříznout
+    čtverec pro master. Ostatní formáty se před LANCZOS nejprve rychle
+    zmenší celočíselným ``reduce()`` (``reducing_gap``). Náhled se pak
+    počítá z již zmenšeného masteru, ne z originálu. Do úložiště path
+    handleru se zapisují jen dva výsledné obrázky, najednou (``put_many``).
+
+    Před dekódováním se z hlavičky ověří formát a deklarované rozměry:
+    obrázek smí mít nejvýše ``get_pixel_budget()`` pixelů.
+    """
     MIN_IMG_SIZE_IN_MB = 0.1
     MAX_IMG_SIZE_IN_MB = 5
     IMG_OUTPUT_DPI = (72, 72)
     IMG_OUTPUT_FORMAT = 'JPEG'
+    REDUCING_GAP = 3.0
+    UPLOAD_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+    # Násobek plochy masteru, kolik pixelů smí mít nahraný obrázek
+    # (400 x 400 x 400 = 64 Mpx)
+    UPLOAD_PIXEL_FACTOR = 400
     SIZE = {
         'master': (400, 400),
         'thumbnail': (64, 64),
     }
+    BACKUP_KEYS = {
+        'master': 'profile_image',
+        'thumbnail': 'profile_image_thumbnail',
+    }
 
     @staticmethod
-    def process_new_image(user):
-        try:
-            uploaded_image_path = user.profile_image.path
-            NewImageProcessor._validate_image(uploaded_image_path)
-            NewImageProcessor._create_and_save_new_profile_images(user, uploaded_image_path)
-            NewImageProcessor._cleanup_files(user, uploaded_image_path)
-        except Exception as e:
-            print(f"Error processing new profile image: {e}")
+    @log_method
+    def process_new_image(user, upload=None, path_handler=None):
+        """
+        Vytvoří a uloží master a náhled z nahraného obrázku uživatele.
+
+        Args:
+            user: Uživatel, jehož obrázky se mají nastavit.
+            upload: ``UploadedFile``, bajty nebo cesta k nahranému obrázku
+                (None = soubor přiřazený do ``user.profile_image``).
+            path_handler (PathHandlerProtocol): Úložiště obrázků
+                (None = podle PROFILE_IMAGE_STORAGE_BACKEND).
+
+        Raises:
+            ValidationError: Pokud nahraný soubor není platný obrázek
+                nebo nemá povolenou velikost; uživatel se nezmění.
+        """
+        if upload is None:
+            upload = user.profile_image
+        if path_handler is None:
+            path_handler = get_path_handler()
+        NewImageProcessor._create_and_save_new_profile_images(
+            user, upload, path_handler)
+        NewImageProcessor._cleanup_files(user, upload, path_handler)
+
+    @staticmethod
+    def get_pixel_budget():
+        """
+        Vrátí nejvyšší povolený počet pixelů nahraného obrázku.
+
+        Rozpočet je násobkem plochy masteru z ``ProfileImageConfig.SIZE``
+        (PROFILE_IMAGE_UPLOAD_PIXEL_FACTOR, výchozí ``UPLOAD_PIXEL_FACTOR``).
+        """
+        width, height = ProfileImageConfig().SIZE['master']
+        factor = get_setting('PROFILE_IMAGE_UPLOAD_PIXEL_FACTOR',
+                             NewImageProcessor.UPLOAD_PIXEL_FACTOR)
+        return width * height * factor
+
+    @staticmethod
+    @log_method
+    def _load_upload(upload):
+        """
+        Načte nahraný obrázek do paměti a ověří jeho velikost a hlavičku.
+
+        Velikost souboru i hlavička se ověří ještě před načtením celého
+        souboru, pokud je to možné.
+
+        Returns:
+            io.BytesIO: Obsah nahraného obrázku.
+        """
+        limits = (NewImageProcessor.MIN_IMG_SIZE_IN_MB,
+                  NewImageProcessor.MAX_IMG_SIZE_IN_MB)
+        if isinstance(upload, (bytes, bytearray, memoryview)):
+            data = bytes(upload)
+            validate_size(len(data), *limits)
+            NewImageProcessor._validate_header(data)
+        elif isinstance(upload, (str, os.PathLike)):
+            validate_size(os.path.getsize(upload), *limits)
+            with open(upload, 'rb') as f:
+                NewImageProcessor._validate_header(f)
+                data = f.read()
+        else:
+            if getattr(upload, 'size', None) is not None:
+                validate_size(upload.size, *limits)
+            upload.seek(0)
+            NewImageProcessor._validate_header(upload)
+            data = upload.read()
+            validate_size(len(data), *limits)
+        return io.BytesIO(data)
 
     @staticmethod
-    def _validate_image(uploaded_image_path):
-        validate_image_format(uploaded_image_path)
-        validate_file_size(uploaded_image_path, NewImageProcessor.MIN_IMG_SIZE_IN_MB, NewImageProcessor.MAX_IMG_SIZE_IN_MB)
+    @log_method
+    def _validate_header(image):
+        validate_image_header(image, NewImageProcessor.UPLOAD_FORMATS,
+                              NewImageProcessor.get_pixel_budget())
 
     @staticmethod
-    def _create_and_save_new_profile_images(user, uploaded_image_path):
-        with Image.open(uploaded_image_path) as img:
-            img.info['dpi'] = NewImageProcessor.IMG_OUTPUT_DPI
-            img = square_crop_center(img)
-            user.profile_image = NewImageProcessor._create_image(img, 'master')
-            user.profile_image_thumbnail = NewImageProcessor._create_image(img, 'thumbnail')
+    @log_method
+    def _create_and_save_new_profile_images(user, upload, path_handler):
+        images = NewImageProcessor.create_profile_images(upload)
+        paths = NewImageProcessor._save_images(images, user.id, path_handler)
+        user.profile_image = paths['master']
+        user.profile_image_thumbnail = paths['thumbnail']
+
+    @staticmethod
+    @log_method
+    def create_profile_images(upload):
+        """
+        Ověří nahraný obrázek a vytvoří z něj master a náhled v paměti.
+
+        Args:
+            upload: ``UploadedFile``, bajty nebo cesta k nahranému obrázku.
+
+        Returns:
+            Dict[str, bytes]: Zakódovaný master a náhled podle typu obrázku.
+
+        Raises:
+            ValidationError: Pokud nahraný soubor není platný obrázek
+                nebo nemá povolenou velikost.
+        """
+        buffer = NewImageProcessor._load_upload(upload)
+        try:
+            master = NewImageProcessor.create_master(buffer)
+        except (OSError, SyntaxError, ValueError) as e:
+            raise ValidationError(
+                "The uploaded file is not a valid image.") from e
+        thumbnail = NewImageProcessor._resize_image(master, 'thumbnail')
+        return {
+            img_type: encode_image(img, NewImageProcessor.IMG_OUTPUT_FORMAT,
+                                   dpi=NewImageProcessor.IMG_OUTPUT_DPI)
+            for img_type, img in (('master', master), ('thumbnail', thumbnail))
+        }
+
+    @staticmethod
+    @log_method
+    def create_master(uploaded_image):
+        """
+        Načte nahraný obrázek a vytvoří z něj čtvercový master.
+
+        Args:
+            uploaded_image: Cesta k nahranému obrázku nebo binární soubor.
+
+        Returns:
+            Image.Image: Master v režimu RGB o velikosti ``SIZE['master']``.
+        """
+        size = NewImageProcessor.SIZE['master']
+        with Image.open(uploaded_image) as img:
+            draft_square(img, max(size))
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            return resize_image(img, size, box=square_crop_box(img.size),
+                                reducing_gap=NewImageProcessor.REDUCING_GAP)
 
     @staticmethod
-    def _create_image(img, img_type):
-        resized_img = NewImageProcessor._resize_image(img, img_type)
-        relative_path = PathHandler.create_relative_path_from_media(img_type)
-        absolute_path = PathHandler.get_absolute_path_for_media(relative_path)
-        save_image(resized_img, absolute_path, NewImageProcessor.IMG_OUTPUT_FORMAT)
-        return relative_path
+    @log_method
+    def _save_images(images, user_id, path_handler):
+        paths = {
+            img_type: str(path_handler.create_new_relative(img_type, user_id))
+            for img_type in images
+        }
+        path_handler.put_many({paths[img_type]: data
+                               for img_type, data in images.items()})
+        return paths
 
     @staticmethod
+    @log_method
     def _resize_image(img, img_type):
-        return resize_image(img, NewImageProcessor.SIZE[img_type])
+        return resize_image(img, NewImageProcessor.SIZE[img_type],
+                            reducing_gap=NewImageProcessor.REDUCING_GAP)
 
     @staticmethod
-    def _cleanup_files(user, uploaded_image_path):
-        delete_file(uploaded_image_path)
-        for img_type in ['master', 'thumbnail']:
-            old_path = user.backup_data.get(img_type)
-            if old_path:
-                absolute_path = os.path.join(settings.MEDIA_ROOT, old_path)
-                delete_file(absolute_path)
\ No newline at end of file
+    @log_method
+    def _cleanup_files(user, upload, path_handler):
+        # Nahraný soubor je na disku jen tehdy, pokud už byl uložen ve storage
+        if getattr(upload, '_committed', False) and upload.name:
+            upload.storage.delete(upload.name)
+        paths = ProfileImagePaths()
+        for img_type, key in NewImageProcessor.BACKUP_KEYS.items():
+            old_path = user.backup_data.get(key)
+            # Sdílené výchozí obrázky patří všem uživatelům
+            if old_path and not paths.is_shared_default(old_path):
+                path_handler.delete(old_path)
@@ -1,23 +1,72 @@
-from ._processor_data.default_images_handler import DefaultImageHandler
-from ._processor_data.new_image_processor import NewImageProcessor
-from ._processor_data._default_data.path_handler_local import PathHandlerLocal
+from django.utils import timezone
+
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from .default_images_processor import DefaultImageProcessor
+from .new_image_processor import NewImageProcessor
 
 class ProfileImageProcessor:
     def __init__(self, user):
         self.user = user
 
     def set_default_profile_images(self):
-        path_handler = PathHandlerLocal()
-        DefaultImageHandler.set_default_images(path_handler, self.user)
+        path_handler = get_path_handler()
+        DefaultImageProcessor(path_handler, self.user).set_default_images()
         self._backup_and_save()
 
-    def process_new_profile_img(self):
+    def process_new_profile_img(self, deferred=None):
+        """
+        Zpracuje nově nahraný profilový obrázek.
+
+        V odloženém režimu (``deferred`` nebo PROFILE_IMAGE_UPLOAD_DEFERRED)
+        se nahraný soubor jen uloží do fronty a uživateli zůstanou předchozí
+        obrázky, dokud úlohu nezpracuje ``process_profile_image_queue``.
+
+        Args:
+            deferred (Optional[bool]): Zpracovat obrázek ve frontě
+                (None = podle nastavení).
+
+        Returns:
+            Optional[ProfileImageUploadJob]: Úloha ve frontě
+                (jen v odloženém režimu).
+
+        Raises:
+            ValidationError: Pokud nahraný soubor není platný obrázek;
+                uživatel se v tom případě neuloží.
+        """
+        if deferred is None:
+            deferred = get_setting('PROFILE_IMAGE_UPLOAD_DEFERRED', False)
+        if deferred:
+            return self._enqueue_new_profile_img()
         NewImageProcessor.process_new_image(self.user)
         self._backup_and_save()
 
+    def _enqueue_new_profile_img(self):
+        from img_manager.services.profile_images.upload_queue import \
+            ProfileImageUploadQueue
+
+        upload = self.user.profile_image
+        job = ProfileImageUploadQueue().enqueue(self.user, upload)
+        # Nahraný soubor už uložený ve storage byl zkopírován do fronty
+        if upload._committed:
+            upload.delete(save=False)
+
+        # Uživateli zůstanou předchozí obrázky, dokud úloha nedoběhne
+        self.user.profile_image = self.user.backup_data.get('profile_image', '')
+        self.user.profile_image_thumbnail = self.user.backup_data.get(
+            'profile_image_thumbnail', '')
+        self.user.save(update_fields=['profile_image', 'profile_image_thumbnail'])
+        return job
+
     def _backup_and_save(self):
+        from img_manager.services.profile_images.avatar_lookup import \
+            avatar_lookup
+
         master = self.user.profile_image.name
         thumbnail = self.user.profile_image_thumbnail.name
         self.user.backup_data['profile_image'] = master
         self.user.backup_data['profile_image_thumbnail'] = thumbnail
-        self.user.save()
\ No newline at end of file
+        self.user.profile_image_changed = timezone.now()
+        self.user.save()
+        # Seznamy uživatelů musí dostat URL nových obrázků
+        avatar_lookup.invalidate(self.user.pk)
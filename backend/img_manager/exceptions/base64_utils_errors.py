@@ -42,22 +42,21 @@ class EncodeIntToBase64Error(Base64ProcessingError):
 class ExpectedStringError(Base64ProcessingError):
     """Výjimka pro případ že vstupní hodnota není řetězec."""
     def __init__(self, provided_type: str):
-        self.base64_string = base64_string
+        self.provided_type = provided_type
         super().__init__(
-            f"Chyba při převodu base64 řetězce {base64_string} na číslo. "
+            f"Chyba při převodu hodnoty typu {provided_type} na číslo. "
             "Vstupní hodnota musí být řetězec."
         )
 
 class EmptyStringError(Base64ProcessingError):
     """Výjimka pro případ, kdy vstupní hodnota je prázdný řetězec."""
     def __init__(self):
-        self.base64_string = base64_string
         super().__init__(
-            f"Chyba při převodu base64 řetězce {base64_string} na číslo. "
+            "Chyba při převodu base64 řetězce na číslo. "
             "Vstupní hodnota nemůže být prázdný řetězec."
         )
 
-class NegativeIntegerOutputError(ImageNameProcessingError):
+class NegativeIntegerOutputError(Base64ProcessingError):
     """Výjimka pro případ že výsledkem funkce je záporné číslo."""
     def __init__(self, base64_string: str, decoded_int: int):
         self.base64_string = base64_string
@@ -67,10 +66,10 @@ class NegativeIntegerOutputError(ImageNameProcessingError):
             f"Výsledkem nemůže být záporné číslo: {decoded_int}"
         )
 
-class DecodeBase64ToStringError(ImageNameProcessingError):
+class DecodeBase64ToStringError(Base64ProcessingError):
     """Výjimka pro případ selhání převodu base64 formátu na celé číslo."""
-    def __init__(self, integer: int, original_exception: Exception):
-        self.integer = integer
+    def __init__(self, base64_string: str, original_exception: Exception):
+        self.base64_string = base64_string
         self.original_exception = original_exception
         super().__init__(
             f"Chyba při převodu base64 řetězce {base64_string} na číslo."
@@ -2,14 +2,14 @@ class ImageNameProcessingError(Exception):
     """General exception for image name processing errors."""
     pass
 
-class ExpectedIntegerError(Base64ProcessingError):
+class ExpectedIntegerError(ImageNameProcessingError):
     """Výjimka pro případ, že vstupní hodnota není celé číslo"""
     def __init__(self, provided_type: str):
         self.provided_type = provided_type
         super().__init__(
             "Chyba validace vstupních dat třídy ImageNameProcessor. "
             "Vstupní hodnota musí být celé číslo. "
-            "Obdržený typ vstupní hodnoty: {provided_type}."
+            f"Obdržený typ vstupní hodnoty: {provided_type}."
         )
 
 class InvalidAppIDError(ImageNameProcessingError):
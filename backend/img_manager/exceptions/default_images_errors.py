@@ -32,13 +32,13 @@ class ImagePathError(ImageProcessingError):
 
 class NonexistentImagePathError(ImageProcessingError):
     """Výjimka pro nenalezení souboru obrázku na dané cestě."""
-    def __init__(self, img_type: str):
+    def __init__(self, absolute_path: str):
         self.absolute_path = absolute_path
         super().__init__(
             f"Cesta: '{absolute_path}' neodkazuje na žádný soubor."
         )
 
-class ImageNameError(ImageError):
+class ImageNameError(ImageProcessingError):
     """Výjimka pro chyby spojené se získáváním cesty k obrázkům."""
     def __init__(self, img_type: str):
         self.img_type = img_type
@@ -0,0 +1,33 @@
+class ImageNameLayoutError(Exception):
+    """Obecná výjimka pro chyby binárního formátu jména obrázku."""
+    pass
+
+class FieldOutOfRangeError(ImageNameLayoutError):
+    """Výjimka pro hodnotu, která se nevejde do svého pole ve formátu."""
+    def __init__(self, field_name: str, value: int, max_value: int):
+        self.field_name = field_name
+        self.value = value
+        self.max_value = max_value
+        super().__init__(
+            f"Chyba při sestavení binárního jména obrázku. "
+            f"Hodnota pole {field_name} musí být v rozmezí 0 až {max_value}. "
+            f"Obdržená hodnota: {value}."
+        )
+
+class UnsupportedLayoutVersionError(ImageNameLayoutError):
+    """Výjimka pro neznámou verzi binárního formátu jména obrázku."""
+    def __init__(self, version: int):
+        self.version = version
+        super().__init__(
+            f"Chyba při čtení binárního jména obrázku. "
+            f"Verze formátu {version} není podporována."
+        )
+
+class TruncatedImageNameError(ImageNameLayoutError):
+    """Výjimka pro binární jméno obrázku, kterému chybí část dat."""
+    def __init__(self, length: int):
+        self.length = length
+        super().__init__(
+            f"Chyba při čtení binárního jména obrázku. "
+            f"Data o délce {length} B neobsahují všechna pole formátu."
+        )
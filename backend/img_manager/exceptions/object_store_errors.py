@@ -0,0 +1,22 @@
+class ObjectStoreError(Exception):
+    """Obecná výjimka pro chyby objektového úložiště profilových obrázků."""
+    pass
+
+class InvalidObjectKeyError(ObjectStoreError, ValueError):
+    """Výjimka pro klíč objektu, který nelze v úložišti použít."""
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(
+            f"Neplatný klíč objektu: '{key}'. Klíč musí být relativní cesta "
+            f"oddělená '/' bez prázdných částí, '.' a '..'."
+        )
+
+class UnknownStorageBackendError(ObjectStoreError):
+    """Výjimka pro neznámé úložiště v PROFILE_IMAGE_STORAGE_BACKEND."""
+    def __init__(self, backend: str, backends: str):
+        self.backend = backend
+        self.backends = backends
+        super().__init__(
+            f"Neznámé úložiště profilových obrázků: '{backend}'. "
+            f"Správné hodnoty: '{backends}'."
+        )
@@ -0,0 +1,10 @@
+class OsUtilityError(Exception):
+    """Obecná výjimka pro chyby při práci se souborovým systémem."""
+    pass
+
+class ListFileError(OsUtilityError):
+    """Výjimka pro chyby při čtení obsahu adresáře."""
+    def __init__(self, directory_path: str, text: str):
+        self.directory_path = directory_path
+        self.text = text
+        super().__init__(f"{text} Path: {directory_path}")
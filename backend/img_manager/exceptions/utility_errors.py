@@ -24,7 +24,7 @@ class EmptyDictionaryError(ImgManagerUtilityError):
             f"{self.message} Vstupní slovník neobsahuje žádné data."
         )
 
-class InvalidClassTypeError(ImgManagerUtilitiesError):
+class InvalidClassTypeError(ImgManagerUtilityError):
     """Výjimka pro případ že se nejdná o třídu."""
     def __init__(self, function_name: str, detected_type: str):
         super().__init__(function_name)
@@ -34,7 +34,7 @@ class InvalidClassTypeError(ImgManagerUtilitiesError):
             f"Zjištěný typ: {detected_type}."
         )
 
-class NoAttributeError(ImgManagerUtilitiesError):
+class NoAttributeError(ImgManagerUtilityError):
     """Výjimka pro případ že daná třída nemá žádný atribut."""
     def __init__(self, function_name: str, class_name: str):
         super().__init__(function_name)
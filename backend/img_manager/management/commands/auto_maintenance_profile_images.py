@@ -32,9 +32,9 @@ Tento nový příkaz je ideální pro pravidelnou údržbu nebo pro situace, kdy
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
 from io import StringIO
-from users.models.services.profile_image_integrity_checker import ProfileImageIntegrityChecker
-from users.models.services.missing_profile_image_processor import MissingProfileImageProcessor
-from users.models.services.extra_profile_image_processor import ExtraProfileImageProcessor
+from img_manager.services.profile_images.integrity_check import ProfileImageIntegrityChecker
+from img_manager.services.profile_images.fill_missing import MissingProfileImageProcessor
+from img_manager.services.profile_images.remove_extra import ExtraProfileImageProcessor
 
 class Command(BaseCommand):
     help = 'Automatically perform full profile image maintenance'
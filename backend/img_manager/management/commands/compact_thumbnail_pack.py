@@ -0,0 +1,54 @@
+"""
+This module contains a Django management command maintaining the pack of
+profile image thumbnails.
+
+For detailed usage instructions, refer to the docstring of the Command class.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from img_manager.services.profile_images.thumbnail_pack import \
+    ThumbnailPackMaintenance
+
+
+class Command(BaseCommand):
+    """
+    Rewrites the thumbnail pack (PROFILE_IMAGE_THUMBNAIL_PACK) with only the
+    thumbnails referenced by users, reclaiming the space of replaced and
+    deleted thumbnails.
+
+    With --import-files, thumbnails stored as files before the pack was
+    enabled are moved into the pack first.
+
+    Example usage:
+        ```bash
+        $ python manage.py compact_thumbnail_pack --dry-run
+        $ python manage.py compact_thumbnail_pack --import-files
+        ```
+    """
+
+    help = 'Import thumbnail files into the thumbnail pack and compact it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--import-files', action='store_true',
+                            help="Move thumbnail files into the pack first")
+        parser.add_argument('--grace', type=int, default=None,
+                            help="Keep unassigned entries younger than this "
+                                 "many seconds")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only count what would be imported and dropped")
+
+    def handle(self, *args, **options):
+        try:
+            maintenance = ThumbnailPackMaintenance(
+                grace=options['grace'], dry_run=options['dry_run'])
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e)) from e
+
+        if options['import_files']:
+            maintenance.import_files()
+        maintenance.compact()
+
+        for error in maintenance.errors:
+            self.stdout.write(self.style.ERROR(error))
+        self.stdout.write(self.style.SUCCESS(maintenance.summary()))
@@ -5,7 +5,11 @@ Pro použití těchto příkazů v terminálu:
 
 1. Pro zpracování uživatelů s chybějícími profilovými obrázky:
    ```
-   python manage.py process_missing_profile_images
+   python manage.py fill_missing_profile_images
+   ```
+   nebo paralelně v N procesech
+   ```
+   python manage.py fill_missing_profile_images --workers N
    ```
 
 2. Pro odstranění nadbytečných profilových obrázků:
@@ -25,9 +29,9 @@ Tyto příkazy budou vypisovat informace do terminálu a nabízet možnosti dal
 """
 
 from django.core.management.base import BaseCommand
-from users.models.services.profile_image_integrity_checker import \
+from img_manager.services.profile_images.integrity_check import \
     ProfileImageIntegrityChecker
-from users.models.services.missing_profile_image_processor import \
+from img_manager.services.profile_images.fill_missing import \
     MissingProfileImageProcessor
 
 
@@ -37,8 +41,11 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('user_ids', nargs='*', type=int,
                             help="User IDs to process")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Number of processes creating the images")
 
     def handle(self, *args, **options):
+        checker = None
         user_ids = options['user_ids']
 
         if not user_ids:
@@ -57,12 +64,14 @@ class Command(BaseCommand):
                 "No users with missing profile images found."))
             return
 
-        # Get the full user data and unassigned masters
-        checker = ProfileImageIntegrityChecker()
-        users_missing_images = [user for user in checker.users if
+        # Get the full user data and unassigned masters (reusing the check
+        # run above, if any)
+        checker = checker or ProfileImageIntegrityChecker()
+        user_ids = set(user_ids)
+        users_missing_images = [user for user in checker.users_missing_images if
                                 user['id'] in user_ids]
         unassigned_masters = checker.unassigned_masters
 
         report = MissingProfileImageProcessor.process_and_report(
-            users_missing_images, unassigned_masters)
+            users_missing_images, unassigned_masters, options['workers'])
         self.stdout.write(report)
\ No newline at end of file
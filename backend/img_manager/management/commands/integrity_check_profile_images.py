@@ -11,6 +11,11 @@ Tento Django management command vytváří nový příkaz `check_profile_images`
    python manage.py check_profile_images --verbose
    ```
 
+3. Pro úplné přestavění manifestu (jinak se kontrolují jen změněné složky a uživatelé):
+   ```
+   python manage.py check_profile_images --full
+   ```
+
 Tento příkaz provede následující:
 
 1. Zavolá statickou metodu `check()` třídy `ProfileImageIntegrityChecker`.
@@ -25,7 +30,9 @@ Navíc, díky tomu, že jsme v předchozí úpravě implementovali ukládání v
 To umožňuje efektivní workflow, kde můžete nejprve spustit kontrolu, prohlédnout si výsledky a pak snadno navázat dalšími akcemi bez nutnosti opakovat analýzu.
 """
 from django.core.management.base import BaseCommand
-from users.models.services.profile_image_integrity_checker import \
+from backend.shared_utils.metrics.peak_rss import format_peak_rss
+from backend.shared_utils.metrics.query_counter import QueryCounter
+from img_manager.services.profile_images.integrity_check import \
     ProfileImageIntegrityChecker
 
 
@@ -38,12 +45,25 @@ class Command(BaseCommand):
             action='store_true',
             help='Increase output verbosity',
         )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild the profile image manifest from scratch',
+        )
+        parser.add_argument(
+            '--database',
+            help='Database alias to scan users from '
+                 '(default: PROFILE_IMAGE_READ_DATABASE)',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write(
             self.style.SUCCESS("Starting profile image integrity check..."))
 
-        report = ProfileImageIntegrityChecker.check()
+        with QueryCounter() as counter:
+            checker = ProfileImageIntegrityChecker(
+                full=options['full'], using=options['database'])
+            report = checker._generate_report()
 
         if options['verbose']:
             self.stdout.write(report)
@@ -52,11 +72,28 @@ class Command(BaseCommand):
             summary = self._generate_summary(report)
             self.stdout.write(summary)
 
+        self.stdout.write(self._generate_manifest_summary(checker.manifest))
+        self.stdout.write(counter.summary())
+
         self.stdout.write(
             self.style.SUCCESS("Profile image integrity check completed."))
         self.stdout.write(
             "For detailed results, check the generated report or run this command with --verbose flag.")
 
+    def _generate_manifest_summary(self, manifest):
+        mode = "full rebuild" if manifest.full else "incremental"
+        stats = manifest.stats
+        summary = (
+            f"\nManifest ({mode}): "
+            f"{stats['scanned_directories']} directories scanned, "
+            f"{stats['skipped_directories']} unchanged, "
+            f"{stats['changed_users']} users processed, "
+            f"peak RSS {format_peak_rss()}"
+        )
+        for error in manifest.errors:
+            summary += f"\n{self.style.WARNING(error)}"
+        return summary
+
     def _generate_summary(self, report):
         # Extract key information from the report
         lines = report.split('\n')
@@ -0,0 +1,45 @@
+"""
+This module contains a Django management command moving profile images into
+the configured directory layout.
+
+For detailed usage instructions, refer to the docstring of the Command class.
+"""
+from django.core.management.base import BaseCommand
+
+from img_manager.services.profile_images.relayout import \
+    ProfileImageLayoutMigration
+
+
+class Command(BaseCommand):
+    """
+    Moves profile images into the layout of PROFILE_IMAGE_SHARD_LEVELS and
+    PROFILE_IMAGE_SHARD_WIDTH and updates the paths stored for users.
+
+    Users are processed in batches (one bulk_update per batch), then the
+    unassigned files are moved. The command can be run again after an
+    interruption.
+
+    Example usage:
+        ```bash
+        $ python manage.py migrate_profile_image_layout --dry-run
+        $ python manage.py migrate_profile_image_layout --batch-size 5000
+        ```
+    """
+
+    help = 'Move profile images into the configured directory layout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=ProfileImageLayoutMigration.BATCH_SIZE,
+                            help="Number of users or files processed at once")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only count the files that would be moved")
+
+    def handle(self, *args, **options):
+        migration = ProfileImageLayoutMigration(
+            options['batch_size'], options['dry_run'])
+        migration.run()
+
+        for error in migration.errors:
+            self.stdout.write(self.style.ERROR(error))
+        self.stdout.write(self.style.SUCCESS(migration.summary()))
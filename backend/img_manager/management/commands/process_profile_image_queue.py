@@ -0,0 +1,70 @@
+"""
+This module contains a Django management command processing the queue of
+uploaded profile images.
+
+For detailed usage instructions, refer to the docstring of the Command class.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from img_manager.services.profile_images.upload_queue import \
+    ProfileImageUploadQueue
+
+
+class Command(BaseCommand):
+    """
+    Processes uploaded profile images queued in deferred mode.
+
+    With PROFILE_IMAGE_UPLOAD_DEFERRED = True, uploads are only stored and
+    queued as ProfileImageUploadJob rows. This command creates their master
+    and thumbnail images (in N processes with --workers) and swaps them into
+    the user fields. Without --loop it stops when no job is due.
+
+    Example usage:
+        ```bash
+        $ python manage.py process_profile_image_queue
+        $ python manage.py process_profile_image_queue --workers 4 --loop
+        $ python manage.py process_profile_image_queue --stats
+        ```
+    """
+
+    help = 'Process queued uploads of profile images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Number of processes creating the images")
+        parser.add_argument('--batch-size', type=int,
+                            default=ProfileImageUploadQueue.BATCH_SIZE,
+                            help="Number of jobs claimed at once")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling the queue for new jobs")
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds between polls of an empty queue")
+        parser.add_argument('--stats', action='store_true',
+                            help="Only print the queue depth")
+
+    def handle(self, *args, **options):
+        queue = ProfileImageUploadQueue(options['workers'], options['batch_size'])
+        if options['stats']:
+            self._write_depth(queue)
+            return
+
+        while True:
+            totals = queue.process_all()
+            if totals['processed']:
+                self.stdout.write(
+                    f"Processed: {totals['processed']}, "
+                    f"failed attempts: {totals['failed']}")
+                self._write_depth(queue)
+            if not options['loop']:
+                break
+            time.sleep(options['sleep'])
+
+        if not totals['processed']:
+            self.stdout.write(self.style.SUCCESS("No queued uploads are due."))
+
+    def _write_depth(self, queue):
+        depth = queue.depth()
+        self.stdout.write("Queue depth: " + ", ".join(
+            f"{key}: {value}" for key, value in depth.items()))
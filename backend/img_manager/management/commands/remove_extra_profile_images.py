@@ -1,6 +1,6 @@
 from django.core.management.base import BaseCommand
-from users.models.services.profile_image_integrity_checker import ProfileImageIntegrityChecker
-from users.models.services.extra_profile_image_processor import ExtraProfileImageProcessor
+from img_manager.services.profile_images.integrity_check import ProfileImageIntegrityChecker
+from img_manager.services.profile_images.remove_extra import ExtraProfileImageProcessor
 """
 Tyto soubory implementují požadovanou funkcionalitu a odpovídají modernímu přístupu k programování a pravidlům Google Style Guide. Rozdělení do samostatných souborů zajišťuje přehlednost a modulárnost kódu.
 
@@ -34,6 +34,7 @@ class Command(BaseCommand):
         parser.add_argument('file_names', nargs='*', type=str, help="File names to remove (for 'some' or 'one' option)")
 
     def handle(self, *args, **options):
+        checker = None
         option = options['option']
         file_names = options['file_names']
 
@@ -51,7 +52,8 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS("No extra profile images found."))
             return
 
-        checker = ProfileImageIntegrityChecker()
+        # Reuse the check run above, if any
+        checker = checker or ProfileImageIntegrityChecker()
         unassigned_masters = checker.unassigned_masters
         unassigned_thumbnails = checker.unassigned_thumbnails
 
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileImageManifestCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('checked_at', models.DateTimeField(verbose_name='Checked At')),
+                ('rebuilt_at', models.DateTimeField(verbose_name='Rebuilt At')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProfileImageManifestDirectory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('img_type', models.CharField(choices=[('master', 'Master'), ('thumbnail', 'Thumbnail')], max_length=10, verbose_name='Image Type')),
+                ('path', models.CharField(blank=True, default='', max_length=255, verbose_name='Path')),
+                ('mtime_ns', models.BigIntegerField(verbose_name='Modification Time')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('img_type', 'path'), name='unique_manifest_directory_path')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileImageManifestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('img_type', models.CharField(choices=[('master', 'Master'), ('thumbnail', 'Thumbnail')], max_length=10, verbose_name='Image Type')),
+                ('name', models.CharField(max_length=255, verbose_name='File Name')),
+                ('directory', models.CharField(blank=True, default='', max_length=255, verbose_name='Directory')),
+                ('size', models.BigIntegerField(null=True, verbose_name='Size')),
+                ('mtime_ns', models.BigIntegerField(null=True, verbose_name='Modification Time')),
+                ('user_id', models.BigIntegerField(db_index=True, null=True, verbose_name='User ID')),
+                ('on_disk', models.BooleanField(default=True, verbose_name='On Disk')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['img_type', 'directory'], name='img_manager_img_typ_8df8d2_idx')],
+                'constraints': [models.UniqueConstraint(fields=('img_type', 'name'), name='unique_manifest_entry_name')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_image_names(apps, schema_editor):
+    """Key existing jobs by their image name (the previous key)."""
+    ProfileImageUploadJob = apps.get_model('img_manager', 'ProfileImageUploadJob')
+    ProfileImageUploadJob.objects.update(upload_key=models.F('image_name'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('img_manager', '0002_profileimageuploadjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profileimageuploadjob',
+            name='upload_key',
+            field=models.CharField(default='', max_length=255, verbose_name='Upload Key'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_image_names, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='profileimageuploadjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('user', 'upload_key'), name='unique_unfinished_upload_key'),
+        ),
+    ]
@@ -1,3 +1,257 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+IMAGE_TYPE_CHOICES = [
+    ('master', 'Master'),
+    ('thumbnail', 'Thumbnail'),
+]
+
+
+class ProfileImageManifestEntry(models.Model):
+    """
+    One profile image known to the integrity check manifest.
+
+    A row exists for every file found in a profile image directory and for
+    every image name assigned to a user whose file is missing on disk.
+
+    Attributes:
+        img_type (str): Image type ('master' or 'thumbnail').
+        name (str): File name (an encoded image name, without extension).
+        directory (str): Directory of the file relative to the image type
+            directory ('' for the top level).
+        size (int): File size in bytes, None if the file is missing or the
+            storage listing does not report it.
+        mtime_ns (int): File modification time, None if the file is missing
+            or the storage listing does not report it.
+        user_id (int): ID of the user the image is assigned to, None if the
+            file is not assigned.
+        on_disk (bool): Whether the file exists.
+    """
+    img_type = models.CharField(
+        verbose_name='Image Type',
+        max_length=10,
+        choices=IMAGE_TYPE_CHOICES,
+    )
+
+    name = models.CharField(
+        verbose_name='File Name',
+        max_length=255,
+    )
+
+    directory = models.CharField(
+        verbose_name='Directory',
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+    size = models.BigIntegerField(
+        verbose_name='Size',
+        null=True,
+    )
+
+    mtime_ns = models.BigIntegerField(
+        verbose_name='Modification Time',
+        null=True,
+    )
+
+    user_id = models.BigIntegerField(
+        verbose_name='User ID',
+        null=True,
+        db_index=True,
+    )
+
+    on_disk = models.BooleanField(
+        verbose_name='On Disk',
+        default=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['img_type', 'name'],
+                name='unique_manifest_entry_name',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['img_type', 'directory']),
+        ]
+
+    def __str__(self):
+        return f"{self.img_type}/{self.name}"
+
+
+class ProfileImageManifestDirectory(models.Model):
+    """
+    Modification time of a scanned profile image directory.
+
+    Attributes:
+        img_type (str): Image type ('master' or 'thumbnail').
+        path (str): Directory relative to the image type directory.
+        mtime_ns (int): Modification time seen by the last scan
+            (-1 forces a rescan).
+    """
+    img_type = models.CharField(
+        verbose_name='Image Type',
+        max_length=10,
+        choices=IMAGE_TYPE_CHOICES,
+    )
+
+    path = models.CharField(
+        verbose_name='Path',
+        max_length=255,
+        blank=True,
+        default='',
+    )
+
+    mtime_ns = models.BigIntegerField(
+        verbose_name='Modification Time',
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['img_type', 'path'],
+                name='unique_manifest_directory_path',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.img_type}/{self.path}"
+
+
+class ProfileImageManifestCheckpoint(models.Model):
+    """
+    Time of the last manifest synchronization (a single row).
+
+    Attributes:
+        checked_at (datetime): Start of the last synchronization.
+        rebuilt_at (datetime): Start of the last full rebuild.
+    """
+    checked_at = models.DateTimeField(
+        verbose_name='Checked At',
+    )
+
+    rebuilt_at = models.DateTimeField(
+        verbose_name='Rebuilt At',
+    )
+
+    def __str__(self):
+        return f"{self.checked_at}"
+
+
+class ProfileImageUploadJob(models.Model):
+    """
+    Deferred processing of one uploaded profile image.
+
+    The upload is stored as is and the job is processed by
+    ``process_profile_image_queue`` workers, which create the master and
+    the thumbnail and swap them into the user fields. An unfinished job is
+    unique per user and upload key (a client-supplied key or the hash of the
+    upload), so a repeated submission of the same upload creates the images
+    only once. The new images are stored under the encoded name of the new
+    master, unique for every job.
+
+    Attributes:
+        user (CustomUser): Owner of the uploaded image.
+        upload_key (str): Idempotency key of the upload.
+        image_name (str): Encoded name of the new master.
+        upload (str): Stored upload, relative to the media directory.
+        status (str): 'pending', 'running', 'done' or 'failed'.
+        attempts (int): Number of started processing attempts.
+        available_at (datetime): Earliest time of the next attempt.
+        locked_at (datetime): Start of the running attempt.
+        error (str): Error of the last failed attempt.
+        created_at (datetime): Time of the upload.
+        finished_at (datetime): Time the job was done or failed.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name='User',
+        on_delete=models.CASCADE,
+        related_name='profile_image_jobs',
+    )
+
+    upload_key = models.CharField(
+        verbose_name='Upload Key',
+        max_length=255,
+    )
+
+    image_name = models.CharField(
+        verbose_name='Image Name',
+        max_length=64,
+        unique=True,
+    )
+
+    upload = models.CharField(
+        verbose_name='Upload',
+        max_length=255,
+    )
+
+    status = models.CharField(
+        verbose_name='Status',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Attempts',
+        default=0,
+    )
+
+    available_at = models.DateTimeField(
+        verbose_name='Available At',
+        default=timezone.now,
+    )
+
+    locked_at = models.DateTimeField(
+        verbose_name='Locked At',
+        null=True,
+        blank=True,
+    )
+
+    error = models.TextField(
+        verbose_name='Error',
+        blank=True,
+        default='',
+    )
+
+    created_at = models.DateTimeField(
+        verbose_name='Created At',
+        auto_now_add=True,
+    )
+
+    finished_at = models.DateTimeField(
+        verbose_name='Finished At',
+        null=True,
+        blank=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'upload_key'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='unique_unfinished_upload_key',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.image_name} ({self.status})"
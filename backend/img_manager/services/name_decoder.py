@@ -1,11 +1,11 @@
 from datetime import datetime
-from typing import Dict, Any, Optional
-
-from django.core.exceptions import ObjectDoesNotExist
+from typing import Dict, Any, Iterable, Optional
 
+from backend.shared_utils.database.primary_replica_router import \
+    get_read_database
 from users.models.custom_user import CustomUser
-from ..image_name.config import ImageNameConfig
-from ..image_name.processor import ImageNameProcessor
+from img_manager.core.config.image_name import ImageNameConfig
+from img_manager.core.processors.base64_processor import ImageNameProcessor
 
 class ImageNameDecoder:
     """
@@ -22,8 +22,13 @@ class ImageNameDecoder:
         print(info)
     """
 
+    # User fields shown in the decoded information
+    USER_FIELDS = ('id', 'username', 'email', 'last_login')
+
     @staticmethod
-    def decode(base64_name: str) -> str:
+    def decode(base64_name: str,
+               users: Optional[Dict[int, Dict[str, Any]]] = None,
+               using: Optional[str] = None) -> str:
         """
         Decode the given base64 image name and return all relevant information.
 
@@ -32,21 +37,47 @@ class ImageNameDecoder:
 
         Args:
             base64_name (str): The base64 encoded image name to be processed.
+            users (Optional[Dict[int, Dict[str, Any]]]): Users prefetched by
+                ``fetch_users``; if None, the user is queried.
+            using (Optional[str]): Database alias of the user query
+                (PROFILE_IMAGE_READ_DATABASE if None).
 
         Returns:
             str: A formatted string containing all decoded information or error messages.
         """
-        decoder = ProfileImageInfoDecoder(base64_name)
-        return decoder._get_decoded_info()
+        decoder = ImageNameDecoder(base64_name, using=using)
+        return decoder._get_decoded_info(users)
 
-    def __init__(self, base64_name: str):
+    @staticmethod
+    def fetch_users(user_ids: Iterable[int],
+                    using: Optional[str] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Fetch the users shown in the decoded information with one query.
+
+        Args:
+            user_ids (Iterable[int]): IDs of the users.
+            using (Optional[str]): Database alias to read from
+                (PROFILE_IMAGE_READ_DATABASE if None).
+
+        Returns:
+            Dict[int, Dict[str, Any]]: ``USER_FIELDS`` values keyed by user ID.
+        """
+        users = CustomUser.objects.using(get_read_database(using)).filter(
+            pk__in=set(user_ids)
+        ).values(*ImageNameDecoder.USER_FIELDS)
+        return {user['id']: user for user in users}
+
+    def __init__(self, base64_name: str, using: Optional[str] = None):
         """
         Initialize the ProfileImageInfoDecoder with a base64 encoded image name.
 
         Args:
             base64_name (str): The base64 encoded image name to be processed.
+            using (Optional[str]): Database alias of the user query
+                (PROFILE_IMAGE_READ_DATABASE if None).
         """
         self.base64_name = base64_name
+        self.using = using
         self.data: Optional[Dict[str, Any]] = None
         self.config: Optional[ImageNameConfig] = None
 
@@ -59,7 +90,7 @@ class ImageNameDecoder:
         self.date_max: datetime = datetime.max
 
         try:
-            self.data = ImageNameProcessor(base64_name).data
+            self.data = ImageNameProcessor(base64_name=base64_name).data
             self.config = ImageNameConfig()
 
             # Set configuration attributes
@@ -72,10 +103,21 @@ class ImageNameDecoder:
         except Exception as e:
             self.error = f"Error processing base64 name: {e}"
 
-    def _get_decoded_info(self) -> str:
+    @property
+    def user_id(self) -> Optional[int]:
+        """ID of the user encoded in the name, None if decoding failed."""
+        return self.data.get('user_id') if self.data else None
+
+    def _get_decoded_info(
+            self, users: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> str:
         """
         Retrieve all decoded information about the image and user.
 
+        Args:
+            users (Optional[Dict[int, Dict[str, Any]]]): Users prefetched by
+                ``fetch_users``; if None, the user is queried.
+
         Returns:
             str: A formatted string containing all decoded information or error messages.
         """
@@ -86,7 +128,7 @@ class ImageNameDecoder:
         app = self._get_image_app_info()
         image_type = self._get_image_type_info()
         date = self._format_image_creation_date()
-        user = self._retrieve_user_info()
+        user = self._retrieve_user_info(users)
         return f"{intro}{app}{image_type}{date}{user}{'=' * 50}\n"
 
     def _get_error_message(self) -> str:
@@ -127,22 +169,26 @@ class ImageNameDecoder:
         except (KeyError, TypeError, ValueError) as e:
             return f"{intro}Error retrieving image type: {e}\n"
 
-    def _retrieve_user_info(self) -> str:
+    def _retrieve_user_info(
+            self, users: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> str:
         """Retrieve information about the associated user."""
         intro = "User: "
         try:
             user_id = self.data['user_id']
-            user = CustomUser.objects.get(pk=user_id)
-            last_login_date = user.last_login.strftime(self.date_time_format)
+            if users is None:
+                users = self.fetch_users([user_id], self.using)
+            user = users.get(user_id)
+            if user is None:
+                return f"{intro}User with ID {user_id} does not exist.\n"
+            last_login_date = user['last_login'].strftime(self.date_time_format)
             return (
                 f"{intro}\n"
-                f"- User ID: {user.id}\n"
-                f"- Username: {user.username}\n"
-                f"- User email: {user.email}\n"
+                f"- User ID: {user['id']}\n"
+                f"- Username: {user['username']}\n"
+                f"- User email: {user['email']}\n"
                 f"- Last Login: {last_login_date}\n"
             )
-        except ObjectDoesNotExist:
-            return f"{intro}User with ID {user_id} does not exist.\n"
         except (KeyError, AttributeError, TypeError, ValueError) as e:
             return f"{intro}Error retrieving user info: {e}\n"
 
@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import threading
+import time
+
+from django.db.models import Q
+
+from backend.shared_utils.environment.get_setting import get_setting
+from users.models.custom_user import CustomUser
+from .avatars import AVATAR_FIELDS, avatar_url
+
+# Cached row: (user ID, slug, master path, thumbnail path)
+AvatarRow = Tuple[int, str, str, str]
+
+
+@dataclass(frozen=True)
+class Avatar:
+    """
+    Avatar URLs of one user.
+
+    Attributes:
+        user_id (int): ID of the user.
+        slug (str): Slug of the user.
+        master (Optional[str]): Versioned URL of the master (None if unset).
+        thumbnail (Optional[str]): Versioned URL of the thumbnail
+            (None if unset).
+    """
+    user_id: int
+    slug: str
+    master: Optional[str]
+    thumbnail: Optional[str]
+
+    @classmethod
+    def from_row(cls, row: AvatarRow) -> 'Avatar':
+        user_id, slug, master, thumbnail = row
+        return cls(
+            user_id, slug,
+            master=avatar_url(user_id, 'master', master) if master else None,
+            thumbnail=(avatar_url(user_id, 'thumbnail', thumbnail)
+                       if thumbnail else None),
+        )
+
+    def as_dict(self) -> Dict[str, object]:
+        return {'id': self.user_id, 'slug': self.slug,
+                'master': self.master, 'thumbnail': self.thumbnail}
+
+
+class AvatarLookup:
+    """
+    Batch lookup of avatar URLs for pages listing many users.
+
+    Users missing from the cache are fetched with one ``values_list`` query
+    for the whole batch. Rows are kept in a process-local LRU cache keyed
+    by user ID (slugs are resolved through a secondary map checked against
+    the cached row). ``invalidate`` drops a user after their images changed
+    in this process; entries expire after PROFILE_IMAGE_LOOKUP_CACHE_TTL
+    seconds, which bounds how long other processes may return the previous
+    images.
+
+    Example:
+        avatars = avatar_lookup.lookup(user_ids=[1, 2], slugs=['anna'])
+        avatars[1].thumbnail
+    """
+
+    # Most users looked up in one call (PROFILE_IMAGE_LOOKUP_MAX)
+    MAX_USERS = 100
+    # Number of cached users (PROFILE_IMAGE_LOOKUP_CACHE_SIZE)
+    CACHE_SIZE = 10000
+    # Lifetime of cached users in seconds (PROFILE_IMAGE_LOOKUP_CACHE_TTL)
+    CACHE_TTL = 60
+
+    def __init__(self, cache_size: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.cache_size = cache_size or get_setting(
+            'PROFILE_IMAGE_LOOKUP_CACHE_SIZE', self.CACHE_SIZE)
+        self.ttl = ttl if ttl is not None else get_setting(
+            'PROFILE_IMAGE_LOOKUP_CACHE_TTL', self.CACHE_TTL)
+        self._rows: 'OrderedDict[int, Tuple[AvatarRow, float]]' = OrderedDict()
+        self._slugs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'queries': 0}
+
+    @staticmethod
+    def max_users() -> int:
+        return get_setting('PROFILE_IMAGE_LOOKUP_MAX', AvatarLookup.MAX_USERS)
+
+    def lookup(self, user_ids: Iterable[int] = (),
+               slugs: Iterable[str] = ()) -> Dict[Union[int, str], Avatar]:
+        """
+        Return avatars of users given by IDs and slugs.
+
+        Args:
+            user_ids (Iterable[int]): IDs of the users.
+            slugs (Iterable[str]): Slugs of the users.
+
+        Returns:
+            Dict[int | str, Avatar]: Avatars keyed by the requested ID or
+                slug; unknown users are left out.
+
+        Raises:
+            ValueError: If more than ``max_users()`` users are requested.
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        slugs = list(dict.fromkeys(slugs))
+        if len(user_ids) + len(slugs) > self.max_users():
+            raise ValueError(
+                f"At most {self.max_users()} users can be looked up at once.")
+
+        found: Dict[Union[int, str], AvatarRow] = {}
+        missing_ids: List[int] = []
+        missing_slugs: List[str] = []
+        with self._lock:
+            now = time.monotonic()
+            for user_id in user_ids:
+                row = self._get(user_id, now)
+                if row is None:
+                    missing_ids.append(user_id)
+                else:
+                    found[user_id] = row
+            for slug in slugs:
+                row = self._get(self._slugs.get(slug), now)
+                if row is None or row[1] != slug:
+                    missing_slugs.append(slug)
+                else:
+                    found[slug] = row
+            self.stats['hits'] += len(found)
+            self.stats['misses'] += len(missing_ids) + len(missing_slugs)
+
+        if missing_ids or missing_slugs:
+            rows = self._fetch(missing_ids, missing_slugs)
+            by_id = {row[0]: row for row in rows}
+            by_slug = {row[1]: row for row in rows}
+            found.update((user_id, by_id[user_id]) for user_id in missing_ids
+                         if user_id in by_id)
+            found.update((slug, by_slug[slug]) for slug in missing_slugs
+                         if slug in by_slug)
+            with self._lock:
+                expires = time.monotonic() + self.ttl
+                for row in rows:
+                    self._put(row, expires)
+
+        return {key: Avatar.from_row(row) for key, row in found.items()}
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user from the cache (after their images changed)."""
+        with self._lock:
+            self._drop(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            self._slugs.clear()
+
+    def _fetch(self, user_ids: List[int], slugs: List[str]) -> List[AvatarRow]:
+        """Fetch the rows of the users with one query."""
+        self.stats['queries'] += 1
+        return list(CustomUser.objects.filter(
+            Q(pk__in=user_ids) | Q(slug__in=slugs)
+        ).values_list('id', 'slug', *AVATAR_FIELDS.values()))
+
+    def _get(self, user_id: Optional[int], now: float) -> Optional[AvatarRow]:
+        """Return a cached row and mark it as recently used (lock held)."""
+        entry = self._rows.get(user_id)
+        if entry is None:
+            return None
+        row, expires = entry
+        if expires <= now:
+            self._drop(user_id)
+            return None
+        self._rows.move_to_end(user_id)
+        return row
+
+    def _put(self, row: AvatarRow, expires: float) -> None:
+        """Cache a row, evicting the least recently used ones (lock held)."""
+        self._rows[row[0]] = (row, expires)
+        self._rows.move_to_end(row[0])
+        self._slugs[row[1]] = row[0]
+        while len(self._rows) > self.cache_size:
+            self._drop(next(iter(self._rows)))
+
+    def _drop(self, user_id: int) -> None:
+        """Remove a user and their slug from the cache (lock held)."""
+        entry = self._rows.pop(user_id, None)
+        if entry is not None and self._slugs.get(entry[0][1]) == user_id:
+            del self._slugs[entry[0][1]]
+
+
+# Process-local lookup shared by views and services
+avatar_lookup = AvatarLookup()
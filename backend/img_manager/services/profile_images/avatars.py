@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from django.urls import reverse
+
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.path_handlers.path_handler_protocol import \
+    PathHandlerProtocol
+from img_manager.core.path_handlers.path_handler_thumbnail_pack import \
+    PathHandlerThumbnailPack
+
+# Model field holding the relative path of each image type
+AVATAR_FIELDS = {
+    'master': 'profile_image',
+    'thumbnail': 'profile_image_thumbnail',
+}
+
+
+def get_image_name(relative_path: Union[str, Path]) -> str:
+    """
+    Return the file name of an image path.
+
+    Encoded image names contain the user, the type and the creation time,
+    and shared default images are named by their content hash, so the name
+    identifies the content of the image.
+    """
+    return str(relative_path).rpartition('/')[2]
+
+
+def avatar_etag(relative_path: Union[str, Path]) -> str:
+    """Return the strong ETag of an image (its quoted name)."""
+    return f'"{get_image_name(relative_path)}"'
+
+
+def avatar_url(user_id: int, img_type: str,
+               relative_path: Union[str, Path]) -> str:
+    """
+    Return the versioned URL of an image.
+
+    The URL contains the image name, so its content never changes and it
+    may be cached as immutable; a new image gets a new URL.
+    """
+    return reverse('avatar_versioned', kwargs={
+        'user_id': user_id, 'img_type': img_type,
+        'name': get_image_name(relative_path),
+    })
+
+
+def resolve_avatar(img_type: str, user_id: Optional[int] = None,
+                   slug: Optional[str] = None) -> Optional[Tuple[int, str]]:
+    """
+    Return the user ID and the image path of a user's avatar.
+
+    Args:
+        img_type (str): 'master' or 'thumbnail'.
+        user_id (Optional[int]): ID of the user.
+        slug (Optional[str]): Slug of the user (if ``user_id`` is None).
+
+    Returns:
+        Optional[Tuple[int, str]]: (user ID, path relative to media), None if
+            the user does not exist or has no image of the type.
+    """
+    lookup = {'pk': user_id} if user_id is not None else {'slug': slug}
+    row = CustomUser.objects.filter(**lookup).values_list(
+        'id', AVATAR_FIELDS[img_type]).first()
+    if row is None or not row[1]:
+        return None
+    return row
+
+
+def get_local_file(path_handler: PathHandlerProtocol,
+                   relative_path: Union[str, Path]) -> Optional[Path]:
+    """
+    Return the absolute path of an image stored as a local media file.
+
+    Only such files can be sent by the web server (X-Sendfile,
+    X-Accel-Redirect); images in the object store or in the thumbnail pack
+    return None and are read through the path handler.
+    """
+    if isinstance(path_handler, PathHandlerThumbnailPack):
+        if path_handler.get_pack_name(relative_path) is not None:
+            return None
+        path_handler = path_handler.base
+    # PathHandlerObjectStore subclasses PathHandlerLocal, so the exact type
+    # is compared
+    if type(path_handler) is not PathHandlerLocal:
+        return None
+    return path_handler.get_absolute_media(relative_path)
@@ -1,74 +1,196 @@
-from typing import List, Dict
-from django.db.models import Q
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Tuple
+from django.db import router, transaction
+from django.utils import timezone
+from backend.shared_utils.database.close_connections import \
+    close_connections_before_fork
+from backend.shared_utils.database.init_worker import init_worker
 from users.models.custom_user import CustomUser
-from users.models.services._processor_data._default_data.constants.image_paths import \
-    ImagePaths
-from .img_name_decoder import ImageNameDecoder
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from .manifest import ProfileImageManifest
+from .repair import (
+    DEFAULT,
+    FROM_MASTER,
+    THUMBNAIL,
+    RepairResult,
+    RepairTask,
+    repair_user_images,
+)
 
 
 class MissingProfileImageProcessor:
+    """
+    Repairs profile images of users with a missing master or thumbnail.
+
+    Image files are created by ``repair_user_images`` (in a process pool
+    when ``workers`` > 1) and the users are then updated with
+    ``bulk_update`` in batches of ``BATCH_SIZE``. The users may come from a
+    read replica (see ``ProfileImageIntegrityChecker``); they are re-read
+    and updated on the primary database. Users whose image fields changed
+    since the scan (e.g. a new upload, or a lagging replica) are skipped.
+    """
+
+    # Number of users updated by one bulk_update
+    BATCH_SIZE = 500
+
     def __init__(self, users_missing_images: List[Dict],
-                 unassigned_masters: List[str]):
+                 unassigned_masters: List[str], workers: int = 1):
         self.users_missing_images = users_missing_images
         self.unassigned_masters = unassigned_masters
-        self.paths = ImagePaths()
+        self.workers = workers
+        self.paths = ProfileImagePaths()
+        self.results: List[RepairResult] = []
+        self.skipped: List[RepairResult] = []
+        # Image fields as the scan saw them, compared before the update
+        self.scanned_images: Dict[int, Tuple[str, str]] = {
+            user['id']: (user['profile_image'] or '',
+                         user['profile_image_thumbnail'] or '')
+            for user in users_missing_images
+        }
+        self.newest_masters = self._index_newest_masters(
+            unassigned_masters,
+            {user['id'] for user in users_missing_images}
+        )
+        # Masters are read from the directory the integrity check found them
+        self.master_paths = ProfileImageManifest(self.paths).image_paths(
+            'master', self.newest_masters.values())
+
+    @staticmethod
+    def _index_newest_masters(file_names: List[str],
+                              user_ids: Set[int]) -> Dict[int, str]:
+        """
+        Map user IDs to the name of their newest unassigned master.
+
+        Every file name is decoded exactly once (in one batch) and only
+        users from ``user_ids`` are indexed, so the lookup for all users
+        costs O(users + files). Names that cannot be decoded are skipped.
+        """
+        batch = ImageNameProcessor.decode_many(
+            [name.split('.', 1)[0] for name in file_names]
+        )
+        newest: Dict[int, int] = {}
+        timestamps = batch.timestamp
+        for index, (user_id, is_valid) in enumerate(
+                zip(batch.user_id, batch.valid)):
+            if not is_valid or user_id not in user_ids:
+                continue
+            current = newest.get(user_id)
+            if current is None or timestamps[index] > timestamps[current]:
+                newest[user_id] = index
+        return {user_id: file_names[index]
+                for user_id, index in newest.items()}
 
     def process_users(self) -> str:
         """Process users with missing profile images and return a report."""
-        report = []
-        for user in self.users_missing_images:
-            if not user['profile_image_master'] and user[
-                'profile_image_thumbnail']:
-                report.append(self._process_missing_master(user))
-            elif user['profile_image_master'] and not user[
-                'profile_image_thumbnail']:
-                report.append(self._process_missing_thumbnail(user))
-            else:
-                report.append(self._process_missing_both(user))
+        tasks = [self._create_task(user) for user in self.users_missing_images]
+        self.results = self._run_tasks(tasks)
+        self.skipped = self._apply_results(self.results)
 
+        skipped_ids = {result.user_id for result in self.skipped}
+        report = [
+            f"User {result.username} (ID: {result.user_id}): Skipped, "
+            "images changed since the scan"
+            if result.user_id in skipped_ids else result.report_line()
+            for result in self.results
+        ]
+        failed = sum(1 for result in self.results if not result.ok)
+        repaired = len(self.results) - failed - len(self.skipped)
+        report.append(
+            f"Repaired: {repaired}, failed: {failed}, "
+            f"skipped: {len(self.skipped)}, workers: {self.workers}"
+        )
         return "\n".join(report)
 
-    def _process_missing_master(self, user: Dict) -> str:
-        potential_masters = self._find_potential_masters(user['id'])
-        if potential_masters:
-            newest_master = max(potential_masters,
-                                key=lambda x: ImageNameDecoder(x).data[
-                                    'timestamp'])
-            self._initialize_image(user['id'], newest_master)
-            return f"User {user['username']} (ID: {user['id']}): Master image initialized from {newest_master}"
-        else:
-            self._set_default_images(user['id'])
-            return f"User {user['username']} (ID: {user['id']}): Default images set"
-
-    def _process_missing_thumbnail(self, user: Dict) -> str:
-        self._initialize_image(user['id'], user['profile_image_master'])
-        return f"User {user['username']} (ID: {user['id']}): Thumbnail generated from existing master"
-
-    def _process_missing_both(self, user: Dict) -> str:
-        return self._process_missing_master(user)
-
-    def _find_potential_masters(self, user_id: int) -> List[str]:
-        return [
-            img for img in self.unassigned_masters
-            if ImageNameDecoder(img).data['user_id'] == user_id
-        ]
+    def _create_task(self, user: Dict) -> RepairTask:
+        """Decide how to repair the images of one user."""
+        if user['profile_image'] and not user['profile_image_thumbnail']:
+            return RepairTask(user['id'], user['username'], THUMBNAIL,
+                              master=user['profile_image'])
+
+        newest_master = self._find_newest_master(user['id'])
+        if newest_master:
+            return RepairTask(user['id'], user['username'], FROM_MASTER,
+                              master=self.master_paths[newest_master])
+        return RepairTask(user['id'], user['username'], DEFAULT)
+
+    def _find_newest_master(self, user_id: int) -> Optional[str]:
+        return self.newest_masters.get(user_id)
+
+    def _run_tasks(self, tasks: List[RepairTask]) -> List[RepairResult]:
+        """Create the image files, in worker processes if configured."""
+        if self.workers <= 1 or len(tasks) <= 1:
+            return [repair_user_images(task) for task in tasks]
+
+        # Forked workers must not share the DB connections of this process
+        close_connections_before_fork()
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=init_worker) as executor:
+            return list(executor.map(repair_user_images, tasks,
+                                     chunksize=chunksize))
 
-    def _initialize_image(self, user_id: int, image_name: str) -> None:
-        user = CustomUser.objects.get(id=user_id)
-        user.profile_image_processing(image_name)
+    def _apply_results(self, results: List[RepairResult]
+                       ) -> List[RepairResult]:
+        """
+        Store the new image paths of the repaired users in batches.
 
-    def _set_default_images(self, user_id: int) -> None:
-        user = CustomUser.objects.get(id=user_id)
-        user.set_default_profile_images()
+        Each batch is re-read on the primary with the rows locked; a user
+        whose image fields no longer match the scan is left unchanged.
+
+        Returns:
+            List[RepairResult]: Results of the skipped users.
+        """
+        repaired = [result for result in results if result.ok]
+        fields = ['profile_image', 'profile_image_thumbnail',
+                  'backup_data', 'profile_image_changed']
+        changed_at = timezone.now()
+        primary = router.db_for_write(CustomUser)
+        skipped = []
+
+        for start in range(0, len(repaired), self.BATCH_SIZE):
+            chunk = repaired[start:start + self.BATCH_SIZE]
+            with transaction.atomic(using=primary):
+                skipped.extend(self._update_users(chunk, primary, fields,
+                                                  changed_at))
+        return skipped
+
+    def _update_users(self, chunk: List[RepairResult], using: str,
+                      fields: List[str],
+                      changed_at: datetime) -> List[RepairResult]:
+        """Update one batch of users unchanged since the scan."""
+        users = CustomUser.objects.using(using).select_for_update().only(
+            'id', 'backup_data', 'profile_image', 'profile_image_thumbnail'
+        ).in_bulk([result.user_id for result in chunk])
+        updated, skipped = [], []
+        for result in chunk:
+            user = users.get(result.user_id)
+            if user is None:
+                continue
+            current = (user.profile_image.name or '',
+                       user.profile_image_thumbnail.name or '')
+            if current != self.scanned_images.get(result.user_id):
+                skipped.append(result)
+                continue
+            user.profile_image = result.profile_image
+            user.profile_image_thumbnail = result.profile_image_thumbnail
+            user.backup_data['profile_image'] = result.profile_image
+            user.backup_data['profile_image_thumbnail'] = \
+                result.profile_image_thumbnail
+            user.profile_image_changed = changed_at
+            updated.append(user)
+        CustomUser.objects.using(using).bulk_update(updated, fields)
+        return skipped
 
     @classmethod
     def process_and_report(cls, users_missing_images: List[Dict],
-                           unassigned_masters: List[str]) -> str:
-        processor = cls(users_missing_images, unassigned_masters)
+                           unassigned_masters: List[str],
+                           workers: int = 1) -> str:
+        processor = cls(users_missing_images, unassigned_masters, workers)
         report = processor.process_users()
         return (
             f"Processing report:\n{'-' * 20}\n{report}\n{'-' * 20}\n"
             "To perform a new check, use: python manage.py check_profile_images\n"
             "To remove extra files, use: python manage.py remove_extra_profile_images"
         )
-
@@ -1,21 +1,30 @@
-from typing import List, Dict
-from .img_name_decoder import ImageNameDecoder
+from typing import List, Dict, Optional
+from img_manager.services.name_decoder import ImageNameDecoder
 
 
 class ProfileImageReportGenerator:
     """Generates reports for profile image integrity checks."""
 
+    # Number of file names decoded before their users are fetched at once
+    CHUNK_SIZE = 1000
+
     def __init__(
             self,
-            users: List[Dict],
+            users_count: int,
             users_missing_images: List[Dict],
             unassigned_masters: List[str],
-            unassigned_thumbnails: List[str]
+            unassigned_thumbnails: List[str],
+            locations: Optional[Dict[str, str]] = None,
+            using: Optional[str] = None
     ):
-        self.users = users
+        self.users_count = users_count
         self.users_missing_images = users_missing_images
         self.unassigned_masters = unassigned_masters
         self.unassigned_thumbnails = unassigned_thumbnails
+        # Where the files of an image type were enumerated (e.g. a pack)
+        self.locations = locations or {}
+        # Database alias of the user lookups (see ImageNameDecoder)
+        self.using = using
 
     def generate_report(self) -> str:
         """Generate a full report of the integrity check."""
@@ -33,7 +42,7 @@ class ProfileImageReportGenerator:
             f"\n{'=' * 50}\n"
             f"Výsledek kontroly úložišť pro profilové obrázky\n"
             f"{'-' * 50}\n"
-            f"Celkový počet uživatelů: {len(self.users)}\n"
+            f"Celkový počet uživatelů: {self.users_count}\n"
             f"Počet uživatelů s chybějícím profilovým obrázkem: {len(self.users_missing_images)}\n"
             f"Počet nepřiřazených profilových obrázků master: {len(self.unassigned_masters)}\n"
             f"Počet nepřiřazených profilových obrázků thumbnail: {len(self.unassigned_thumbnails)}\n"
@@ -51,7 +60,7 @@ class ProfileImageReportGenerator:
                 f"Záznam {i}/{len(self.users_missing_images)}:\n"
                 f"- Uživatel ID: {user['id']}\n"
                 f"- Uživatel Username: {user['username']}\n"
-                f"- Profile Img Master: {user['profile_image_master'] or 'Chybí'}\n"
+                f"- Profile Img Master: {user['profile_image'] or 'Chybí'}\n"
                 f"- Profile Img Thumbnail: {user['profile_image_thumbnail'] or 'Chybí'}\n"
                 f"- Last Login Date: {user['last_login']}\n"
                 f"{'-' * 50}"
@@ -59,20 +68,37 @@ class ProfileImageReportGenerator:
         return "\n".join(report)
 
     def _generate_unassigned_files_report(self, image_type: str) -> str:
-        """Generate a report of unassigned files for the specified image type."""
+        """
+        Generate a report of unassigned files for the specified image type.
+
+        The names are decoded in chunks and the users of each chunk are
+        fetched with a single query, instead of one query per file.
+        """
         files = self.unassigned_masters if image_type == 'master' else self.unassigned_thumbnails
         report = [
             f"\n{'=' * 50}",
-            f"Výpis souborů z úložiště {image_type}",
+            f"Výpis souborů z úložiště {image_type}"
+            + (f" ({self.locations[image_type]})"
+               if image_type in self.locations else ""),
             f"{'-' * 50}"
         ]
-        for i, file_name in enumerate(files, 1):
-            report.append(
-                f"Výpis {i}/{len(files)}:\n"
-                f"- Jméno souboru: {file_name}\n"
-                f"{ImageNameDecoder.decode(file_name)}\n"
-                f"{'-' * 50}"
+        for start in range(0, len(files), self.CHUNK_SIZE):
+            chunk = files[start:start + self.CHUNK_SIZE]
+            decoders = [ImageNameDecoder(file_name, self.using)
+                        for file_name in chunk]
+            users = ImageNameDecoder.fetch_users(
+                (decoder.user_id for decoder in decoders
+                 if decoder.user_id is not None),
+                self.using,
             )
+            for i, (file_name, decoder) in enumerate(
+                    zip(chunk, decoders), start + 1):
+                report.append(
+                    f"Výpis {i}/{len(files)}:\n"
+                    f"- Jméno souboru: {file_name}\n"
+                    f"{decoder._get_decoded_info(users)}\n"
+                    f"{'-' * 50}"
+                )
         return "\n".join(report)
 
     def _generate_conclusion_old(self) -> str:
@@ -1,16 +1,14 @@
-import os
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional
 from django.conf import settings
 from django.db.models import Q
 from pathlib import Path
 import json
 
+from backend.shared_utils.database.primary_replica_router import \
+    get_read_database
 from users.models.custom_user import CustomUser
-from users.models.services._processor_data._default_data.constants.image_paths import ImagePaths
-from .img_name_decoder import ImageNameDecoder
 from .generate_report import ProfileImageReportGenerator
-from ..list_files_in_directory import list_files_in_directory
-
+from .manifest import ProfileImageManifest
 
 
 class ProfileImageIntegrityChecker:
@@ -18,11 +16,21 @@ class ProfileImageIntegrityChecker:
     A class for checking the integrity of profile images in the system.
 
     This class performs the following tasks:
-    1. Retrieves all users and their profile image information from the database.
-    2. Scans the profile image directories for existing files.
-    3. Compares database records with actual files to identify discrepancies.
+    1. Synchronizes the persisted manifest of profile images
+       (see ``ProfileImageManifest``) with the file system (or the
+       thumbnail pack index) and the database.
+    2. Reads unassigned and missing files from the manifest.
+    3. Retrieves users with missing profile images from the database.
     4. Generates a detailed report of the findings.
 
+    Only directories and users changed since the last check are processed,
+    unless a full rebuild is requested.
+
+    The scans of users (steps 3 and 4) read from ``using``, by default
+    PROFILE_IMAGE_READ_DATABASE (e.g. a read replica), so they do not load
+    the primary database. The manifest stays on the primary: it is written
+    and its checkpoints must not miss changes not yet replicated.
+
     The class is designed for use by developers for system maintenance and
     troubleshooting purposes.
 
@@ -31,102 +39,74 @@ class ProfileImageIntegrityChecker:
         print(report)
     """
 
+    # Model field holding the relative path of each image type
+    IMAGE_FIELDS = ProfileImageManifest.IMAGE_FIELDS
+
     @staticmethod
-    def check() -> str:
+    def check(full: bool = False, using: Optional[str] = None) -> str:
         """
-        Perform a full integrity check on profile images and generate a report.
+        Perform an integrity check on profile images and generate a report.
+
+        Args:
+            full (bool): Rebuild the manifest instead of updating it.
+            using (Optional[str]): Database alias of the user scans
+                (PROFILE_IMAGE_READ_DATABASE if None).
 
         Returns:
             str: A formatted string containing the full integrity report.
         """
-        checker = ProfileImageIntegrityChecker()
+        checker = ProfileImageIntegrityChecker(full=full, using=using)
         return checker._generate_report()
 
-    def __init__(self):
-        self.users = self._get_users_data()
-        self.paths = ImagePaths()
-        self.users_missing_images = set()
-        self.users_assigned_images  = {'master': set(), 'thumbnail': set()}
-        self.unassigned_files  = {'master': set(), 'thumbnail': set()}
-        self.missing_files  = {'master': set(), 'thumbnail': set()}
-        self._analyze_users_data()
-        self._analyze_paths_data()
-
-
-    def _get_users_data(self) -> List[Dict]:
-        """Retrieve user data from the database."""
-        try:
-            fields = (
-                'id', 'username', 'last_login',
-                'profile_image', 'profile_image_thumbnail'
-            )
-            return list(CustomUser.objects.values(*fields))
-
-        except:
-            pass
-
-    def _get_img_type(self, field_name: str):
-        if field_name not in {'profile_image', 'profile_image_thumbnail'}:
-            raise ValueError(f"Unknown field name: {field_name}")
-        return 'master' if field_name == 'profile_image' else 'thumbnail'
-
-    def _analyze_users_data(self):
-        try:
-            for user in self.users:
-                for field_name in ('profile_image', 'profile_image_thumbnail'):
-                    if not user[field_name]:
-                        self.users_missing_images.add(user)
-                    else:
-                        img_name = user[field_name].split('/')[-1]
-                        img_type = self._get_img_type(field_name)
-                        self.users_assigned_images[img_type].add(image_name)
-        except:
-            pass
-
-    def _analyze_paths_data(self, img_type: str) -> List[str]:
-        """Return a list of unassigned master image files."""
-        try:
-            # Příprava dat
-            files_from_folder = self._get_files_in_directory(img_type)
-            files_from_databases = self.users_assigned_images[img_type]
-            # vytvoření dat
-            self._get_missing_files(files_from_databases, files_from_folder)
-            self._get_unassigned_files(files_from_databases, files_from_folder)
-
-        except:
-            pass
-
-    def _get_files_in_directory(self, img_type: str) -> List[str]:
-        """Get a list of files in the specified directory."""
-        try:
-            absolute_path = self.paths.get_profile_images_abs_path(img_type)
-            return set(list_files_in_directory(absolute_path))
-        except ListFileError as e:
-            self.error = f"Error getting files in directory: {e}"
-
-    def _get_missing_files(self, files_from_databases, files_from_folder):
-        # Porovnání, zda jsou všechny soubory
-        try:
-            missing_files = files_from_databases - files_from_folder
-            if missing_files:
-                self.missing_files[img_type] = missing_files
-        except:
-            pass
-
-    def _get_unassigned_files(self, files_from_databases, files_from_folder):
-        # Path Navrácení seznamu souborů které jsou navíc
-        try:
-            unassigned_files = files_from_folder - files_from_databases
-            if unassigned_files:
-                self.unassigned_files[img_type] = unassigned_files
-        except:
-            pass
+    def __init__(self, full: bool = False, using: Optional[str] = None):
+        self.using = get_read_database(using)
+        self.manifest = ProfileImageManifest()
+        self.manifest.sync(full=full)
+        self.errors: List[str] = self.manifest.errors
+        self.users_count = CustomUser.objects.using(self.using).count()
+        self.users_missing_images = self._get_users_missing_images()
+        self.unassigned_files = {
+            img_type: self.manifest.unassigned_names(img_type)
+            for img_type in self.IMAGE_FIELDS
+        }
+        self.missing_files = {
+            img_type: set(self.manifest.missing_names(img_type))
+            for img_type in self.IMAGE_FIELDS
+        }
+
+    @property
+    def unassigned_masters(self) -> List[str]:
+        """Names of master files not assigned to any user."""
+        return self.unassigned_files['master']
+
+    @property
+    def unassigned_thumbnails(self) -> List[str]:
+        """Names of thumbnail files not assigned to any user."""
+        return self.unassigned_files['thumbnail']
+
+    def _get_users_missing_images(self) -> List[Dict]:
+        """Retrieve users without a master or a thumbnail from the database."""
+        fields = (
+            'id', 'username', 'last_login',
+            'profile_image', 'profile_image_thumbnail'
+        )
+        missing = Q()
+        for field_name in self.IMAGE_FIELDS.values():
+            missing |= Q(**{field_name: ''})
+        return list(
+            CustomUser.objects.using(self.using).filter(missing)
+            .order_by('id').values(*fields)
+        )
 
     def _generate_report(self) -> str:
         """Generate a full report of the integrity check and save results."""
+        locations = {}
+        if self.manifest.pack is not None:
+            locations['thumbnail'] = f"pack: {self.manifest.pack.directory}"
         report_generator = ProfileImageReportGenerator(
-            self.users, self.users_missing_images,
-            self.unassigned_masters, self.unassigned_thumbnails
+            self.users_count, self.users_missing_images,
+            self.unassigned_masters, self.unassigned_thumbnails, locations,
+            using=self.using
         )
 
         # Save results to a temporary file
@@ -151,4 +131,4 @@ class ProfileImageIntegrityChecker:
         if temp_file_path.exists():
             with open(temp_file_path, 'r') as f:
                 return json.load(f)
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,563 @@
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models.custom_user import CustomUser
+from img_manager.models import (
+    ProfileImageManifestCheckpoint,
+    ProfileImageManifestDirectory,
+    ProfileImageManifestEntry,
+)
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.path_handlers.path_handler_protocol import \
+    PathHandlerProtocol
+from img_manager.core.path_handlers.path_handler_thumbnail_pack import \
+    get_thumbnail_pack
+from img_manager.utils.os.pack_store import PackStore
+from .assigned_index import AssignedImageIndex
+
+# Scanned file: (name, size, mtime_ns); size and mtime_ns are None when the
+# storage listing does not report them
+FileInfo = Tuple[str, Optional[int], Optional[int]]
+
+# Directory recorded for thumbnails stored in the pack (see PackStore)
+PACK_DIRECTORY = ':pack'
+
+
+class ProfileImageManifest:
+    """
+    Persisted manifest of profile image files and their assignment to users.
+
+    The manifest keeps a row for every image file (name, directory, size,
+    mtime, owning user) and the modification time of every scanned
+    directory. The first synchronization (or one with ``full=True``)
+    rebuilds it from scratch. Later synchronizations only:
+
+    1. Rescan directories whose mtime changed since the last scan
+       (adding or removing a file always changes the directory mtime).
+       Every directory is listed on its own with the non-recursive
+       ``scan`` of the path handler (streamed, with file sizes and
+       mtimes), so any storage backend works; directories without a local
+       mtime (e.g. in an object store without a local stand-in) are always
+       rescanned.
+    2. Re-query users whose ``profile_image_changed`` or ``date_joined``
+       is newer than the last checkpoint, and release images of deleted
+       users.
+
+    Users referencing the shared default images (see
+    ``ProfileImagePaths.is_shared_default``) own no file and are skipped.
+
+    With PROFILE_IMAGE_THUMBNAIL_PACK the thumbnails are enumerated from
+    the pack index instead of the thumbnail directory. The whole pack is
+    one directory (``PACK_DIRECTORY``) whose mtime is the mtime of the
+    index, so it is rescanned only after a thumbnail was added or deleted.
+
+    The synchronization is not one transaction: every rescanned directory
+    is committed together with its recorded mtime and users are committed
+    in chunks of ``BATCH_SIZE``, so the primary never holds a transaction
+    over millions of rows. An interrupted synchronization keeps the
+    directories already committed; the users are requeried from the old
+    checkpoint, which is written only at the end. A rebuild removes the
+    checkpoint first, so an interrupted rebuild starts over.
+
+    Changes made behind the back of ``ProfileImageProcessor`` (e.g. raw
+    ``QuerySet.update()`` of image fields) are only picked up by a full
+    rebuild.
+
+    Example:
+        manifest = ProfileImageManifest()
+        manifest.sync()
+        orphans = manifest.unassigned_names('master')
+    """
+
+    # Model field holding the relative path of each image type
+    IMAGE_FIELDS = {
+        'master': 'profile_image',
+        'thumbnail': 'profile_image_thumbnail',
+    }
+
+    # Number of rows written or queried at once
+    BATCH_SIZE = 5000
+
+    # Directories modified this close to the scan are rescanned next time,
+    # because a change within the same mtime tick would not be visible.
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self, paths: Optional[ProfileImagePaths] = None,
+                 pack: Optional[PackStore] = None,
+                 path_handler: Optional[PathHandlerProtocol] = None):
+        self.paths = paths or ProfileImagePaths()
+        self.pack = pack if pack is not None else get_thumbnail_pack()
+        self.path_handler = path_handler or get_path_handler()
+        self.errors: List[str] = []
+        self.full = False
+        self.stats = {
+            'scanned_directories': 0,
+            'skipped_directories': 0,
+            'changed_users': 0,
+        }
+
+    def sync(self, full: bool = False) -> None:
+        """
+        Bring the manifest up to date with the file system and the database.
+
+        Args:
+            full (bool): Rebuild the manifest from scratch.
+        """
+        checkpoint = ProfileImageManifestCheckpoint.objects.first()
+        self.full = full or checkpoint is None
+        started_at = timezone.now()
+        started_ns = time.time_ns()
+
+        if self.full:
+            ProfileImageManifestCheckpoint.objects.all().delete()
+            self._rebuild(started_ns)
+            rebuilt_at = started_at
+        else:
+            for img_type in self.IMAGE_FIELDS:
+                self._sync_directories(img_type, started_ns)
+            self._sync_users(checkpoint.checked_at)
+            rebuilt_at = checkpoint.rebuilt_at
+
+        with transaction.atomic():
+            ProfileImageManifestCheckpoint.objects.all().delete()
+            ProfileImageManifestCheckpoint.objects.create(
+                checked_at=started_at, rebuilt_at=rebuilt_at
+            )
+
+    def unassigned_names(self, img_type: str) -> List[str]:
+        """Names of files of the image type not assigned to any user."""
+        return list(ProfileImageManifestEntry.objects.filter(
+            img_type=img_type, on_disk=True, user_id__isnull=True
+        ).order_by('name').values_list('name', flat=True))
+
+    def image_paths(self, img_type: str,
+                    names: Iterable[str]) -> Dict[str, str]:
+        """
+        Return paths (relative to media) of image files by name.
+
+        Files found by the last synchronization are resolved from the
+        directory they were found in, so files not moved yet by
+        ``migrate_profile_image_layout`` are found too. Other names (and
+        thumbnails in the pack) get the path of the configured layout.
+        """
+        names = list(names)
+        root = self.paths.get_profile_images_rel_path(img_type)
+        found = {}
+        for chunk in self._chunks(names):
+            found.update(ProfileImageManifestEntry.objects.filter(
+                img_type=img_type, name__in=chunk, on_disk=True,
+            ).exclude(
+                directory=PACK_DIRECTORY
+            ).values_list('name', 'directory'))
+        return {
+            name: str(root / found[name] / name) if name in found
+            else str(self.paths.get_image_rel_path(img_type, name))
+            for name in names
+        }
+
+    def missing_names(self, img_type: str) -> List[str]:
+        """Names of the image type assigned to a user but missing on disk."""
+        return list(ProfileImageManifestEntry.objects.filter(
+            img_type=img_type, on_disk=False
+        ).order_by('name').values_list('name', flat=True))
+
+    # Full rebuild
+
+    def _rebuild(self, started_ns: int) -> None:
+        """
+        Recreate all manifest rows from a full scan and all users.
+
+        Rows are inserted in committed batches of ``BATCH_SIZE``.
+        """
+        ProfileImageManifestEntry.objects.all().delete()
+        ProfileImageManifestDirectory.objects.all().delete()
+        assigned = self._load_assignments()
+
+        for img_type, index in assigned.items():
+            entries: List[ProfileImageManifestEntry] = []
+            directories: List[ProfileImageManifestDirectory] = []
+
+            for directory, mtime_ns, files in self._walk(img_type):
+                directories.append(ProfileImageManifestDirectory(
+                    img_type=img_type, path=directory,
+                    mtime_ns=self._stored_mtime(mtime_ns, started_ns),
+                ))
+                for name, size, file_mtime_ns in files:
+                    entries.append(ProfileImageManifestEntry(
+                        img_type=img_type, name=name, directory=directory,
+                        size=size, mtime_ns=file_mtime_ns,
+                        user_id=index.pop(name),
+                    ))
+                    if len(entries) >= self.BATCH_SIZE:
+                        self._bulk_create(entries)
+                        entries = []
+
+            self._bulk_create(entries)
+            self._add_missing_entries(img_type, index)
+            ProfileImageManifestDirectory.objects.bulk_create(
+                directories, batch_size=self.BATCH_SIZE
+            )
+
+    def _load_assignments(self) -> Dict[str, AssignedImageIndex]:
+        """
+        Return indexes of assigned image names per image type.
+
+        Users are streamed with ``iterator()`` (a server-side cursor on
+        PostgreSQL) as tuples, so memory grows only by the compact index.
+        """
+        assigned = {
+            img_type: AssignedImageIndex() for img_type in self.IMAGE_FIELDS
+        }
+        indexes = list(assigned.values())
+        fields = ('id',) + tuple(self.IMAGE_FIELDS.values())
+        users = CustomUser.objects.values_list(*fields).iterator(
+            chunk_size=self.BATCH_SIZE
+        )
+        count = 0
+        for user_id, *images in users:
+            count += 1
+            for index, image in zip(indexes, images):
+                name = self._image_name(image)
+                if name:
+                    index.add(name, user_id)
+        for index in indexes:
+            index.freeze()
+        self.stats['changed_users'] = count
+        return assigned
+
+    def _add_missing_entries(self, img_type: str,
+                             index: AssignedImageIndex) -> None:
+        """Create rows for assigned names whose file was not found."""
+        field_name = self.IMAGE_FIELDS[img_type]
+        user_ids = list(index.remaining_user_ids())
+        seen = set()
+        for chunk in self._chunks(user_ids):
+            entries = []
+            users = CustomUser.objects.filter(
+                pk__in=chunk
+            ).values_list('id', field_name)
+            for user_id, image in users:
+                name = self._image_name(image)
+                if name and name not in seen:
+                    seen.add(name)
+                    entries.append(ProfileImageManifestEntry(
+                        img_type=img_type, name=name,
+                        user_id=user_id, on_disk=False,
+                    ))
+            # The user may have got a found name since the index was built
+            ProfileImageManifestEntry.objects.bulk_create(
+                entries, ignore_conflicts=True
+            )
+
+    # Incremental synchronization
+
+    def _sync_directories(self, img_type: str, started_ns: int) -> None:
+        """Rescan the directories of the image type whose mtime changed."""
+        known = dict(ProfileImageManifestDirectory.objects.filter(
+            img_type=img_type
+        ).values_list('path', 'mtime_ns'))
+        if self._is_packed(img_type):
+            seen = self._sync_pack(img_type, known, started_ns)
+        else:
+            seen = self._sync_tree(img_type, known, started_ns)
+
+        for directory in known:
+            if directory in seen:
+                continue
+            with transaction.atomic():
+                self._sync_directory_files(img_type, directory, [])
+                ProfileImageManifestDirectory.objects.filter(
+                    img_type=img_type, path=directory
+                ).delete()
+
+    def _sync_tree(self, img_type: str, known: Dict[str, int],
+                   started_ns: int) -> set:
+        """Rescan changed directories and return the paths found."""
+        children: Dict[str, List[str]] = {}
+        for path in known:
+            if path:
+                children.setdefault(self._parent(path), []).append(path)
+
+        prefix = self._type_prefix(img_type)
+        seen = set()
+        pending = ['']
+        while pending:
+            directory = pending.pop()
+            mtime_ns = self._directory_mtime(prefix, directory)
+            if mtime_ns is not None and known.get(directory) == mtime_ns:
+                seen.add(directory)
+                self.stats['skipped_directories'] += 1
+                pending.extend(children.get(directory, ()))
+                continue
+
+            scanned = self._scan(prefix, directory)
+            if scanned is None:
+                seen.add(directory)
+                continue
+            files, subdirectories = scanned
+            if mtime_ns is None and not files + subdirectories:
+                # The directory does not exist (or is an empty prefix)
+                continue
+            seen.add(directory)
+            self.stats['scanned_directories'] += 1
+            self._commit_directory(img_type, directory, files,
+                                   self._stored_mtime(mtime_ns, started_ns))
+            pending.extend(subdirectories)
+        return seen
+
+    def _sync_pack(self, img_type: str, known: Dict[str, int],
+                   started_ns: int) -> set:
+        """Rescan the pack index if it changed and return its directory."""
+        mtime_ns = self.pack.index_mtime_ns()
+        if known.get(PACK_DIRECTORY) == mtime_ns:
+            self.stats['skipped_directories'] += 1
+        else:
+            _, _, files = self._scan_pack()
+            self._commit_directory(img_type, PACK_DIRECTORY, files,
+                                   self._stored_mtime(mtime_ns, started_ns))
+        return {PACK_DIRECTORY}
+
+    def _commit_directory(self, img_type: str, directory: str,
+                          files: List[FileInfo], mtime_ns: int) -> None:
+        """Apply a scanned directory and record its mtime in one transaction."""
+        with transaction.atomic():
+            self._sync_directory_files(img_type, directory, files)
+            ProfileImageManifestDirectory.objects.update_or_create(
+                img_type=img_type, path=directory,
+                defaults={'mtime_ns': mtime_ns},
+            )
+
+    def _sync_directory_files(self, img_type: str, directory: str,
+                              files: List[FileInfo]) -> None:
+        """Apply the current content of one directory to the manifest."""
+        existing = {
+            entry.name: entry for entry in
+            ProfileImageManifestEntry.objects.filter(
+                img_type=img_type, directory=directory, on_disk=True
+            )
+        }
+        scanned = {name: (size, mtime_ns) for name, size, mtime_ns in files}
+
+        changed = []
+        for name, entry in existing.items():
+            if name in scanned and (entry.size, entry.mtime_ns) != scanned[name]:
+                entry.size, entry.mtime_ns = scanned[name]
+                changed.append(entry)
+        ProfileImageManifestEntry.objects.bulk_update(
+            changed, ['size', 'mtime_ns'], batch_size=self.BATCH_SIZE
+        )
+
+        self._release_names(img_type, [
+            name for name in existing if name not in scanned
+        ])
+        self._add_names(img_type, directory, {
+            name: info for name, info in scanned.items() if name not in existing
+        })
+
+    def _release_names(self, img_type: str, names: List[str]) -> None:
+        """Mark files removed from disk (rows of unassigned ones are deleted)."""
+        for chunk in self._chunks(names):
+            entries = ProfileImageManifestEntry.objects.filter(
+                img_type=img_type, name__in=chunk
+            )
+            entries.filter(user_id__isnull=True).delete()
+            entries.update(on_disk=False, directory='', size=None,
+                           mtime_ns=None)
+
+    def _add_names(self, img_type: str, directory: str,
+                   files: Dict[str, Tuple[int, int]]) -> None:
+        """Record new files, reusing rows of assigned but missing images."""
+        names = list(files)
+        for chunk in self._chunks(names):
+            missing = list(ProfileImageManifestEntry.objects.filter(
+                img_type=img_type, name__in=chunk
+            ))
+            for entry in missing:
+                entry.size, entry.mtime_ns = files.pop(entry.name)
+                entry.directory = directory
+                entry.on_disk = True
+            ProfileImageManifestEntry.objects.bulk_update(
+                missing, ['size', 'mtime_ns', 'directory', 'on_disk']
+            )
+
+        self._bulk_create([
+            ProfileImageManifestEntry(
+                img_type=img_type, name=name, directory=directory,
+                size=size, mtime_ns=mtime_ns,
+            )
+            for name, (size, mtime_ns) in files.items()
+        ])
+
+    def _sync_users(self, since: datetime) -> None:
+        """
+        Update assignments of users changed or deleted since a checkpoint.
+
+        Changed users are streamed with ``iterator()`` and every chunk is
+        committed on its own.
+        """
+        entries = ProfileImageManifestEntry.objects
+        deleted = entries.filter(user_id__isnull=False).exclude(
+            user_id__in=CustomUser.objects.values('pk')
+        )
+        with transaction.atomic():
+            deleted.filter(on_disk=False).delete()
+            deleted.update(user_id=None)
+
+        fields = ('id',) + tuple(self.IMAGE_FIELDS.values())
+        changed = CustomUser.objects.filter(
+            Q(profile_image_changed__gt=since) | Q(date_joined__gt=since)
+        ).values_list(*fields).iterator(chunk_size=self.BATCH_SIZE)
+
+        for chunk in self._chunks(changed):
+            self.stats['changed_users'] += len(chunk)
+            with transaction.atomic():
+                current = {
+                    (entry.user_id, entry.img_type): entry
+                    for entry in entries.filter(
+                        user_id__in=[row[0] for row in chunk])
+                }
+                for user_id, *images in chunk:
+                    for img_type, image in zip(self.IMAGE_FIELDS, images):
+                        name = self._image_name(image)
+                        self._assign(user_id, img_type, name,
+                                     current.get((user_id, img_type)))
+
+    def _assign(self, user_id: int, img_type: str, name: Optional[str],
+                current: Optional[ProfileImageManifestEntry]) -> None:
+        """Assign the image name to the user, releasing the previous one."""
+        if current is not None:
+            if current.name == name:
+                return
+            if current.on_disk:
+                current.user_id = None
+                current.save(update_fields=['user_id'])
+            else:
+                current.delete()
+        if name:
+            ProfileImageManifestEntry.objects.update_or_create(
+                img_type=img_type, name=name,
+                defaults={'user_id': user_id},
+                create_defaults={'user_id': user_id, 'on_disk': False},
+            )
+
+    def _image_name(self, image: str) -> Optional[str]:
+        """Return the file name of a user's image (None if empty or shared)."""
+        if not image or self.paths.is_shared_default(image):
+            return None
+        return image.split('/')[-1]
+
+    # File system helpers
+
+    def _walk(self, img_type: str) -> Iterator[Tuple[str, int, List[FileInfo]]]:
+        """
+        Yield (directory, mtime_ns, files) for every directory of a type.
+
+        Directories are listed one at a time, so only one directory is held
+        in memory; directories holding only subdirectories are yielded too,
+        so later synchronizations can descend into them.
+        """
+        if self._is_packed(img_type):
+            yield self._scan_pack()
+            return
+        prefix = self._type_prefix(img_type)
+        pending = ['']
+        while pending:
+            directory = pending.pop()
+            mtime_ns = self._directory_mtime(prefix, directory)
+            scanned = self._scan(prefix, directory)
+            if scanned is None:
+                continue
+            files, subdirectories = scanned
+            self.stats['scanned_directories'] += 1
+            pending.extend(subdirectories)
+            yield directory, mtime_ns, files
+
+    def _scan(self, prefix: str, directory: str
+              ) -> Optional[Tuple[List[FileInfo], List[str]]]:
+        """
+        Return files and subdirectories of one directory (None on error).
+
+        The directory is listed with the non-recursive ``scan`` of the path
+        handler, which reports the size and mtime of every file.
+        """
+        directory_prefix = f"{prefix}{directory}/" if directory else prefix
+        files: List[FileInfo] = []
+        subdirectories: List[str] = []
+        try:
+            for key, size, mtime_ns in self.path_handler.scan(
+                    directory_prefix):
+                name = key[len(directory_prefix):]
+                if name.endswith('/'):
+                    name = name[:-1]
+                    subdirectories.append(
+                        f"{directory}/{name}" if directory else name)
+                else:
+                    files.append((name, size, mtime_ns))
+        except OSError as e:
+            self.errors.append(
+                f"Error getting files in directory: {directory_prefix}: {e}"
+            )
+            return None
+        return files, subdirectories
+
+    def _directory_mtime(self, prefix: str, directory: str) -> Optional[int]:
+        """
+        Return the mtime of a directory, None if the storage has none.
+
+        The directory is located with ``get_absolute_media`` of the path
+        handler (the media directory or the local stand-in of the object
+        store).
+        """
+        key = f"{prefix}{directory}" if directory else prefix.rstrip('/')
+        try:
+            path = self.path_handler.get_absolute_media(key)
+            return os.stat(path).st_mtime_ns
+        except (OSError, ValueError):
+            return None
+
+    def _type_prefix(self, img_type: str) -> str:
+        """Return the key prefix of the images of a type ('.../master/')."""
+        return f"{self.paths.get_profile_images_rel_path(img_type).as_posix()}/"
+
+    def _is_packed(self, img_type: str) -> bool:
+        """Whether the images of the type are stored in the pack."""
+        return img_type == 'thumbnail' and self.pack is not None
+
+    def _scan_pack(self) -> Tuple[str, int, List[FileInfo]]:
+        """Return the pack directory, the index mtime and the packed files."""
+        mtime_ns = self.pack.index_mtime_ns()
+        files = [(name, entry.length, entry.written_at * 1_000_000_000)
+                 for name, entry in self.pack.entries().items()]
+        self.stats['scanned_directories'] += 1
+        return PACK_DIRECTORY, mtime_ns, files
+
+    def _stored_mtime(self, mtime_ns: Optional[int], started_ns: int) -> int:
+        """Return the mtime to store, -1 if unknown or too close to the scan."""
+        if mtime_ns is None or mtime_ns >= started_ns - self.RACY_WINDOW_NS:
+            return -1
+        return mtime_ns
+
+    @staticmethod
+    def _parent(path: str) -> str:
+        """Return the parent of a relative directory path ('' for top level)."""
+        return path.rpartition('/')[0]
+
+    def _bulk_create(self, entries: List[ProfileImageManifestEntry]) -> None:
+        """Insert manifest entries in batches."""
+        ProfileImageManifestEntry.objects.bulk_create(
+            entries, batch_size=self.BATCH_SIZE
+        )
+
+    def _chunks(self, items: Iterable) -> Iterator[List]:
+        """Split a list or an iterator into chunks of ``BATCH_SIZE``."""
+        items = iter(items)
+        while chunk := list(islice(items, self.BATCH_SIZE)):
+            yield chunk
@@ -0,0 +1,224 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.db import transaction
+
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.path_handlers.path_handler_protocol import \
+    PathHandlerProtocol
+from .manifest import ProfileImageManifest
+
+
+class ProfileImageLayoutMigration:
+    """
+    Moves profile images into the directory layout of the current settings.
+
+    The target directory of every image comes from
+    ``ProfileImagePaths.get_image_rel_path`` (the same layout function used
+    to create, check and remove images). The migration runs in two passes:
+
+    1. Users are read in batches by primary key. Users with misplaced
+       files are re-read with their rows locked (``select_for_update``);
+       users whose images changed in between (e.g. a concurrent upload)
+       are skipped and their files are left for the next run, the files
+       of the others are moved and the new paths are stored with one
+       ``bulk_update`` per batch.
+    2. The remaining files in the image directories (not assigned to any
+       user) are moved.
+
+    All files are listed and moved through the configured path handler
+    (``scan`` and ``move``), so the migration works for every storage
+    backend: local files are renamed, objects are copied and deleted.
+    Files are moved before the paths are updated, so an interrupted
+    migration can simply be run again. Thumbnails in the pack are stored
+    by name only and are not moved.
+
+    Example:
+        migration = ProfileImageLayoutMigration(batch_size=1000)
+        migration.run()
+        print(migration.summary())
+    """
+
+    # Model field holding the relative path of each image type
+    IMAGE_FIELDS = ProfileImageManifest.IMAGE_FIELDS
+
+    # Number of users or files processed at once
+    BATCH_SIZE = 1000
+
+    def __init__(self, batch_size: Optional[int] = None, dry_run: bool = False,
+                 path_handler: Optional[PathHandlerProtocol] = None):
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.dry_run = dry_run
+        self.path_handler = path_handler or get_path_handler()
+        self.paths = self.path_handler.paths
+        self.errors: List[str] = []
+        # Files counted by a dry run (they stay in place)
+        self._planned = set()
+        # Files of users skipped by pass 1 (left for the next run)
+        self._kept = set()
+        self.stats = {
+            'moved_files': 0,
+            'updated_users': 0,
+            'missing_files': 0,
+            'skipped_users': 0,
+        }
+
+    def run(self) -> None:
+        """Move all images and update the paths of their users."""
+        self._migrate_users()
+        for img_type in self.IMAGE_FIELDS:
+            for batch in self._misplaced_files(img_type):
+                for source, target in batch:
+                    self._move(source, target)
+
+    def summary(self) -> str:
+        """Return a one-line summary of the migration."""
+        prefix = "Dry run: " if self.dry_run else ""
+        return (f"{prefix}Moved files: {self.stats['moved_files']}, "
+                f"updated users: {self.stats['updated_users']}, "
+                f"skipped users: {self.stats['skipped_users']}, "
+                f"missing files: {self.stats['missing_files']}, "
+                f"errors: {len(self.errors)}")
+
+    def _migrate_users(self) -> None:
+        fields = list(self.IMAGE_FIELDS.values())
+        last_id = 0
+        while True:
+            users = list(
+                CustomUser.objects.filter(pk__gt=last_id).order_by('pk')
+                .only('id', *fields)[:self.batch_size]
+            )
+            if not users:
+                return
+            last_id = users[-1].pk
+            scanned = {user.pk: self._images(user) for user in users
+                       if self._is_misplaced(user)}
+            if scanned:
+                with transaction.atomic():
+                    self._migrate_batch(scanned, fields)
+
+    def _migrate_batch(self, scanned: Dict[int, Tuple[str, ...]],
+                       fields: List[str]) -> None:
+        """Move the files of locked users unchanged since they were read."""
+        users = CustomUser.objects.select_for_update().only(
+            'id', 'backup_data', *fields).in_bulk(list(scanned))
+        changed = []
+        for user_id, images in scanned.items():
+            user = users.get(user_id)
+            if user is None or self._images(user) != images:
+                self.stats['skipped_users'] += 1
+                if user is not None:
+                    self._kept.update(self._images(user))
+                continue
+            if self._relocate_user(user):
+                changed.append(user)
+        self.stats['updated_users'] += len(changed)
+        if changed and not self.dry_run:
+            CustomUser.objects.bulk_update(
+                changed, fields + ['backup_data'], batch_size=self.batch_size)
+
+    def _images(self, user: CustomUser) -> Tuple[str, ...]:
+        """Return the image paths of a user."""
+        return tuple(getattr(user, field_name).name or ''
+                     for field_name in self.IMAGE_FIELDS.values())
+
+    def _is_misplaced(self, user: CustomUser) -> bool:
+        """Whether an image of the user is outside the layout."""
+        return any(self._target(img_type, image) is not None
+                   for img_type, image in zip(self.IMAGE_FIELDS,
+                                              self._images(user)))
+
+    def _target(self, img_type: str, current: str) -> Optional[str]:
+        """Return the layout path of an image, None if it is in place."""
+        if not current or self.paths.is_shared_default(current):
+            return None
+        target = str(self.paths.get_image_rel_path(
+            img_type, current.split('/')[-1]))
+        return None if current == target else target
+
+    def _relocate_user(self, user: CustomUser) -> bool:
+        """Move the images of one user; return True if a path changed."""
+        changed = False
+        for img_type, field_name in self.IMAGE_FIELDS.items():
+            current = getattr(user, field_name).name
+            target = self._target(img_type, current)
+            if target is None:
+                continue
+            self._move(current, target)
+            setattr(user, field_name, target)
+            for key, value in user.backup_data.items():
+                if value == current:
+                    user.backup_data[key] = target
+            changed = True
+        return changed
+
+    def _misplaced_files(self, img_type: str
+                         ) -> Iterator[List[Tuple[str, str]]]:
+        """Yield batches of (source, target) of files outside the layout."""
+        root = self.paths.get_profile_images_rel_path(img_type)
+        prefix = f"{root.as_posix()}/"
+        batch: List[Tuple[str, str]] = []
+        for key in self._keys(prefix):
+            directory, _, name = key[len(prefix):].rpartition('/')
+            if directory == self.paths.get_shard_dir(name):
+                continue
+            target = self.paths.get_image_rel_path(img_type, name)
+            batch.append((key, str(target)))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _keys(self, prefix: str) -> Iterator[str]:
+        """
+        Yield the keys of all files under a prefix.
+
+        Directories are listed one at a time with the non-recursive
+        ``scan`` of the path handler, so no listing of the whole image type
+        is held in memory.
+        """
+        pending = [prefix]
+        while pending:
+            for key, _, _ in self.path_handler.scan(pending.pop()):
+                if key.endswith('/'):
+                    pending.append(key)
+                else:
+                    yield key
+
+    def _move(self, source: str, target: str) -> None:
+        """Move one file (paths relative to media) through the handler."""
+        if source in self._planned or source in self._kept:
+            return
+        handler = self._storage_of(source)
+        if handler is None:
+            return
+        if not handler.exists(source):
+            if not handler.exists(target):
+                self.stats['missing_files'] += 1
+            return
+        self.stats['moved_files'] += 1
+        if self.dry_run:
+            self._planned.add(source)
+            return
+        try:
+            handler.move(source, target)
+        except OSError as e:
+            self.stats['moved_files'] -= 1
+            self.errors.append(f"Error moving {source} to {target}: {e}")
+
+    def _storage_of(self, source: str) -> Optional[PathHandlerProtocol]:
+        """
+        Return the handler storing a file, None for a packed thumbnail.
+
+        The pack stores thumbnails by name, so their path does not matter;
+        thumbnail files not imported into the pack yet are moved in the
+        wrapped handler.
+        """
+        get_pack_name = getattr(self.path_handler, 'get_pack_name', None)
+        if get_pack_name is None:
+            return self.path_handler
+        name = get_pack_name(source)
+        if name is not None and self.path_handler.pack.exists(name):
+            return None
+        return self.path_handler.base
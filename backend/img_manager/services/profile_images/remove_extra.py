@@ -1,8 +1,7 @@
 import os
 from typing import List, Tuple
-from django.conf import settings
-from users.models.services._processor_data._default_data.constants.image_paths import \
-    ImagePaths
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from .manifest import ProfileImageManifest
 
 
 class ExtraProfileImageProcessor:
@@ -10,7 +9,9 @@ class ExtraProfileImageProcessor:
                  unassigned_thumbnails: List[str]):
         self.unassigned_masters = unassigned_masters
         self.unassigned_thumbnails = unassigned_thumbnails
-        self.paths = ImagePaths()
+        self.path_handler = get_path_handler()
+        self.paths = self.path_handler.paths
+        self.manifest = ProfileImageManifest(self.paths)
 
     def remove_files(self, option: str, file_names: List[str] = None) -> str:
         """Remove extra files based on the given option."""
@@ -43,20 +44,36 @@ class ExtraProfileImageProcessor:
                                      files: List[str]) -> str:
         removed = []
         not_found = []
-        base_path = os.path.join(settings.MEDIA_ROOT,
-                                 self.paths.PATH_FROM_MEDIA, directory)
+        protected = [file for file in files
+                     if self._is_protected(directory, file)]
+        # Files are removed from the directory the integrity check found them
+        relative_paths = self.manifest.image_paths(
+            directory, [file for file in files if file not in protected])
 
-        for file in files:
-            file_path = os.path.join(base_path, file)
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        for file, relative_path in relative_paths.items():
+            if self.path_handler.delete(relative_path):
                 removed.append(file)
             else:
                 not_found.append(file)
 
-        return (f"{directory.capitalize()} directory:\n"
-                f"Removed: {', '.join(removed) if removed else 'None'}\n"
-                f"Not found: {', '.join(not_found) if not_found else 'None'}")
+        report = (f"{directory.capitalize()} directory:\n"
+                  f"Removed: {', '.join(removed) if removed else 'None'}\n"
+                  f"Not found: {', '.join(not_found) if not_found else 'None'}")
+        if protected:
+            report += f"\nProtected (shared default): {', '.join(protected)}"
+        return report
+
+    def _is_protected(self, directory: str, file: str) -> bool:
+        """
+        Return True for names that must never be removed.
+
+        Only plain file names inside the image type directory are removed;
+        anything else could reach the shared default images.
+        """
+        if not file or os.path.basename(file) != file or file in ('.', '..'):
+            return True
+        relative_path = self.paths.get_image_rel_path(directory, file)
+        return self.paths.is_shared_default(relative_path)
 
     def _separate_files(self, file_names: List[str]) -> Tuple[
         List[str], List[str]]:
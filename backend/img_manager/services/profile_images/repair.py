@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from typing import Optional
+import io
+
+from PIL import Image
+
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.core.config.profile_images.constants import ProfileImageConfig
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.path_handlers.path_handler_protocol import \
+    PathHandlerProtocol
+from img_manager.utils.pil.resize_image import resize_image
+from img_manager.utils.pil.save_image import encode_image
+from img_manager.utils.pil.square_crop_center import square_crop_center
+
+# Repair actions
+FROM_MASTER = 'master'
+THUMBNAIL = 'thumbnail'
+DEFAULT = 'default'
+
+IMG_OUTPUT_FORMAT = 'JPEG'
+IMG_OUTPUT_DPI = (72, 72)
+
+
+@dataclass(frozen=True)
+class RepairTask:
+    """
+    Repair of the profile images of one user.
+
+    Attributes:
+        user_id (int): ID of the user.
+        username (str): Username (for the report).
+        action (str): FROM_MASTER (assign ``master`` and regenerate the
+            thumbnail), THUMBNAIL (regenerate the thumbnail from ``master``)
+            or DEFAULT (assign or copy the default images).
+        master (Optional[str]): Master path relative to the media directory.
+    """
+    user_id: int
+    username: str
+    action: str
+    master: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RepairResult:
+    """
+    Outcome of one ``RepairTask``.
+
+    Attributes:
+        user_id (int): ID of the user.
+        username (str): Username (for the report).
+        action (str): Action of the task.
+        profile_image (Optional[str]): New master path, None on error.
+        profile_image_thumbnail (Optional[str]): New thumbnail path,
+            None on error.
+        error (Optional[str]): Error message if the repair failed.
+    """
+    user_id: int
+    username: str
+    action: str
+    profile_image: Optional[str] = None
+    profile_image_thumbnail: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def report_line(self) -> str:
+        """Return the line describing this result in the processing report."""
+        prefix = f"User {self.username} (ID: {self.user_id})"
+        if not self.ok:
+            return f"{prefix}: Repair failed: {self.error}"
+        if self.action == FROM_MASTER:
+            return f"{prefix}: Master image initialized from {self.profile_image}"
+        if self.action == THUMBNAIL:
+            return f"{prefix}: Thumbnail generated from existing master"
+        return f"{prefix}: Default images set"
+
+
+def repair_user_images(task: RepairTask) -> RepairResult:
+    """
+    Create the missing image files of one user.
+
+    Only files are written; the user row is updated by the caller from the
+    returned result, so the function can run in a worker process.
+
+    Args:
+        task (RepairTask): What to repair.
+
+    Returns:
+        RepairResult: New image paths, or the error.
+    """
+    path_handler = get_path_handler()
+    try:
+        if task.action == DEFAULT:
+            master = _default(path_handler, 'master', task.user_id)
+            thumbnail = _default(path_handler, 'thumbnail', task.user_id)
+        else:
+            master = task.master
+            thumbnail = _create_thumbnail(path_handler, master, task.user_id)
+    except Exception as e:
+        return RepairResult(task.user_id, task.username, task.action,
+                            error=str(e))
+    return RepairResult(task.user_id, task.username, task.action,
+                        profile_image=master,
+                        profile_image_thumbnail=thumbnail)
+
+
+def _create_thumbnail(path_handler: PathHandlerProtocol, master: str,
+                      user_id: int) -> str:
+    """Save a thumbnail generated from the master and return its path."""
+    size = ProfileImageConfig().SIZE['thumbnail']
+    relative_path = path_handler.create_new_relative('thumbnail', user_id)
+    with Image.open(io.BytesIO(path_handler.get(master))) as img:
+        thumbnail = resize_image(square_crop_center(img.convert('RGB')), size)
+    path_handler.put(relative_path, encode_image(
+        thumbnail, IMG_OUTPUT_FORMAT, dpi=IMG_OUTPUT_DPI))
+    return str(relative_path)
+
+
+def _default(path_handler: PathHandlerProtocol, img_type: str,
+             user_id: int) -> str:
+    """Return the shared default image, or a copy with shared defaults off."""
+    if get_setting('PROFILE_IMAGE_SHARED_DEFAULTS', True):
+        return str(path_handler.get_shared_default(img_type))
+    return _copy_default(path_handler, img_type, user_id)
+
+
+def _copy_default(path_handler: PathHandlerProtocol, img_type: str,
+                  user_id: int) -> str:
+    """Copy the default image of the type and return the new path."""
+    relative_path = path_handler.create_new_relative(img_type, user_id)
+    path_handler.put(relative_path,
+                     path_handler.get_absolute_default(img_type).read_bytes())
+    return str(relative_path)
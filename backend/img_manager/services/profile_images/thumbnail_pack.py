@@ -0,0 +1,114 @@
+from typing import List, Optional, Set
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+
+from backend.shared_utils.environment.get_setting import get_setting
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.path_handlers.path_handler_thumbnail_pack import (
+    PathHandlerThumbnailPack,
+    get_thumbnail_pack,
+)
+from img_manager.utils.os.pack_store import PackEntry, PackStore
+
+
+class ThumbnailPackMaintenance:
+    """
+    Maintenance of the thumbnail pack (PROFILE_IMAGE_THUMBNAIL_PACK).
+
+    ``import_files`` moves thumbnails stored as files before the pack was
+    enabled into the pack. ``compact`` rewrites the pack with only the
+    thumbnails referenced by ``CustomUser.profile_image_thumbnail``; entries
+    younger than PROFILE_IMAGE_THUMBNAIL_PACK_GRACE seconds are kept too,
+    because a queued upload writes its thumbnail before the user row is
+    updated.
+
+    Example:
+        maintenance = ThumbnailPackMaintenance()
+        maintenance.import_files()
+        maintenance.compact()
+        print(maintenance.summary())
+    """
+
+    # Number of users or files processed at once
+    BATCH_SIZE = 5000
+
+    def __init__(self, pack: Optional[PackStore] = None,
+                 grace: Optional[int] = None, dry_run: bool = False,
+                 batch_size: Optional[int] = None):
+        self.pack = pack if pack is not None else get_thumbnail_pack()
+        if self.pack is None:
+            raise ImproperlyConfigured(
+                "The thumbnail pack is disabled (PROFILE_IMAGE_THUMBNAIL_PACK).")
+        self.grace = grace if grace is not None else get_setting(
+            'PROFILE_IMAGE_THUMBNAIL_PACK_GRACE', 3600)
+        self.dry_run = dry_run
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.handler = PathHandlerThumbnailPack(self._base_handler(), self.pack)
+        self.errors: List[str] = []
+        self.stats = {
+            'imported_files': 0,
+            'kept': 0,
+            'dropped': 0,
+            'bytes_before': 0,
+            'bytes_after': 0,
+        }
+
+    def import_files(self) -> None:
+        """Move thumbnail files of the storage backend into the pack."""
+        base = self.handler.base
+        keys = base.list_prefix(self.handler.thumbnail_prefix)
+        for start in range(0, len(keys), self.batch_size):
+            batch = {}
+            for key in keys[start:start + self.batch_size]:
+                try:
+                    batch[key] = base.get(key)
+                except OSError as e:
+                    self.errors.append(f"Error reading {key}: {e}")
+            if not self.dry_run:
+                self.pack.put_many({self.handler.get_pack_name(key): data
+                                    for key, data in batch.items()})
+                for key in batch:
+                    base.delete(key)
+            self.stats['imported_files'] += len(batch)
+
+    def compact(self) -> None:
+        """Drop pack entries not referenced by any user."""
+        referenced = self._referenced_names()
+        oldest_kept = int(time.time()) - self.grace
+
+        def keep(name: str, entry: PackEntry) -> bool:
+            return name in referenced or entry.written_at >= oldest_kept
+
+        self.stats.update(self.pack.compact(keep, dry_run=self.dry_run))
+
+    def summary(self) -> str:
+        """Return a one-line summary of the maintenance."""
+        prefix = "Dry run: " if self.dry_run else ""
+        return (f"{prefix}Imported files: {self.stats['imported_files']}, "
+                f"kept: {self.stats['kept']}, "
+                f"dropped: {self.stats['dropped']}, "
+                f"pack size: {self.stats['bytes_before']} -> "
+                f"{self.stats['bytes_after']} B, "
+                f"errors: {len(self.errors)}")
+
+    def _referenced_names(self) -> Set[str]:
+        """Return names of the packed thumbnails assigned to users."""
+        images = CustomUser.objects.values_list(
+            'profile_image_thumbnail', flat=True
+        ).iterator(chunk_size=self.batch_size)
+        names = set()
+        for image in images:
+            name = self.handler.get_pack_name(image) if image else None
+            if name:
+                names.add(name)
+        return names
+
+    @staticmethod
+    def _base_handler():
+        """Return the handler of the storage backend behind the pack."""
+        handler = get_path_handler()
+        if isinstance(handler, PathHandlerThumbnailPack):
+            return handler.base
+        return handler
@@ -0,0 +1,388 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import time
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from backend.shared_utils.database.close_connections import \
+    close_connections_before_fork
+from backend.shared_utils.database.init_worker import init_worker
+from backend.shared_utils.environment.get_setting import get_setting
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.core.processors.new_image_processor import NewImageProcessor
+from img_manager.models import ProfileImageUploadJob
+from .avatar_lookup import avatar_lookup
+
+# Directory of stored uploads (relative to the profile images directory)
+UPLOADS_DIR = 'uploads'
+
+
+@dataclass(frozen=True)
+class UploadTask:
+    """
+    Creation of the images of one queued upload.
+
+    Attributes:
+        job_id (int): ID of the ``ProfileImageUploadJob``.
+        upload (str): Stored upload, relative to the media directory.
+        master (str): Path of the new master, relative to the media directory.
+        thumbnail (str): Path of the new thumbnail, relative to the media
+            directory.
+    """
+    job_id: int
+    upload: str
+    master: str
+    thumbnail: str
+
+
+@dataclass(frozen=True)
+class UploadResult:
+    """
+    Outcome of one ``UploadTask``.
+
+    Attributes:
+        job_id (int): ID of the ``ProfileImageUploadJob``.
+        error (Optional[str]): Error message if the images were not created.
+        retry (bool): Whether a failed task may succeed when repeated
+            (False for invalid uploads).
+    """
+    job_id: int
+    error: Optional[str] = None
+    retry: bool = True
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def create_upload_images(task: UploadTask) -> UploadResult:
+    """
+    Create the master and the thumbnail of one queued upload.
+
+    Only images are written (through the configured path handler), always
+    to the paths derived from the job's image name, so a repeated task
+    overwrites its own output. The user row is updated by the caller, so the
+    function can run in a worker process.
+
+    Args:
+        task (UploadTask): What to create.
+
+    Returns:
+        UploadResult: The outcome of the task.
+    """
+    path_handler = get_path_handler()
+    try:
+        images = NewImageProcessor.create_profile_images(
+            path_handler.get(task.upload))
+        path_handler.put_many({task.master: images['master'],
+                               task.thumbnail: images['thumbnail']})
+    except ValidationError as e:
+        return UploadResult(task.job_id, error=" ".join(e.messages),
+                            retry=False)
+    except Exception as e:
+        return UploadResult(task.job_id, error=str(e))
+    return UploadResult(task.job_id)
+
+
+class ProfileImageUploadQueue:
+    """
+    Queue of uploaded profile images processed outside of the request.
+
+    The queue is the ``ProfileImageUploadJob`` table, so no message broker
+    is needed. ``enqueue`` only stores the upload; ``process_batch`` claims
+    due jobs, creates their images (in a process pool when ``workers`` > 1)
+    and swaps the new images into the user fields in one transaction per
+    job. Until then the user keeps the previous images.
+
+    Failed jobs are retried with exponential backoff up to
+    PROFILE_IMAGE_QUEUE_MAX_ATTEMPTS times; jobs left running by a crashed
+    worker are claimed again after PROFILE_IMAGE_QUEUE_LOCK_TIMEOUT seconds,
+    or marked as failed when they have no attempt left.
+    """
+
+    # Number of jobs claimed at once
+    BATCH_SIZE = 50
+
+    # Number of following seconds tried for the name of the new master when
+    # other uploads of the user took the name of the current second
+    NAME_ATTEMPTS = 10
+
+    # Error of jobs whose last attempt was left running by a crashed worker
+    ABANDONED_ERROR = "The worker processing the last attempt did not finish."
+
+    def __init__(self, workers: int = 1, batch_size: Optional[int] = None):
+        self.workers = workers
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.path_handler = get_path_handler()
+        self.max_attempts = get_setting('PROFILE_IMAGE_QUEUE_MAX_ATTEMPTS', 3)
+        self.retry_delay = get_setting('PROFILE_IMAGE_QUEUE_RETRY_DELAY', 30)
+        self.lock_timeout = get_setting('PROFILE_IMAGE_QUEUE_LOCK_TIMEOUT', 600)
+
+    def enqueue(self, user: CustomUser, upload: File,
+                key: Optional[str] = None) -> ProfileImageUploadJob:
+        """
+        Store an uploaded image and add a job processing it.
+
+        An unfinished job of the user with the same key (the client-supplied
+        key, the SHA-256 of the upload otherwise) is returned instead of
+        adding another one, so a repeated submission is processed once.
+
+        Every upload is stored under its own random name first, so a
+        concurrent submission never overwrites it. The new master gets the
+        encoded name of the current second, or of one of the following
+        seconds if other uploads of the user took it.
+
+        Args:
+            user (CustomUser): Owner of the image (must be saved).
+            upload (File): The uploaded image.
+            key (Optional[str]): Idempotency key supplied by the client.
+
+        Returns:
+            ProfileImageUploadJob: The new or the already queued job.
+
+        Raises:
+            IntegrityError: If no name for the new master is free.
+        """
+        data = b''.join(upload.chunks())
+        key = key or hashlib.sha256(data).hexdigest()
+        unfinished = {
+            'user': user, 'upload_key': key,
+            'status__in': [ProfileImageUploadJob.PENDING,
+                           ProfileImageUploadJob.RUNNING],
+        }
+        job = ProfileImageUploadJob.objects.filter(**unfinished).first()
+        if job is not None:
+            return job
+
+        upload_path = str(self.path_handler.paths.PATH_FROM_MEDIA
+                          / UPLOADS_DIR / uuid.uuid4().hex)
+        self.path_handler.put(upload_path, data)
+        now = int(time.time())
+        for offset in range(self.NAME_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    job, created = ProfileImageUploadJob.objects.get_or_create(
+                        **unfinished,
+                        defaults={
+                            'image_name': self._master_name(user.id,
+                                                            now + offset),
+                            'upload': upload_path,
+                        },
+                    )
+            except IntegrityError:
+                # The name is used by another upload of the user
+                if offset == self.NAME_ATTEMPTS - 1:
+                    self.path_handler.delete(upload_path)
+                    raise
+                continue
+            if not created:
+                # A concurrent submission of the same upload won
+                self.path_handler.delete(upload_path)
+            return job
+
+    def process_batch(self) -> List[UploadResult]:
+        """
+        Claim due jobs and process them.
+
+        Returns:
+            List[UploadResult]: Outcomes of the processed jobs (empty when
+                no job is due).
+        """
+        jobs = self._claim()
+        if not jobs:
+            return []
+        results = self._run_tasks([self._create_task(job) for job in jobs])
+        jobs_by_id = {job.id: job for job in jobs}
+        for result in results:
+            self._apply_result(jobs_by_id[result.job_id], result)
+        return results
+
+    def process_all(self) -> Dict[str, int]:
+        """
+        Process batches until no job is due.
+
+        Returns:
+            Dict[str, int]: Number of processed and failed attempts.
+        """
+        processed = failed = 0
+        while True:
+            results = self.process_batch()
+            if not results:
+                return {'processed': processed, 'failed': failed}
+            processed += len(results)
+            failed += sum(1 for result in results if not result.ok)
+
+    @staticmethod
+    def depth() -> Dict[str, object]:
+        """
+        Return queue depth metrics.
+
+        Returns:
+            Dict[str, object]: Number of jobs per status and the age of the
+                oldest pending job in seconds (None if there is none).
+        """
+        counts = dict.fromkeys(
+            (status for status, _ in ProfileImageUploadJob.STATUS_CHOICES), 0)
+        for row in ProfileImageUploadJob.objects.values('status').annotate(
+                count=Count('id')):
+            counts[row['status']] = row['count']
+        oldest = ProfileImageUploadJob.objects.filter(
+            status=ProfileImageUploadJob.PENDING
+        ).aggregate(oldest=Min('created_at'))['oldest']
+        counts['oldest_pending_age'] = (
+            None if oldest is None
+            else round((timezone.now() - oldest).total_seconds(), 1)
+        )
+        return counts
+
+    def _claim(self) -> List[ProfileImageUploadJob]:
+        """Mark a batch of due jobs as running and return them."""
+        now = timezone.now()
+        abandoned = Q(
+            status=ProfileImageUploadJob.RUNNING,
+            locked_at__lt=now - timedelta(seconds=self.lock_timeout),
+        )
+        due = Q(status=ProfileImageUploadJob.PENDING, available_at__lte=now) | (
+            abandoned & Q(attempts__lt=self.max_attempts)
+        )
+        with transaction.atomic():
+            self._fail_abandoned(abandoned & Q(attempts__gte=self.max_attempts))
+            ids = list(
+                ProfileImageUploadJob.objects.select_for_update(skip_locked=True)
+                .filter(due).order_by('available_at')
+                .values_list('id', flat=True)[:self.batch_size]
+            )
+            # Conditional update, so concurrent workers never claim a job twice
+            ProfileImageUploadJob.objects.filter(due, id__in=ids).update(
+                status=ProfileImageUploadJob.RUNNING, locked_at=now,
+                attempts=F('attempts') + 1,
+            )
+        return list(ProfileImageUploadJob.objects.filter(
+            id__in=ids, status=ProfileImageUploadJob.RUNNING, locked_at=now))
+
+    def _fail_abandoned(self, abandoned: Q) -> None:
+        """Fail abandoned jobs with no attempt left (in a transaction)."""
+        jobs = dict(
+            ProfileImageUploadJob.objects.select_for_update(skip_locked=True)
+            .filter(abandoned).values_list('id', 'upload')
+        )
+        if not jobs:
+            return
+        ProfileImageUploadJob.objects.filter(abandoned, id__in=jobs).update(
+            status=ProfileImageUploadJob.FAILED, error=self.ABANDONED_ERROR,
+            finished_at=timezone.now(),
+        )
+        uploads = list(jobs.values())
+        transaction.on_commit(lambda: self._delete_files(uploads))
+
+    def _create_task(self, job: ProfileImageUploadJob) -> UploadTask:
+        """Derive the paths of the new images from the job's image name."""
+        return UploadTask(
+            job.id, job.upload,
+            master=str(self._image_path('master', job.image_name)),
+            thumbnail=str(self._image_path(
+                'thumbnail', self._thumbnail_name(job.image_name))),
+        )
+
+    def _image_path(self, img_type: str, image_name: str) -> Path:
+        return self.path_handler.paths.get_image_rel_path(img_type, image_name)
+
+    def _master_name(self, user_id: int, timestamp: int) -> str:
+        """Return the name of a new master of the user from the timestamp."""
+        config = self.path_handler.config
+        return ImageNameProcessor.encode_many([{
+            'app_id': config.APP_ID, 'type_id': config.TYPE_ID['master'],
+            'user_id': user_id, 'timestamp': timestamp,
+        }]).names[0]
+
+    def _thumbnail_name(self, master_name: str) -> str:
+        """Return the thumbnail name with the same user and timestamp."""
+        data = dict(ImageNameProcessor(base64_name=master_name).data)
+        data['type_id'] = self.path_handler.config.TYPE_ID['thumbnail']
+        return ImageNameProcessor.encode_many([data]).names[0]
+
+    def _run_tasks(self, tasks: List[UploadTask]) -> List[UploadResult]:
+        """Create the image files, in worker processes if configured."""
+        if self.workers <= 1 or len(tasks) <= 1:
+            return [create_upload_images(task) for task in tasks]
+
+        # Forked workers must not share the DB connections of this process
+        close_connections_before_fork()
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=init_worker) as executor:
+            return list(executor.map(create_upload_images, tasks))
+
+    def _apply_result(self, job: ProfileImageUploadJob,
+                      result: UploadResult) -> None:
+        if result.ok:
+            self._swap_images(job)
+        elif result.retry and job.attempts < self.max_attempts:
+            delay = self.retry_delay * 2 ** (job.attempts - 1)
+            ProfileImageUploadJob.objects.filter(id=job.id).update(
+                status=ProfileImageUploadJob.PENDING, error=result.error,
+                available_at=timezone.now() + timedelta(seconds=delay),
+            )
+        else:
+            ProfileImageUploadJob.objects.filter(id=job.id).update(
+                status=ProfileImageUploadJob.FAILED, error=result.error,
+                finished_at=timezone.now(),
+            )
+            self._delete_files([job.upload])
+
+    def _swap_images(self, job: ProfileImageUploadJob) -> None:
+        """
+        Assign the new images to the user and finish the job atomically.
+
+        A job finishing after a newer upload of the same user was already
+        swapped in does not overwrite it; its images are deleted instead.
+        Replaced images (except shared defaults) and the upload are deleted
+        after the commit.
+        """
+        task = self._create_task(job)
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(pk=job.user_id)
+            superseded = ProfileImageUploadJob.objects.filter(
+                user_id=job.user_id, status=ProfileImageUploadJob.DONE,
+                id__gt=job.id,
+            ).exists()
+            current = [user.profile_image.name, user.profile_image_thumbnail.name]
+            if superseded:
+                obsolete = [task.master, task.thumbnail]
+            elif current == [task.master, task.thumbnail]:
+                obsolete = []
+            else:
+                paths = self.path_handler.paths
+                obsolete = [name for name in current
+                            if name.startswith(str(paths.PATH_FROM_MEDIA))
+                            and not paths.is_shared_default(name)]
+                user.profile_image = task.master
+                user.profile_image_thumbnail = task.thumbnail
+                user.backup_data['profile_image'] = task.master
+                user.backup_data['profile_image_thumbnail'] = task.thumbnail
+                user.profile_image_changed = timezone.now()
+                user.save(update_fields=[
+                    'profile_image', 'profile_image_thumbnail',
+                    'backup_data', 'profile_image_changed',
+                ])
+            ProfileImageUploadJob.objects.filter(id=job.id).update(
+                status=ProfileImageUploadJob.DONE, error='',
+                finished_at=timezone.now(),
+            )
+            transaction.on_commit(
+                lambda: self._delete_files([job.upload] + obsolete))
+            transaction.on_commit(lambda: avatar_lookup.invalidate(job.user_id))
+
+    def _delete_files(self, relative_paths: List[str]) -> None:
+        for relative_path in relative_paths:
+            self.path_handler.delete(relative_path)
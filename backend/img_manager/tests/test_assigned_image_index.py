@@ -0,0 +1,49 @@
+"""
+This file contains tests for the compact index of assigned image names.
+
+The TestAssignedImageIndex class inherits from `unittest.TestCase`
+and implements individual tests for `AssignedImageIndex`:
+
+* lookup of assigned and unknown names
+* names shared by several users
+* users whose names were not found
+"""
+
+import unittest
+
+from img_manager.services.profile_images.assigned_index import \
+    AssignedImageIndex
+
+
+class TestAssignedImageIndex(unittest.TestCase):
+
+    def _index(self, assignments):
+        index = AssignedImageIndex()
+        for name, user_id in assignments:
+            index.add(name, user_id)
+        index.freeze()
+        return index
+
+    def test_pop_returns_user_id(self):
+        index = self._index([(f"img_{i}.jpg", i) for i in range(10_000)])
+
+        self.assertEqual(len(index), 10_000)
+        self.assertEqual(index.pop('img_1234.jpg'), 1234)
+        self.assertIsNone(index.pop('unknown.jpg'))
+
+    def test_shared_name_marks_all_users_found(self):
+        index = self._index([('new_user', 1), ('new_user', 2), ('a.jpg', 3)])
+
+        self.assertIn(index.pop('new_user'), (1, 2))
+        self.assertEqual(list(index.remaining_user_ids()), [3])
+
+    def test_remaining_user_ids(self):
+        index = self._index([(f"img_{i}.jpg", i) for i in range(100)])
+        for i in range(0, 100, 2):
+            index.pop(f"img_{i}.jpg")
+
+        self.assertCountEqual(index.remaining_user_ids(), range(1, 100, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
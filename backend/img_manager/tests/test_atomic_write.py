@@ -0,0 +1,56 @@
+"""
+This file contains tests for the atomic file write.
+
+The TestWriteFileAtomic class inherits from `django.test.SimpleTestCase`
+and implements individual tests for `write_file_atomic`:
+
+* file content and missing target directories
+* permissions from FILE_UPLOAD_PERMISSIONS or the umask
+"""
+
+from pathlib import Path
+import os
+import stat
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from img_manager.utils.os.atomic_write import write_file_atomic
+
+
+class TestWriteFileAtomic(SimpleTestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _mode(self, path):
+        return stat.S_IMODE(path.stat().st_mode)
+
+    def test_write(self):
+        path = self.root / 'a' / 'b' / 'image'
+        write_file_atomic(path, b'data')
+
+        self.assertEqual(path.read_bytes(), b'data')
+        self.assertEqual([p.name for p in path.parent.iterdir()], ['image'])
+
+    @override_settings(FILE_UPLOAD_PERMISSIONS=0o640)
+    def test_upload_permissions(self):
+        path = self.root / 'image'
+        write_file_atomic(path, b'data')
+
+        self.assertEqual(self._mode(path), 0o640)
+
+    @override_settings(FILE_UPLOAD_PERMISSIONS=None)
+    def test_umask_permissions(self):
+        path = self.root / 'image'
+        umask = os.umask(0o022)
+        try:
+            write_file_atomic(path, b'data')
+        finally:
+            os.umask(umask)
+
+        self.assertEqual(self._mode(path), 0o644)
@@ -0,0 +1,102 @@
+"""
+This file contains tests for the batch lookup of avatar URLs.
+
+The TestAvatarLookup class inherits from `django.test.TestCase`
+and tests `AvatarLookup` and `avatar_lookup_view`:
+
+* one query for a whole batch of users given by IDs and slugs
+* no query for users already in the cache
+* invalidation after the images of a user changed
+* least recently used users evicted from a full cache
+* the JSON endpoint and its limit on the number of users
+"""
+
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.processors.profile_image_processor import \
+    ProfileImageProcessor
+from img_manager.services.profile_images.avatar_lookup import (
+    AvatarLookup,
+    avatar_lookup,
+)
+from img_manager.services.profile_images.avatars import avatar_url
+
+
+class TestAvatarLookup(TestCase):
+
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create(
+                email=f'user{i}@example.com', username=f'user{i}',
+                profile_image=f'users/{i}/master.jpg',
+                profile_image_thumbnail=f'users/{i}/thumbnail.jpg',
+            )
+            for i in range(3)
+        ]
+        self.lookup = AvatarLookup(cache_size=10, ttl=60)
+        avatar_lookup.clear()
+
+    def tearDown(self):
+        avatar_lookup.clear()
+
+    def test_batch_query(self):
+        first, second, third = self.users
+
+        with self.assertNumQueries(1):
+            avatars = self.lookup.lookup([first.id, second.id, 999],
+                                         ['user2', 'nobody'])
+
+        self.assertEqual(set(avatars), {first.id, second.id, 'user2'})
+        self.assertEqual(avatars['user2'].user_id, third.id)
+        self.assertEqual(avatars[first.id].thumbnail,
+                         avatar_url(first.id, 'thumbnail', 'thumbnail.jpg'))
+
+    def test_cached_users(self):
+        first, second, _ = self.users
+        self.lookup.lookup([first.id], ['user1'])
+
+        with self.assertNumQueries(0):
+            avatars = self.lookup.lookup([second.id], ['user0'])
+
+        self.assertEqual(avatars[second.id].slug, 'user1')
+        self.assertEqual(avatars['user0'].user_id, first.id)
+        self.assertEqual(self.lookup.stats['queries'], 1)
+
+    def test_invalidation(self):
+        user = self.users[0]
+        avatar_lookup.lookup([user.id])
+
+        user.profile_image = f'users/{user.id}/new-master.jpg'
+        ProfileImageProcessor(user)._backup_and_save()
+
+        with self.assertNumQueries(1):
+            avatars = avatar_lookup.lookup([user.id])
+        self.assertEqual(avatars[user.id].master,
+                         avatar_url(user.id, 'master', 'new-master.jpg'))
+
+    def test_eviction(self):
+        lookup = AvatarLookup(cache_size=2, ttl=60)
+        first, second, third = self.users
+        lookup.lookup([first.id, second.id])
+        lookup.lookup([first.id])
+        lookup.lookup([third.id])
+
+        with self.assertNumQueries(0):
+            lookup.lookup([first.id, third.id], ['user2'])
+        with self.assertNumQueries(1):
+            lookup.lookup([second.id])
+
+    @override_settings(PROFILE_IMAGE_LOOKUP_MAX=2)
+    def test_endpoint(self):
+        first = self.users[0]
+
+        response = self.client.get(f'/avatars/lookup/?ids={first.id}&slugs=user1')
+        self.assertEqual(response.status_code, 200)
+        avatars = response.json()['avatars']
+        self.assertEqual(set(avatars), {str(first.id), 'user1'})
+        self.assertEqual(avatars['user1']['slug'], 'user1')
+
+        for query in ('ids=1,2&slugs=user2', 'ids=abc'):
+            response = self.client.get(f'/avatars/lookup/?{query}')
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,109 @@
+"""
+This file contains tests for the avatar serving views.
+
+The TestAvatarView class inherits from `django.test.TestCase`
+and tests `avatar_view` and `avatar_versioned_view`:
+
+* image served by user ID and slug with a strong ETag
+* 304 for a matching If-None-Match (without a query on versioned URLs)
+* redirect from a replaced image name to the current one
+* offload of the body with X-Sendfile and X-Accel-Redirect
+* 404 for unknown users, types and missing files
+"""
+
+from pathlib import Path
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.path_handlers.path_handler_object_store import \
+    PathHandlerObjectStore
+from img_manager.services.profile_images.avatars import avatar_url, \
+    get_local_file
+
+
+class TestAvatarView(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.root), PROFILE_IMAGE_STORAGE_BACKEND='local',
+            PROFILE_IMAGE_THUMBNAIL_PACK=False, PROFILE_IMAGE_SENDFILE='',
+        )
+        self._settings.enable()
+        handler = PathHandlerLocal()
+        self.master = handler.create_new_relative('master', 1)
+        handler.put(self.master, b'master-bytes')
+        self.user = CustomUser.objects.create(
+            email='anna@example.com', username='anna',
+            profile_image=str(self.master), profile_image_thumbnail='',
+        )
+        self.name = self.master.name
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def test_serve_by_id_and_slug(self):
+        for url in (f'/avatars/id/{self.user.id}/master/',
+                    '/avatars/anna/master/'):
+            response = self.client.get(url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(b''.join(response.streaming_content),
+                             b'master-bytes')
+            self.assertEqual(response['ETag'], f'"{self.name}"')
+            self.assertEqual(response['Cache-Control'], 'public, no-cache')
+
+    def test_not_modified(self):
+        response = self.client.get('/avatars/anna/master/',
+                                   HTTP_IF_NONE_MATCH=f'"{self.name}"')
+        self.assertEqual(response.status_code, 304)
+
+        url = avatar_url(self.user.id, 'master', self.master)
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"{self.name}"')
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_versioned_url(self):
+        url = avatar_url(self.user.id, 'master', self.master)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        response = self.client.get(
+            f'/avatars/id/{self.user.id}/master/replaced-name/')
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+
+    def test_sendfile(self):
+        with override_settings(PROFILE_IMAGE_SENDFILE='x-sendfile'):
+            response = self.client.get('/avatars/anna/master/')
+        self.assertEqual(response['X-Sendfile'], str(self.root / self.master))
+        self.assertEqual(response.content, b'')
+
+        with override_settings(PROFILE_IMAGE_SENDFILE='x-accel-redirect',
+                               PROFILE_IMAGE_SENDFILE_PREFIX='/protected/'):
+            response = self.client.get('/avatars/anna/master/')
+        self.assertEqual(response['X-Accel-Redirect'],
+                         f'/protected/{self.master.as_posix()}')
+
+    def test_object_store_is_not_sent_by_web_server(self):
+        with override_settings(
+                PROFILE_IMAGE_OBJECT_STORE_ROOT=str(self.root / 'store')):
+            handler = PathHandlerObjectStore()
+        self.assertIsNone(get_local_file(handler, self.master))
+        self.assertEqual(get_local_file(PathHandlerLocal(), self.master),
+                         self.root / self.master)
+
+    def test_not_found(self):
+        for url in ('/avatars/nobody/master/', '/avatars/anna/thumbnail/',
+                    '/avatars/anna/large/'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+        (self.root / self.master).unlink()
+        self.assertEqual(self.client.get('/avatars/anna/master/').status_code, 404)
@@ -0,0 +1,58 @@
+"""
+This file contains tests for `MissingProfileImageProcessor`.
+
+The TestNewestMasterIndex class inherits from `unittest.TestCase`
+and tests the index of the newest unassigned master per user:
+
+* the newest timestamp wins
+* only users with missing images are indexed
+* undecodable names are skipped
+"""
+
+import unittest
+
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.services.profile_images.fill_missing import \
+    MissingProfileImageProcessor
+
+
+class TestNewestMasterIndex(unittest.TestCase):
+
+    def _names(self, records):
+        batch = ImageNameProcessor.encode_many(
+            {"app_id": 1, "type_id": 0, "user_id": user_id,
+             "timestamp": timestamp}
+            for user_id, timestamp in records
+        )
+        return [f"{name}.jpg" for name in batch.names]
+
+    def test_newest_master_per_user(self):
+        names = self._names([(1, 100), (1, 300), (1, 200), (2, 50)])
+
+        index = MissingProfileImageProcessor._index_newest_masters(
+            names, {1, 2}
+        )
+
+        self.assertEqual(index, {1: names[1], 2: names[3]})
+
+    def test_only_requested_users_are_indexed(self):
+        names = self._names([(1, 100), (2, 100)])
+
+        index = MissingProfileImageProcessor._index_newest_masters(
+            names, {2}
+        )
+
+        self.assertEqual(index, {2: names[1]})
+
+    def test_undecodable_names_are_skipped(self):
+        names = ['not-an-image.jpg', 'A'] + self._names([(1, 100)])
+
+        index = MissingProfileImageProcessor._index_newest_masters(
+            names, {1}
+        )
+
+        self.assertEqual(index, {1: names[2]})
+
+
+if __name__ == '__main__':
+    unittest.main()
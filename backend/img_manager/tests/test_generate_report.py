@@ -0,0 +1,55 @@
+"""
+This file contains tests for `ProfileImageReportGenerator`.
+
+The TestUnassignedFilesReport class inherits from `django.test.TestCase`
+and tests that users referenced by unassigned files are fetched with one
+query per chunk of names, not one query per file.
+"""
+
+from django.test import TestCase
+from django.utils import timezone
+
+from users.models.custom_user import CustomUser
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.services.profile_images.generate_report import \
+    ProfileImageReportGenerator
+
+
+class TestUnassignedFilesReport(TestCase):
+
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create(
+                email=f"user{i}@example.com", username=f"user{i}",
+                last_login=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        records = [
+            {"app_id": 1, "type_id": 0, "user_id": user.id}
+            for user in self.users for _ in range(4)
+        ]
+        # A user that does not exist and a name that cannot be decoded
+        records.append({"app_id": 1, "type_id": 0, "user_id": 999_999})
+        self.names = ImageNameProcessor.encode_many(records).names
+        self.names.append('A')
+
+    def _generator(self):
+        return ProfileImageReportGenerator(
+            len(self.users), [], self.names, []
+        )
+
+    def test_one_query_per_chunk(self):
+        generator = self._generator()
+        generator.CHUNK_SIZE = 5
+
+        with self.assertNumQueries(3):
+            report = generator._generate_unassigned_files_report('master')
+
+        self.assertEqual(report.count("- Username: user1"), 4)
+        self.assertIn("User with ID 999999 does not exist.", report)
+        self.assertIn("Error decoding image name: A\n", report)
+
+    def test_single_query_for_small_report(self):
+        with self.assertNumQueries(1):
+            self._generator()._generate_unassigned_files_report('master')
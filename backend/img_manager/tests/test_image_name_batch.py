@@ -0,0 +1,79 @@
+"""
+This file contains tests for the batch API of `ImageNameProcessor`.
+
+The TestImageNameBatch class inherits from `unittest.TestCase`
+and implements individual tests for the methods:
+
+* `ImageNameProcessor.encode_many`
+* `ImageNameProcessor.decode_many`
+
+The tests verify that the batch path gives the same results as the per-name
+path and that invalid input is reported through the `valid` mask.
+"""
+
+import unittest
+
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+
+
+class TestImageNameBatch(unittest.TestCase):
+    """Test cases for batch image name encoding and decoding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.records = [
+            {'app_id': 1, 'type_id': 0, 'timestamp': 1726664971, 'user_id': 1},
+            {'app_id': 9, 'type_id': 9, 'timestamp': 1726664971,
+             'user_id': 2 ** 32 - 1},
+            {'app_id': 5, 'type_id': 1, 'timestamp': 1726664971,
+             'user_id': 1234},
+        ]
+
+    def test_encode_many_matches_per_name(self):
+        """Test that batch encoding produces the per-name result."""
+        batch = ImageNameProcessor.encode_many(self.records)
+
+        for record, name in zip(self.records, batch.names):
+            processor = ImageNameProcessor(
+                app_id=record['app_id'],
+                type_id=record['type_id'],
+                user_id=record['user_id'],
+            )
+            processor.data['timestamp'] = record['timestamp']
+            self.assertEqual(processor.generate_image_name(), name)
+
+    def test_decode_many_roundtrip(self):
+        """Test that decoded columns match the encoded records."""
+        names = ImageNameProcessor.encode_many(self.records).names
+        batch = ImageNameProcessor.decode_many(iter(names))
+
+        self.assertEqual(len(batch), len(self.records))
+        self.assertEqual(batch.failed_count, 0)
+        self.assertEqual(batch.names, names)
+        for index, record in enumerate(self.records):
+            self.assertEqual(batch.row(index), record)
+
+    def test_decode_many_invalid_names(self):
+        """Test that invalid names are masked instead of raising."""
+        valid_name = ImageNameProcessor.encode_many(self.records[:1]).names[0]
+        batch = ImageNameProcessor.decode_many(
+            ['', 'A', '!!!', valid_name]
+        )
+
+        self.assertEqual(list(batch.valid), [0, 0, 0, 1])
+        self.assertIsNone(batch.row(0))
+        self.assertEqual(batch.user_id[3], 1)
+
+    def test_encode_many_invalid_records(self):
+        """Test that invalid records are masked instead of raising."""
+        batch = ImageNameProcessor.encode_many([
+            {'app_id': 0, 'type_id': 0, 'user_id': 1},
+            {'app_id': 1, 'type_id': 10, 'user_id': 1},
+            {'app_id': 1, 'type_id': 0, 'user_id': 0},
+            {'app_id': 1, 'type_id': 0},
+            {'app_id': 1, 'type_id': 0, 'user_id': 1},
+        ])
+
+        self.assertEqual(list(batch.valid), [0, 0, 0, 0, 1])
+        self.assertEqual(batch.names[:4], ['', '', '', ''])
+        self.assertTrue(batch.names[4])
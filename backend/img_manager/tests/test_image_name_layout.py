@@ -0,0 +1,117 @@
+"""
+This file contains tests for the binary layout of profile image names.
+
+The TestImageNameLayout class inherits from `unittest.TestCase`
+and implements individual tests for:
+
+* `pack_image_name` / `unpack_image_name`
+* `encode_varint` / `decode_varint`
+* decoding of binary and legacy names by `ImageNameProcessor`
+
+The tests cover boundary values, fixed header length and backward
+compatibility with names generated by the legacy decimal format.
+"""
+
+import base64
+import unittest
+
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.exceptions.base64_processor_errors import DekodeImageNameError
+from img_manager.exceptions.image_name_layout_errors import (
+    FieldOutOfRangeError,
+    TruncatedImageNameError,
+    UnsupportedLayoutVersionError,
+)
+from img_manager.utils.base64.image_name_layout import (
+    HEADER_NAME_LENGTH,
+    MAX_TIMESTAMP,
+    MAX_USER_ID,
+    bytes_to_name,
+    decode_varint,
+    encode_varint,
+    pack_image_name,
+    unpack_image_name,
+)
+
+
+def legacy_image_name(app_id, type_id, timestamp, user_id):
+    """Build a name in the legacy decimal format."""
+    integer = int(f"{app_id}{type_id}{timestamp}{user_id}")
+    data = integer.to_bytes((integer.bit_length() + 7) // 8, 'big')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+class TestImageNameLayout(unittest.TestCase):
+    """Test cases for the binary image name layout."""
+
+    def test_varint_roundtrip(self):
+        """Test varint encoding of boundary values."""
+        for value in (0, 1, 0x7F, 0x80, 2 ** 32 - 1, MAX_USER_ID):
+            data = b'\x00' + encode_varint(value)
+            self.assertEqual(decode_varint(data, 1), value)
+
+    def test_varint_truncated(self):
+        """Test that an unterminated varint is rejected."""
+        with self.assertRaises(TruncatedImageNameError):
+            decode_varint(b'\x80\x80', 0)
+
+    def test_pack_unpack_roundtrip(self):
+        """Test packing and unpacking of boundary values."""
+        for fields in ((1, 0, 0, 1), (9, 9, MAX_TIMESTAMP, MAX_USER_ID)):
+            self.assertEqual(unpack_image_name(pack_image_name(*fields)),
+                             fields)
+
+    def test_pack_out_of_range(self):
+        """Test that values not fitting their field are rejected."""
+        with self.assertRaises(FieldOutOfRangeError):
+            pack_image_name(256, 0, 0, 1)
+        with self.assertRaises(FieldOutOfRangeError):
+            pack_image_name(1, 0, MAX_TIMESTAMP + 1, 1)
+        with self.assertRaises(FieldOutOfRangeError):
+            pack_image_name(1, 0, 0, -1)
+
+    def test_unpack_unknown_version(self):
+        """Test that an unknown layout version is rejected."""
+        data = bytearray(pack_image_name(1, 0, 1726664971, 1))
+        data[1] = 2
+        with self.assertRaises(UnsupportedLayoutVersionError):
+            unpack_image_name(bytes(data))
+
+    def test_fixed_header_prefix(self):
+        """Test that names share a fixed-length header prefix."""
+        first = bytes_to_name(pack_image_name(1, 0, 1726664971, 1))
+        second = bytes_to_name(pack_image_name(1, 0, 1726664971, 2 ** 40))
+
+        self.assertEqual(HEADER_NAME_LENGTH, 12)
+        self.assertEqual(first[:HEADER_NAME_LENGTH],
+                         second[:HEADER_NAME_LENGTH])
+
+    def test_processor_decodes_binary_name(self):
+        """Test that generated names decode through the processor."""
+        processor = ImageNameProcessor(app_id=5, type_id=3, user_id=1234)
+        decoded = ImageNameProcessor(
+            base64_name=processor.generate_image_name()
+        ).data
+
+        self.assertEqual(decoded, processor.data)
+
+    def test_processor_decodes_legacy_name(self):
+        """Test backward compatibility with legacy names."""
+        name = legacy_image_name(5, 3, 1726664971, 1234)
+        expected = {
+            'app_id': 5, 'type_id': 3, 'timestamp': 1726664971,
+            'user_id': 1234
+        }
+
+        self.assertEqual(ImageNameProcessor(base64_name=name).data, expected)
+        self.assertEqual(ImageNameProcessor.decode_many([name]).row(0),
+                         expected)
+
+    def test_processor_rejects_truncated_name(self):
+        """Test that a truncated binary name is rejected."""
+        name = bytes_to_name(pack_image_name(1, 0, 1726664971, 1)[:9])
+
+        with self.assertRaises(DekodeImageNameError):
+            ImageNameProcessor(base64_name=name)
+        self.assertEqual(list(ImageNameProcessor.decode_many([name]).valid),
+                         [0])
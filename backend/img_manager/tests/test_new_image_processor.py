@@ -0,0 +1,136 @@
+"""
+This file contains tests for the creation of new profile images.
+
+The TestNewImageProcessor class inherits from `unittest.TestCase`
+and tests `NewImageProcessor.create_master` and the thumbnail derived
+from it:
+
+* large JPEG decoded in draft mode
+* non-square PNG with alpha channel
+* image smaller than the master size
+* in-memory uploads saved as the only two files on disk
+* rejected uploads not saved by `ProfileImageProcessor`
+"""
+
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from PIL import Image
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from img_manager.core.processors.new_image_processor import NewImageProcessor
+from img_manager.core.processors.profile_image_processor import \
+    ProfileImageProcessor
+from img_manager.utils.pil.draft_image import draft_square
+
+
+class TestNewImageProcessor(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _create_upload(self, name, size, mode='RGB', color='red', **params):
+        path = self.root / name
+        Image.new(mode, size, color).save(path, **params)
+        return path
+
+    def _assert_images(self, path):
+        master = NewImageProcessor.create_master(path)
+        thumbnail = NewImageProcessor._resize_image(master, 'thumbnail')
+
+        self.assertEqual(master.mode, 'RGB')
+        self.assertEqual(master.size, NewImageProcessor.SIZE['master'])
+        self.assertEqual(thumbnail.size, NewImageProcessor.SIZE['thumbnail'])
+        return master
+
+    def test_large_jpeg(self):
+        path = self._create_upload('upload.jpg', (4000, 3000), format='JPEG')
+
+        master = self._assert_images(path)
+
+        red, green, blue = master.getpixel((200, 200))
+        self.assertGreater(red, 240)
+        self.assertLess(max(green, blue), 15)
+
+    def test_draft_keeps_master_size(self):
+        path = self._create_upload('upload.jpg', (3300, 801), format='JPEG')
+
+        with Image.open(path) as img:
+            draft_square(img, 400)
+            self.assertGreaterEqual(min(img.size), 400)
+            self.assertLess(min(img.size), 801)
+
+        self._assert_images(path)
+
+    def test_png_with_alpha(self):
+        path = self._create_upload('upload.png', (300, 1200), mode='RGBA',
+                                   color=(0, 0, 255, 128), format='PNG')
+
+        self._assert_images(path)
+
+    def test_small_image(self):
+        path = self._create_upload('upload.jpg', (120, 90), format='JPEG')
+
+        self._assert_images(path)
+
+    def _noise_jpeg(self, size=(800, 600)):
+        img = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=95)
+        return buffer.getvalue()
+
+    def test_create_profile_images_from_memory(self):
+        data = self._noise_jpeg()
+
+        for upload in (data, SimpleUploadedFile('upload.jpg', data)):
+            images = NewImageProcessor.create_profile_images(upload)
+
+            for img_type, content in images.items():
+                with Image.open(BytesIO(content)) as img:
+                    self.assertEqual(img.format, 'JPEG')
+                    self.assertEqual(img.size, NewImageProcessor.SIZE[img_type])
+
+    def test_invalid_uploads(self):
+        with self.assertRaises(ValidationError):
+            NewImageProcessor.create_profile_images(b'x' * 200_000)
+        with self.assertRaises(ValidationError):
+            NewImageProcessor.create_profile_images(self._noise_jpeg((8, 8)))
+
+    def test_process_new_image_writes_only_outputs(self):
+        user = SimpleNamespace(id=7, backup_data={})
+        with override_settings(MEDIA_ROOT=str(self.root)):
+            NewImageProcessor.process_new_image(
+                user, SimpleUploadedFile('upload.jpg', self._noise_jpeg()))
+
+        files = sorted(path for path in self.root.rglob('*') if path.is_file())
+        self.assertEqual(files, sorted(
+            self.root / name for name in (user.profile_image,
+                                          user.profile_image_thumbnail)))
+
+    def test_rejected_upload_is_not_saved(self):
+        user = SimpleNamespace(id=7, backup_data={},
+                               profile_image=b'x' * 200_000)
+        processor = ProfileImageProcessor(user)
+
+        with mock.patch.object(processor, '_backup_and_save') as save, \
+                override_settings(MEDIA_ROOT=str(self.root)):
+            with self.assertRaises(ValidationError):
+                processor.process_new_profile_img(deferred=False)
+
+        save.assert_not_called()
+        self.assertEqual(list(self.root.rglob('*')), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
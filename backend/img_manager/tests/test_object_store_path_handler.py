@@ -0,0 +1,141 @@
+"""
+This file contains tests for the object store backend of profile images.
+
+The TestObjectStorePathHandler class inherits from `unittest.TestCase`
+and tests `LocalObjectStore` and `PathHandlerObjectStore`:
+
+* put/get/delete of objects and rejected keys
+* listing by a key prefix that ends inside a directory name
+* streaming one level of a listing with sizes and mtimes
+* concurrent upload of several images with `put_many`
+* a new profile image stored only in the bucket, old images deleted
+* the backend selected by PROFILE_IMAGE_STORAGE_BACKEND
+"""
+
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.path_handlers.path_handler_object_store import \
+    PathHandlerObjectStore
+from img_manager.core.processors.new_image_processor import NewImageProcessor
+from img_manager.exceptions.object_store_errors import (
+    InvalidObjectKeyError,
+    UnknownStorageBackendError
+)
+from img_manager.utils.os.local_object_store import LocalObjectStore
+
+
+class TestObjectStorePathHandler(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.root / 'media'),
+            PROFILE_IMAGE_OBJECT_STORE_ROOT=self.root / 'store',
+            PROFILE_IMAGE_OBJECT_STORE_BUCKET='avatars',
+            PROFILE_IMAGE_UPLOAD_CONCURRENCY=4,
+        )
+        self._settings.enable()
+        self.store = LocalObjectStore(self.root / 'store', 'avatars')
+        self.handler = PathHandlerObjectStore()
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def test_put_get_delete(self):
+        self.store.put('a/b/c.jpg', b'one')
+        self.store.put('a/b/c.jpg', b'two')
+
+        self.assertEqual(self.store.get('a/b/c.jpg'), b'two')
+        self.assertTrue(self.store.delete('a/b/c.jpg'))
+        self.assertFalse(self.store.delete('a/b/c.jpg'))
+        with self.assertRaises(FileNotFoundError):
+            self.store.get('a/b/c.jpg')
+        for key in ('', '/etc/passwd', 'a/../../x', 'a//b'):
+            with self.assertRaises(InvalidObjectKeyError):
+                self.store.put(key, b'x')
+
+    def test_list_prefix(self):
+        for key in ('master/3f/a0/one', 'master/3f/b1/two',
+                    'master/4a/00/three', 'thumbnail/3f/a0/four'):
+            self.handler.put(key, b'x')
+
+        self.assertEqual(self.handler.list_prefix('master/3'),
+                         ['master/3f/a0/one', 'master/3f/b1/two'])
+        self.assertEqual(len(self.handler.list_prefix('')), 4)
+        self.assertEqual(self.handler.list_prefix('missing/'), [])
+
+    def test_move(self):
+        self.handler.put('master/one', b'xyz')
+
+        self.handler.move('master/one', 'master/3f/a0/one')
+
+        self.assertFalse(self.handler.exists('master/one'))
+        self.assertEqual(self.handler.get('master/3f/a0/one'), b'xyz')
+        with self.assertRaises(FileNotFoundError):
+            self.handler.move('master/one', 'master/two')
+
+    def test_scan(self):
+        for key in ('master/one', 'master/3f/a0/two'):
+            self.store.put(key, b'xyz')
+        # A file being written by write_file_atomic is not an object
+        (self.store.object_path('master') / '.tmp-x').touch()
+
+        entries = sorted(self.handler.scan('master/'))
+
+        self.assertEqual([(key, size) for key, size, _ in entries],
+                         [('master/3f/', None), ('master/one', 3)])
+        self.assertIsNotNone(entries[1].mtime_ns)
+        self.assertEqual(list(self.handler.scan('missing/')), [])
+        self.assertEqual(list(self.handler.scan('master/one/')), [])
+
+    def test_put_many(self):
+        files = {f'users/profile_images/master/{i:02d}': bytes([i]) * 10
+                 for i in range(20)}
+
+        self.handler.put_many(files)
+
+        self.assertEqual(self.handler.list_prefix('users/'), sorted(files))
+        for key, data in files.items():
+            self.assertEqual(self.handler.get(key), data)
+
+    def test_new_image_stored_in_bucket(self):
+        old = 'users/profile_images/master/old'
+        self.handler.put(old, b'old')
+        user = SimpleNamespace(id=7, backup_data={'profile_image': old})
+        img = Image.frombytes('RGB', (800, 600), os.urandom(800 * 600 * 3))
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=95)
+
+        NewImageProcessor.process_new_image(
+            user, SimpleUploadedFile('upload.jpg', buffer.getvalue()),
+            self.handler)
+
+        self.assertEqual(
+            self.handler.list_prefix('users/'),
+            sorted([user.profile_image, user.profile_image_thumbnail]))
+        self.assertFalse((self.root / 'media').exists())
+
+    def test_backend_setting(self):
+        self.assertIsInstance(get_path_handler(), PathHandlerLocal)
+        with override_settings(PROFILE_IMAGE_STORAGE_BACKEND='object_store'):
+            self.assertIsInstance(get_path_handler(), PathHandlerObjectStore)
+        with override_settings(PROFILE_IMAGE_STORAGE_BACKEND='ftp'):
+            with self.assertRaises(UnknownStorageBackendError):
+                get_path_handler()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+This file contains tests for the sharded directory layout of profile images.
+
+The TestProfileImageLayout class inherits from `django.test.TestCase`
+and tests:
+
+* paths of new images created in the layout
+* migration of flat files and user paths (and its dry run)
+* users changed during the migration left for the next run
+* renaming of local files by the migration
+* removal of extra files resolving the layout
+* removal and repair of files not migrated yet, found by the manifest
+* manifest and migration of images in the object store
+"""
+
+from pathlib import Path
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.path_handlers.path_handler_object_store import \
+    PathHandlerObjectStore
+from img_manager.services.profile_images.fill_missing import \
+    MissingProfileImageProcessor
+from img_manager.services.profile_images.manifest import ProfileImageManifest
+from img_manager.services.profile_images.relayout import \
+    ProfileImageLayoutMigration
+from img_manager.services.profile_images.remove_extra import \
+    ExtraProfileImageProcessor
+
+
+class TestProfileImageLayout(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.media = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.media),
+            PROFILE_IMAGE_SHARD_LEVELS=2, PROFILE_IMAGE_SHARD_WIDTH=2,
+        )
+        self._settings.enable()
+        self.paths = ProfileImagePaths()
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _flat_file(self, img_type, name):
+        path = self.media / self.paths.PATH_FROM_MEDIA / img_type / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'image')
+        return str(path.relative_to(self.media))
+
+    def test_new_paths_use_layout(self):
+        relative_path = PathHandlerLocal().create_new_relative('master', 7)
+
+        name = relative_path.name
+        shard = self.paths.get_shard_dir(name)
+        self.assertRegex(shard, r'^[0-9a-f]{2}/[0-9a-f]{2}$')
+        self.assertEqual(relative_path,
+                         self.paths.PATH_FROM_MEDIA / 'master' / shard / name)
+
+    def test_migration(self):
+        master = self._flat_file('master', 'a.jpg')
+        thumbnail = self._flat_file('thumbnail', 'a_t.jpg')
+        self._flat_file('master', 'orphan.jpg')
+        user = CustomUser.objects.create(
+            email='anna@example.com', username='anna',
+            profile_image=master, profile_image_thumbnail=thumbnail,
+            backup_data={'profile_image': master,
+                         'profile_image_thumbnail': thumbnail},
+        )
+
+        dry_run = ProfileImageLayoutMigration(batch_size=1, dry_run=True)
+        dry_run.run()
+        self.assertEqual(dry_run.stats['moved_files'], 3)
+        self.assertTrue((self.media / master).exists())
+
+        migration = ProfileImageLayoutMigration(batch_size=1)
+        migration.run()
+
+        self.assertEqual(migration.stats,
+                         {'moved_files': 3, 'updated_users': 1,
+                          'missing_files': 0, 'skipped_users': 0})
+        user.refresh_from_db()
+        expected = str(self.paths.get_image_rel_path('master', 'a.jpg'))
+        self.assertEqual(user.profile_image.name, expected)
+        self.assertEqual(user.backup_data['profile_image'], expected)
+        self.assertTrue(Path(user.profile_image.path).exists())
+        self.assertTrue(
+            self.paths.get_image_abs_path('master', 'orphan.jpg').exists())
+
+        again = ProfileImageLayoutMigration()
+        again.run()
+        self.assertEqual(again.stats['moved_files'], 0)
+        self.assertEqual(again.stats['updated_users'], 0)
+
+    def test_user_changed_during_migration_is_skipped(self):
+        master = self._flat_file('master', 'a.jpg')
+        uploaded = self._flat_file('master', 'b.jpg')
+        user = CustomUser.objects.create(
+            email='anna@example.com', username='anna', profile_image=master)
+        migration = ProfileImageLayoutMigration()
+        migrate_batch = migration._migrate_batch
+
+        def upload_then_migrate(scanned, fields):
+            CustomUser.objects.filter(pk=user.pk).update(
+                profile_image=uploaded)
+            migrate_batch(scanned, fields)
+
+        migration._migrate_batch = upload_then_migrate
+        migration.run()
+
+        self.assertEqual(migration.stats['skipped_users'], 1)
+        self.assertEqual(migration.stats['updated_users'], 0)
+        user.refresh_from_db()
+        self.assertEqual(user.profile_image.name, uploaded)
+        self.assertTrue((self.media / uploaded).exists())
+
+    def test_local_files_are_renamed(self):
+        master = self._flat_file('master', 'a.jpg')
+        inode = (self.media / master).stat().st_ino
+        CustomUser.objects.create(email='anna@example.com', username='anna',
+                                  profile_image=master)
+
+        ProfileImageLayoutMigration().run()
+
+        target = self.paths.get_image_abs_path('master', 'a.jpg')
+        self.assertEqual(target.stat().st_ino, inode)
+        self.assertFalse((self.media / master).exists())
+
+    def test_remove_extra_uses_layout(self):
+        path = self.paths.get_image_abs_path('master', 'orphan.jpg')
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b'image')
+
+        ExtraProfileImageProcessor(['orphan.jpg'], []).remove_files('all')
+
+        self.assertFalse(path.exists())
+
+    def test_unmigrated_files_are_found_by_manifest(self):
+        name = PathHandlerLocal().get_new_image_name('master', 7)
+        orphan = self._flat_file('master', 'orphan.jpg')
+        master = self._flat_file('master', name)
+        ProfileImageManifest().sync()
+
+        ExtraProfileImageProcessor(['orphan.jpg'], []).remove_files('all')
+        user = {'id': 7, 'username': 'anna', 'profile_image': '',
+                'profile_image_thumbnail': ''}
+        task = MissingProfileImageProcessor([user], [name])._create_task(user)
+
+        self.assertFalse((self.media / orphan).exists())
+        self.assertEqual(task.master, master)
+
+    def test_object_store(self):
+        with override_settings(PROFILE_IMAGE_STORAGE_BACKEND='object_store',
+                               PROFILE_IMAGE_OBJECT_STORE_ROOT=self.media,
+                               PROFILE_IMAGE_OBJECT_STORE_BUCKET='bucket'):
+            store = PathHandlerObjectStore()
+            root = self.paths.PATH_FROM_MEDIA / 'master'
+            master, orphan = str(root / 'a.jpg'), str(root / 'orphan.jpg')
+            store.put(master, b'image')
+            store.put(orphan, b'image')
+            CustomUser.objects.create(email='anna@example.com',
+                                      username='anna', profile_image=master)
+
+            manifest = ProfileImageManifest()
+            manifest.sync()
+            self.assertEqual(manifest.unassigned_names('master'),
+                             ['orphan.jpg'])
+            self.assertEqual(manifest.missing_names('master'), [])
+
+            migration = ProfileImageLayoutMigration()
+            migration.run()
+
+            self.assertEqual(migration.stats['moved_files'], 2)
+            self.assertEqual(migration.errors, [])
+            self.assertEqual(store.list_prefix(str(root)), sorted(
+                str(self.paths.get_image_rel_path('master', name))
+                for name in ('a.jpg', 'orphan.jpg')))
+            self.assertFalse(store.exists(master))
@@ -0,0 +1,182 @@
+"""
+This file contains tests for the persisted profile image manifest.
+
+The TestProfileImageManifest class inherits from `django.test.TestCase`
+and implements individual tests for `ProfileImageManifest.sync`:
+
+* full rebuild (unassigned and missing files)
+* skipping of unchanged directories
+* rescanning of changed directories, including sharded subdirectories
+* listing a changed directory without its unchanged subdirectories
+* re-querying of changed and deleted users only
+* restarting an interrupted rebuild
+"""
+
+import os
+import tempfile
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from users.models.custom_user import CustomUser
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.models import ProfileImageManifestEntry
+from img_manager.services.profile_images.manifest import ProfileImageManifest
+
+
+class TestProfileImageManifest(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._settings = override_settings(MEDIA_ROOT=self._temp_dir.name)
+        self._settings.enable()
+        paths = ProfileImagePaths()
+        self.dirs = {
+            img_type: paths.get_profile_images_abs_path(img_type)
+            for img_type in ProfileImageManifest.IMAGE_FIELDS
+        }
+        for directory in self.dirs.values():
+            directory.mkdir(parents=True)
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _touch(self, img_type, name, subdirectory=''):
+        directory = self.dirs[img_type] / subdirectory
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / name).write_bytes(b'image')
+
+    def _age_directories(self):
+        """Move all directory mtimes out of the racy window."""
+        old = timezone.now().timestamp() - 60
+        for root in self.dirs.values():
+            for directory, _, _ in os.walk(root):
+                os.utime(directory, (old, old))
+
+    def _create_user(self, username, master='', thumbnail=''):
+        return CustomUser.objects.create(
+            email=f"{username}@example.com",
+            username=username,
+            profile_image=master,
+            profile_image_thumbnail=thumbnail,
+        )
+
+    def _sync(self, full=False):
+        manifest = ProfileImageManifest()
+        manifest.sync(full=full)
+        return manifest
+
+    def test_full_rebuild(self):
+        self._create_user('anna', 'a.jpg', 'a_t.jpg')
+        self._touch('master', 'a.jpg')
+        self._touch('master', 'orphan.jpg')
+
+        manifest = self._sync()
+
+        self.assertTrue(manifest.full)
+        self.assertEqual(manifest.unassigned_names('master'), ['orphan.jpg'])
+        self.assertEqual(manifest.unassigned_names('thumbnail'), [])
+        self.assertEqual(manifest.missing_names('thumbnail'), ['a_t.jpg'])
+        entry = ProfileImageManifestEntry.objects.get(name='a.jpg')
+        self.assertEqual((entry.directory, entry.user_id),
+                         ('', CustomUser.objects.get().id))
+        self.assertEqual(entry.size, len(b'image'))
+        self.assertIsNotNone(entry.mtime_ns)
+
+    def test_unchanged_directories_are_skipped(self):
+        self._touch('master', 'orphan.jpg')
+        self._age_directories()
+        self._sync()
+
+        manifest = self._sync()
+
+        self.assertFalse(manifest.full)
+        self.assertEqual(manifest.stats['scanned_directories'], 0)
+        self.assertEqual(manifest.stats['skipped_directories'], 2)
+        self.assertEqual(manifest.unassigned_names('master'), ['orphan.jpg'])
+
+    def test_changed_directories_are_rescanned(self):
+        self._touch('master', 'old.jpg', 'ab')
+        self._age_directories()
+        self._sync()
+
+        os.remove(self.dirs['master'] / 'ab' / 'old.jpg')
+        self._touch('master', 'new.jpg', 'ab')
+        manifest = self._sync()
+
+        self.assertEqual(manifest.stats['scanned_directories'], 1)
+        self.assertEqual(manifest.unassigned_names('master'), ['new.jpg'])
+        entry = ProfileImageManifestEntry.objects.get(name='new.jpg')
+        self.assertEqual(entry.directory, 'ab')
+
+    def test_changed_directory_is_listed_without_subdirectories(self):
+        self._touch('master', 'old.jpg', 'ab')
+        self._age_directories()
+        self._sync()
+
+        self._touch('master', 'top.jpg')
+        manifest = ProfileImageManifest()
+        with patch.object(manifest.path_handler, 'scan',
+                          wraps=manifest.path_handler.scan) as scan:
+            manifest.sync()
+
+        self.assertEqual(manifest.stats['scanned_directories'], 1)
+        self.assertEqual([call.args[0] for call in scan.call_args_list],
+                         [manifest._type_prefix('master')])
+        self.assertEqual(manifest.unassigned_names('master'),
+                         ['old.jpg', 'top.jpg'])
+
+    def test_only_changed_users_are_requeried(self):
+        anna = self._create_user('anna', 'a.jpg', 'a_t.jpg')
+        self._create_user('bob', 'b.jpg', 'b_t.jpg')
+        for name in ('a.jpg', 'b.jpg', 'a2.jpg'):
+            self._touch('master', name)
+        self._age_directories()
+        self.assertEqual(self._sync().unassigned_names('master'), ['a2.jpg'])
+
+        anna.profile_image = 'a2.jpg'
+        anna.profile_image_changed = timezone.now()
+        anna.save()
+        manifest = self._sync()
+
+        self.assertEqual(manifest.stats['changed_users'], 1)
+        self.assertEqual(manifest.unassigned_names('master'), ['a.jpg'])
+
+    def test_deleted_users_release_images(self):
+        bob = self._create_user('bob', 'b.jpg', 'b_t.jpg')
+        self._touch('master', 'b.jpg')
+        self._age_directories()
+        self._sync()
+
+        bob.delete()
+        manifest = self._sync()
+
+        self.assertEqual(manifest.unassigned_names('master'), ['b.jpg'])
+        self.assertEqual(manifest.missing_names('thumbnail'), [])
+
+    def test_full_flag_rebuilds_existing_manifest(self):
+        self._touch('master', 'orphan.jpg')
+        self._age_directories()
+        self._sync()
+
+        manifest = self._sync(full=True)
+
+        self.assertTrue(manifest.full)
+        self.assertEqual(manifest.stats['scanned_directories'], 2)
+        self.assertEqual(manifest.unassigned_names('master'), ['orphan.jpg'])
+
+    def test_interrupted_rebuild_starts_over(self):
+        self._touch('master', 'orphan.jpg')
+        self._age_directories()
+        self._sync()
+
+        with patch.object(ProfileImageManifest, '_add_missing_entries',
+                          side_effect=OSError("interrupted")):
+            with self.assertRaises(OSError):
+                self._sync(full=True)
+        manifest = self._sync()
+
+        self.assertTrue(manifest.full)
+        self.assertEqual(manifest.unassigned_names('master'), ['orphan.jpg'])
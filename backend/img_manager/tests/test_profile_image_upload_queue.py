@@ -0,0 +1,200 @@
+"""
+This file contains tests for the deferred processing of uploaded profile
+images.
+
+The TestProfileImageUploadQueue class inherits from `django.test.TestCase`
+and tests `ProfileImageUploadQueue`:
+
+* images swapped in only after the job is processed
+* repeated enqueue and processing of the same upload
+* different uploads of one user within the same second
+* retry of failed attempts and failure of invalid uploads
+* failure of jobs abandoned by crashed workers without attempts left
+* queue depth metrics
+"""
+
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+import os
+import tempfile
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.models import ProfileImageUploadJob
+from img_manager.services.profile_images.upload_queue import \
+    ProfileImageUploadQueue
+
+
+class TestProfileImageUploadQueue(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._settings = override_settings(
+            MEDIA_ROOT=self._temp_dir.name,
+            PROFILE_IMAGE_QUEUE_MAX_ATTEMPTS=2,
+        )
+        self._settings.enable()
+        self.handler = PathHandlerLocal()
+        self.queue = ProfileImageUploadQueue()
+
+        self.old_master = self._save_media('master', self._jpeg((400, 400)))
+        self.old_thumbnail = self._save_media('thumbnail', self._jpeg((64, 64)))
+        self.user = CustomUser.objects.create(
+            email='anna@example.com', username='anna',
+            profile_image=self.old_master,
+            profile_image_thumbnail=self.old_thumbnail,
+        )
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _jpeg(self, size):
+        """Return a noisy JPEG (above the minimal upload size)."""
+        img = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+        buffer = BytesIO()
+        img.save(buffer, format='JPEG', quality=95)
+        return buffer.getvalue()
+
+    def _save_media(self, img_type, content):
+        relative_path = f"users/profile_images/{img_type}/old_{img_type}"
+        path = self.handler.get_absolute_media(relative_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        return relative_path
+
+    def _enqueue(self, content=None, key=None):
+        content = content or self._jpeg((800, 600))
+        return self.queue.enqueue(self.user, ContentFile(content, 'upload.jpg'),
+                                  key=key)
+
+    def _process(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.queue.process_batch()
+
+    def _exists(self, relative_path):
+        return Path(self.handler.get_absolute_media(relative_path)).exists()
+
+    def test_images_swapped_after_processing(self):
+        job = self._enqueue()
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, self.old_master)
+        self.assertTrue(self._exists(job.upload))
+
+        results = self._process()
+
+        self.assertTrue(all(result.ok for result in results))
+        self.user.refresh_from_db()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ProfileImageUploadJob.DONE)
+        self.assertTrue(self.user.profile_image.name.endswith(job.image_name))
+        self.assertEqual(self.user.backup_data['profile_image'],
+                         self.user.profile_image.name)
+        for field, size in ((self.user.profile_image, (400, 400)),
+                            (self.user.profile_image_thumbnail, (64, 64))):
+            with Image.open(field.path) as img:
+                self.assertEqual(img.size, size)
+        self.assertFalse(self._exists(job.upload))
+        self.assertFalse(self._exists(self.old_master))
+        self.assertFalse(self._exists(self.old_thumbnail))
+
+    def test_enqueue_and_process_are_idempotent(self):
+        content = self._jpeg((800, 600))
+        job = self._enqueue(content)
+        self.assertEqual(self._enqueue(content).id, job.id)
+        self.assertEqual(ProfileImageUploadJob.objects.count(), 1)
+        uploads = self.handler.get_absolute_media(job.upload).parent
+        self.assertEqual(len(os.listdir(uploads)), 1)
+
+        self._process()
+        self.user.refresh_from_db()
+        master = self.user.profile_image.name
+        self.assertEqual(self._process(), [])
+
+        # A job processed again (e.g. after a lost lock) changes nothing
+        self.queue._swap_images(job)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, master)
+        self.assertTrue(self._exists(master))
+
+    def test_different_uploads_in_same_second(self):
+        target = 'img_manager.services.profile_images.upload_queue.time.time'
+        with mock.patch(target, return_value=1_700_000_000):
+            first = self._enqueue()
+            second = self._enqueue()
+            third = self._enqueue(key='client-key')
+            repeated = self._enqueue(key='client-key')
+
+        self.assertEqual(repeated.id, third.id)
+        self.assertEqual(
+            len({job.image_name for job in (first, second, third)}), 3)
+        self.assertEqual(len({job.upload for job in (first, second, third)}), 3)
+        for job in (first, second, third):
+            self.assertTrue(self._exists(job.upload))
+
+    def test_abandoned_job_without_attempts_fails(self):
+        job = self._enqueue()
+        ProfileImageUploadJob.objects.filter(id=job.id).update(
+            status=ProfileImageUploadJob.RUNNING, attempts=2,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+        self.assertEqual(self._process(), [])
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ProfileImageUploadJob.FAILED)
+        self.assertEqual(job.error, self.queue.ABANDONED_ERROR)
+        self.assertFalse(self._exists(job.upload))
+
+    def test_retry_then_fail(self):
+        job = self._enqueue()
+        target = ('img_manager.services.profile_images.upload_queue.'
+                  'NewImageProcessor.create_profile_images')
+
+        with mock.patch(target, side_effect=OSError('disk full')):
+            self._process()
+            job.refresh_from_db()
+            self.assertEqual(job.status, ProfileImageUploadJob.PENDING)
+            self.assertEqual(job.attempts, 1)
+            self.assertGreater(job.available_at, timezone.now())
+            self.assertEqual(self._process(), [])
+
+            ProfileImageUploadJob.objects.update(
+                available_at=timezone.now() - timedelta(seconds=1))
+            self._process()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ProfileImageUploadJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.error, 'disk full')
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, self.old_master)
+
+    def test_invalid_upload_is_not_retried(self):
+        job = self._enqueue(content=b'not an image' * 10_000)
+
+        self._process()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ProfileImageUploadJob.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertFalse(self._exists(job.upload))
+
+    def test_depth(self):
+        self._enqueue()
+
+        depth = self.queue.depth()
+
+        self.assertEqual(depth['pending'], 1)
+        self.assertEqual(depth['running'], 0)
+        self.assertIsNotNone(depth['oldest_pending_age'])
+        self._process()
+        self.assertEqual(self.queue.depth()['done'], 1)
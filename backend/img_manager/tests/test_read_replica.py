@@ -0,0 +1,148 @@
+"""
+This file contains tests for read-only maintenance scans on a read replica.
+
+The TestReadReplica class inherits from `django.test.TestCase` and uses a
+second SQLite database opened as the 'replica' alias, with different data
+than the primary, to test:
+
+* `PrimaryReplicaRouter` writing instances loaded from the replica to
+  the primary
+* `ProfileImageIntegrityChecker` scanning users on the given alias
+* `ImageNameDecoder` and the report generator reading users from it
+* `MissingProfileImageProcessor` updating users on the primary, unless
+  their images changed since the scan
+"""
+
+from pathlib import Path
+import tempfile
+
+from django.db import connections
+from django.db.utils import load_backend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from users.models.custom_user import CustomUser
+from img_manager.core.processors.base64_processor import ImageNameProcessor
+from img_manager.services.name_decoder import ImageNameDecoder
+from img_manager.services.profile_images.fill_missing import \
+    MissingProfileImageProcessor
+from img_manager.services.profile_images.generate_report import \
+    ProfileImageReportGenerator
+from img_manager.services.profile_images.integrity_check import \
+    ProfileImageIntegrityChecker
+from img_manager.services.profile_images.repair import DEFAULT, RepairResult
+
+REPLICA = 'replica'
+ROUTERS = [
+    'backend.shared_utils.database.primary_replica_router.PrimaryReplicaRouter'
+]
+
+
+@override_settings(DATABASE_ROUTERS=ROUTERS)
+class TestReadReplica(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.root / 'media'),
+            BASE_DIR=self.root,
+            PROFILE_IMAGE_THUMBNAIL_PACK=False,
+        )
+        self._settings.enable()
+        self._add_replica(self.root / 'replica.sqlite3')
+
+        self.user = CustomUser.objects.create(
+            email="anna@example.com", username="anna",
+            profile_image='master.jpg', profile_image_thumbnail='thumb.jpg',
+        )
+        # The replica lags behind: the thumbnail is not replicated yet
+        CustomUser(
+            pk=self.user.pk, email="anna@example.com", username="anna-old",
+            profile_image='master.jpg', profile_image_thumbnail='',
+            last_login=timezone.now(),
+        ).save(using=REPLICA)
+
+    def tearDown(self):
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _add_replica(self, path: Path) -> None:
+        """
+        Open a second SQLite database as REPLICA and create the user table.
+
+        The connection is created directly (not in DATABASES), which Django
+        tests allow without creating a test database for it.
+        """
+        settings_dict = connections.configure_settings({
+            'default': connections.settings['default'],
+            REPLICA: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path)},
+        })[REPLICA]
+        backend = load_backend(settings_dict['ENGINE'])
+        connections[REPLICA] = backend.DatabaseWrapper(settings_dict, REPLICA)
+        with connections[REPLICA].schema_editor() as editor:
+            editor.create_model(CustomUser)
+
+    def test_writes_go_to_primary(self):
+        user = CustomUser.objects.using(REPLICA).get(pk=self.user.pk)
+        user.first_name = "Anna"
+        user.save()
+
+        self.assertEqual(CustomUser.objects.get(pk=self.user.pk).first_name,
+                         "Anna")
+        self.assertEqual(
+            CustomUser.objects.using(REPLICA).get(pk=self.user.pk).first_name,
+            "")
+
+    def test_checker_scans_replica(self):
+        primary = ProfileImageIntegrityChecker(using='default')
+        replica = ProfileImageIntegrityChecker(using=REPLICA)
+
+        self.assertEqual(primary.users_missing_images, [])
+        self.assertEqual([user['username'] for user in
+                          replica.users_missing_images], ['anna-old'])
+        self.assertEqual(replica.users_count, 1)
+
+    def test_decoder_reads_replica(self):
+        name = ImageNameProcessor.encode_many(
+            [{"app_id": 1, "type_id": 0, "user_id": self.user.pk}]).names[0]
+
+        info = ImageNameDecoder.decode(name, using=REPLICA)
+        self.assertIn("- Username: anna-old", info)
+
+        report = ProfileImageReportGenerator(
+            1, [], [name], [], using=REPLICA
+        )._generate_unassigned_files_report('master')
+        self.assertIn("- Username: anna-old", report)
+
+    def _repair_from_replica(self):
+        users = ProfileImageIntegrityChecker(using=REPLICA).users_missing_images
+        processor = MissingProfileImageProcessor(users, [])
+        return processor._apply_results([RepairResult(
+            self.user.pk, 'anna-old', DEFAULT,
+            profile_image='new-master.jpg',
+            profile_image_thumbnail='new-thumb.jpg',
+        )])
+
+    def test_repair_updates_primary(self):
+        CustomUser.objects.filter(pk=self.user.pk).update(
+            profile_image_thumbnail='')
+
+        self.assertEqual(self._repair_from_replica(), [])
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, 'new-master.jpg')
+        self.assertEqual(CustomUser.objects.using(REPLICA).get(
+            pk=self.user.pk).profile_image_thumbnail.name, '')
+
+    def test_repair_skips_users_changed_on_primary(self):
+        # The primary already has the thumbnail the replica is missing
+        skipped = self._repair_from_replica()
+
+        self.assertEqual([result.user_id for result in skipped],
+                         [self.user.pk])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_image.name, 'master.jpg')
+        self.assertEqual(self.user.profile_image_thumbnail.name, 'thumb.jpg')
@@ -0,0 +1,114 @@
+"""
+This file contains tests for the repair of missing profile images.
+
+The TestRepairProfileImages class inherits from
+`django.test.TransactionTestCase` (worker processes require committed
+data and may close DB connections) and tests
+`MissingProfileImageProcessor.process_users`:
+
+* thumbnail regenerated from an existing master
+* master assigned from the newest unassigned master
+* default images copied when nothing else is available
+* the same results with a process pool
+"""
+
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+from django.test import TransactionTestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.services.profile_images.fill_missing import \
+    MissingProfileImageProcessor
+
+
+class TestRepairProfileImages(TransactionTestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(root / 'media'), STATIC_ROOT=str(root / 'static')
+        )
+        self._settings.enable()
+
+        self.paths = ProfileImagePaths()
+        for img_type in ('master', 'thumbnail'):
+            default = root / 'static' / self.paths.get_default_image_path(img_type)
+            self._save_image(default)
+        self.handler = PathHandlerLocal()
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _save_image(self, path, size=(400, 300)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.new('RGB', size, 'red').save(path, format='JPEG')
+
+    def _create_master(self, user_id):
+        relative_path = self.handler.create_new_relative('master', user_id)
+        self._save_image(self.handler.get_absolute_media(relative_path))
+        return relative_path
+
+    def _create_user(self, username, master='', thumbnail=''):
+        return CustomUser.objects.create(
+            email=f"{username}@example.com", username=username,
+            profile_image=master, profile_image_thumbnail=thumbnail,
+        )
+
+    def _users_missing_images(self):
+        return list(CustomUser.objects.order_by('id').values(
+            'id', 'username', 'profile_image', 'profile_image_thumbnail'
+        ))
+
+    def _process(self, unassigned_masters, workers):
+        processor = MissingProfileImageProcessor(
+            self._users_missing_images(), unassigned_masters, workers
+        )
+        report = processor.process_users()
+        return processor, report
+
+    def _assert_repaired(self, processor, report):
+        self.assertTrue(all(result.ok for result in processor.results), report)
+        self.assertIn("Repaired: 3, failed: 0", report)
+        for user in CustomUser.objects.all():
+            for field in (user.profile_image, user.profile_image_thumbnail):
+                self.assertTrue(field.name)
+                self.assertTrue(Path(field.path).exists())
+            self.assertEqual(user.backup_data['profile_image'],
+                             user.profile_image.name)
+            self.assertIsNotNone(user.profile_image_changed)
+
+    def _create_users(self):
+        anna = self._create_user('anna')
+        anna.profile_image = str(self._create_master(anna.id))
+        anna.save()
+        bob = self._create_user('bob')
+        orphan = self._create_master(bob.id)
+        self._create_user('cyril')
+        return bob, orphan
+
+    def test_repair(self):
+        bob, orphan = self._create_users()
+
+        processor, report = self._process([orphan.name], workers=1)
+
+        self._assert_repaired(processor, report)
+        bob.refresh_from_db()
+        self.assertEqual(bob.profile_image.name, str(orphan))
+        actions = {result.username: result.action
+                   for result in processor.results}
+        self.assertEqual(actions, {
+            'anna': 'thumbnail', 'bob': 'master', 'cyril': 'default'
+        })
+
+    def test_repair_with_process_pool(self):
+        _, orphan = self._create_users()
+
+        processor, report = self._process([orphan.name], workers=2)
+
+        self._assert_repaired(processor, report)
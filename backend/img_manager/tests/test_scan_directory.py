@@ -0,0 +1,108 @@
+"""
+This file contains tests for the streaming directory scanner.
+
+The TestScanFilesInDirectory class inherits from `unittest.TestCase`
+and implements individual tests for `scan_files_in_directory`:
+
+* batching of file names
+* recursion into sharded subdirectories
+* symbolic links to files
+* sizes, mtimes and subdirectories for storage listings
+* errors for missing directories and plain files
+"""
+
+from pathlib import Path
+import tempfile
+import unittest
+
+from img_manager.exceptions.os_utils_errors import ListFileError
+from img_manager.utils.os.scan_directory import (
+    DirectoryEntry,
+    scan_files_in_directory,
+)
+
+
+class TestScanFilesInDirectory(unittest.TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _create_files(self, directory, count, prefix='img'):
+        directory.mkdir(parents=True, exist_ok=True)
+        names = [f"{prefix}_{index}.jpg" for index in range(count)]
+        for name in names:
+            (directory / name).touch()
+        return names
+
+    def test_batches_respect_batch_size(self):
+        names = self._create_files(self.root, 25)
+
+        batches = list(scan_files_in_directory(self.root, batch_size=10))
+
+        self.assertEqual([len(batch) for batch in batches], [10, 10, 5])
+        self.assertCountEqual(
+            [name for batch in batches for name in batch], names
+        )
+
+    def test_recursive_scan_of_shards(self):
+        names = self._create_files(self.root, 3, 'root')
+        names += self._create_files(self.root / 'ab' / 'cd', 4, 'shard')
+
+        found = [name for batch in scan_files_in_directory(self.root)
+                 for name in batch]
+
+        self.assertCountEqual(found, names)
+
+    def test_non_recursive_scan_skips_subdirectories(self):
+        names = self._create_files(self.root, 2, 'root')
+        self._create_files(self.root / 'ab', 2, 'shard')
+
+        found = [name for batch in scan_files_in_directory(
+            self.root, recursive=False) for name in batch]
+
+        self.assertCountEqual(found, names)
+
+    def test_symlinked_files_are_listed(self):
+        target = self._create_files(self.root / 'originals', 1)[0]
+        (self.root / 'link.jpg').symlink_to(self.root / 'originals' / target)
+        (self.root / 'shards').symlink_to(self.root / 'originals')
+
+        found = [name for batch in scan_files_in_directory(
+            self.root, recursive=False) for name in batch]
+
+        self.assertEqual(found, ['link.jpg'])
+
+    def test_stat_and_directories(self):
+        (self.root / 'a.jpg').write_bytes(b'abc')
+        self._create_files(self.root / 'ab', 2, 'shard')
+        mtime_ns = (self.root / 'a.jpg').stat().st_mtime_ns
+
+        found = [entry for batch in scan_files_in_directory(
+            self.root, recursive=False, with_stat=True, directories=True)
+            for entry in batch]
+
+        self.assertCountEqual(found, [
+            DirectoryEntry('a.jpg', 3, mtime_ns),
+            DirectoryEntry('ab/', None, None),
+        ])
+
+    def test_empty_directory_yields_nothing(self):
+        self.assertEqual(list(scan_files_in_directory(self.root)), [])
+
+    def test_missing_directory_raises(self):
+        with self.assertRaises(ListFileError):
+            list(scan_files_in_directory(self.root / 'missing'))
+
+    def test_file_path_raises(self):
+        file_path = self.root / 'file.jpg'
+        file_path.touch()
+        with self.assertRaises(ListFileError):
+            list(scan_files_in_directory(file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
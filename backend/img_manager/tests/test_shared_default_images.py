@@ -0,0 +1,97 @@
+"""
+This file contains tests for the shared default profile images.
+
+The TestSharedDefaultImages class inherits from `django.test.TestCase`
+and tests:
+
+* one shared file for all new users, without file I/O after the first one
+* manifest skipping users with shared defaults
+* removal of extra files never deleting the shared defaults
+"""
+
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers import path_handler_local
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.processors.default_images_processor import \
+    DefaultImageProcessor
+from img_manager.services.profile_images.manifest import ProfileImageManifest
+from img_manager.services.profile_images.remove_extra import \
+    ExtraProfileImageProcessor
+
+
+class TestSharedDefaultImages(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.root / 'media'),
+            STATIC_ROOT=str(self.root / 'static'),
+        )
+        self._settings.enable()
+        path_handler_local._load_shared_default.cache_clear()
+        path_handler_local._installed_shared_defaults.clear()
+
+        self.paths = ProfileImagePaths()
+        self.sources = {}
+        for img_type in ('master', 'thumbnail'):
+            source = self.root / 'static' / self.paths.get_default_image_path(img_type)
+            source.parent.mkdir(parents=True, exist_ok=True)
+            Image.new('RGB', (64, 64), 'gray').save(source, format='JPEG')
+            self.sources[img_type] = source
+        self.handler = PathHandlerLocal()
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def _create_user(self, username):
+        user = CustomUser.objects.create(
+            email=f"{username}@example.com", username=username,
+            profile_image='', profile_image_thumbnail='',
+        )
+        DefaultImageProcessor(self.handler, user).set_default_images()
+        user.save()
+        return user
+
+    def test_users_share_one_file(self):
+        anna = self._create_user('anna')
+        # Later registrations do not read the static files any more
+        for source in self.sources.values():
+            source.unlink()
+        bob = self._create_user('bob')
+
+        self.assertEqual(anna.profile_image.name, bob.profile_image.name)
+        self.assertTrue(self.paths.is_shared_default(anna.profile_image.name))
+        self.assertTrue(self.paths.is_shared_default(
+            anna.profile_image_thumbnail.name))
+        shared = self.root / 'media' / self.paths.get_shared_defaults_rel_path()
+        self.assertEqual(len(list(shared.iterdir())), 2)
+
+    def test_manifest_skips_shared_defaults(self):
+        self._create_user('anna')
+
+        manifest = ProfileImageManifest()
+        manifest.sync(full=True)
+
+        for img_type in ProfileImageManifest.IMAGE_FIELDS:
+            self.assertEqual(manifest.missing_names(img_type), [])
+            self.assertEqual(manifest.unassigned_names(img_type), [])
+
+    def test_remove_extra_keeps_shared_defaults(self):
+        anna = self._create_user('anna')
+        shared_name = Path(anna.profile_image.name).name
+        names = [f"../{self.paths.SHARED_DEFAULTS_DIR}/{shared_name}"]
+
+        processor = ExtraProfileImageProcessor(names, [])
+        report = processor.remove_files('all')
+
+        self.assertIn('Protected (shared default)', report)
+        self.assertTrue(Path(anna.profile_image.path).exists())
@@ -0,0 +1,162 @@
+"""
+This file contains tests for the packed storage of thumbnails.
+
+The TestThumbnailPack class inherits from `django.test.TestCase`
+and tests `PackStore`, `PathHandlerThumbnailPack` and their maintenance:
+
+* put/get/delete, segment rollover and reads through mmap
+* segment data synced to disk before the index points at it
+* changes of one store instance seen by another one (another process)
+* thumbnails routed into the pack, other images into the base handler
+* listings including the packed thumbnails
+* moves of packed thumbnails within the pack
+* compaction keeping only thumbnails referenced by users
+* the manifest enumerating the pack index instead of a directory
+"""
+
+from pathlib import Path
+from unittest import mock
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from img_manager.core.path_handlers.path_handler_local import PathHandlerLocal
+from img_manager.core.path_handlers.path_handler_thumbnail_pack import \
+    PathHandlerThumbnailPack
+from img_manager.services.profile_images.manifest import ProfileImageManifest
+from img_manager.services.profile_images.thumbnail_pack import \
+    ThumbnailPackMaintenance
+from img_manager.utils.os.pack_store import PackStore
+
+
+class TestThumbnailPack(TestCase):
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(MEDIA_ROOT=str(self.root / 'media'))
+        self._settings.enable()
+        self.pack = PackStore(self.root / 'pack', segment_size=100)
+        self.handler = PathHandlerThumbnailPack(PathHandlerLocal(), self.pack)
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def test_put_get_delete(self):
+        self.pack.put('a', b'x' * 60)
+        self.pack.put('b', b'y' * 60)
+        self.pack.put('a', b'z' * 10)
+
+        self.assertEqual(self.pack.get('a'), b'z' * 10)
+        self.assertIsInstance(self.pack.view('b'), memoryview)
+        self.assertEqual(self.pack.view('b').tobytes(), b'y' * 60)
+        self.assertEqual(len(list((self.root / 'pack').glob('segment-*'))), 2)
+        self.assertTrue(self.pack.delete('a'))
+        self.assertFalse(self.pack.delete('a'))
+        with self.assertRaises(FileNotFoundError):
+            self.pack.get('a')
+
+    def test_segment_synced_before_index(self):
+        calls = []
+        append_index = self.pack._append_index
+
+        def record_append(records):
+            calls.append('index')
+            append_index(records)
+
+        with mock.patch('img_manager.utils.os.pack_store.os.fsync',
+                        side_effect=lambda fd: calls.append('fsync')), \
+                mock.patch.object(self.pack, '_append_index',
+                                  side_effect=record_append):
+            self.pack.put_many({'a': b'x' * 60, 'b': b'y' * 60})
+
+        self.assertEqual(calls, ['fsync', 'fsync', 'index'])
+        self.assertEqual(self.pack.get('b'), b'y' * 60)
+
+    def test_changes_seen_by_other_instance(self):
+        other = PackStore(self.root / 'pack')
+        self.pack.put('a', b'one')
+        self.assertEqual(other.get('a'), b'one')
+
+        self.pack.delete('a')
+        self.pack.put('b', b'two')
+        self.pack.compact(lambda name, entry: True)
+
+        self.assertFalse(other.exists('a'))
+        self.assertEqual(other.get('b'), b'two')
+
+    def test_handler_routes_thumbnails(self):
+        thumbnail = self.handler.create_new_relative('thumbnail', 7)
+        master = self.handler.create_new_relative('master', 7)
+
+        self.handler.put_many({thumbnail: b'thumb', master: b'master'})
+
+        self.assertEqual(self.pack.names(), [thumbnail.name])
+        self.assertEqual(self.handler.get(thumbnail), b'thumb')
+        self.assertTrue(self.handler.get_absolute_media(master).is_file())
+        self.assertFalse(self.handler.get_absolute_media(thumbnail).exists())
+        self.assertEqual(self.handler.list_prefix('users/'),
+                         sorted([thumbnail.as_posix(), master.as_posix()]))
+
+    def test_scan_lists_packed_thumbnails(self):
+        master = self.handler.create_new_relative('master', 7)
+        self.handler.put(master, b'master')
+        self.pack.put('packed', b'thumb')
+        thumbnails = self.handler.thumbnail_prefix
+
+        self.assertEqual(
+            [(key, size) for key, size, _ in self.handler.scan(thumbnails)],
+            [(f'{thumbnails}packed', 5)])
+        self.assertEqual(
+            [key for key, _, _ in self.handler.scan(
+                master.parent.as_posix() + '/')],
+            [master.as_posix()])
+
+    def test_move_keeps_packed_thumbnail(self):
+        thumbnail = self.handler.create_new_relative('thumbnail', 7)
+        flat = self.handler.thumbnail_prefix + thumbnail.name
+        self.handler.put(flat, b'thumb')
+
+        self.handler.move(flat, thumbnail)
+
+        self.assertEqual(self.handler.get(thumbnail), b'thumb')
+        self.assertFalse(self.handler.get_absolute_media(thumbnail).exists())
+
+    def test_compaction(self):
+        assigned = self.handler.create_new_relative('thumbnail', 1)
+        self.handler.put(assigned, b'a' * 50)
+        self.pack.put('orphan', b'o' * 50)
+        self.pack.put(assigned.name, b'b' * 50)
+        CustomUser.objects.create(email='anna@example.com', username='anna',
+                                  profile_image_thumbnail=str(assigned))
+
+        maintenance = ThumbnailPackMaintenance(self.pack, grace=-10)
+        maintenance.compact()
+
+        self.assertEqual(maintenance.stats['kept'], 1)
+        self.assertEqual(maintenance.stats['dropped'], 1)
+        self.assertEqual(self.pack.names(), [assigned.name])
+        self.assertEqual(self.pack.get(assigned.name), b'b' * 50)
+        self.assertEqual(len(list((self.root / 'pack').glob('segment-*'))), 1)
+
+    def test_manifest_enumerates_pack(self):
+        assigned = self.handler.create_new_relative('thumbnail', 1)
+        self.handler.put(assigned, b'thumb')
+        self.pack.put('orphan', b'orphan')
+        CustomUser.objects.create(email='anna@example.com', username='anna',
+                                  profile_image_thumbnail=str(assigned))
+
+        manifest = ProfileImageManifest(pack=self.pack)
+        manifest.sync()
+
+        self.assertEqual(manifest.unassigned_names('thumbnail'), ['orphan'])
+        self.assertEqual(manifest.missing_names('thumbnail'), [])
+
+        self.pack.delete('orphan')
+        manifest = ProfileImageManifest(pack=self.pack)
+        manifest.sync()
+
+        self.assertEqual(manifest.unassigned_names('thumbnail'), [])
+        self.assertEqual(manifest.stats['scanned_directories'], 1)
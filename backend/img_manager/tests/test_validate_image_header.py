@@ -0,0 +1,87 @@
+"""
+This file contains tests for the header-only validation of uploaded images.
+
+The TestValidateImageHeader class inherits from `unittest.TestCase`
+and tests `validate_image_header`:
+
+* format and declared size of valid images
+* unknown and not allowed formats
+* images above the pixel budget or the decompression bomb limit,
+  rejected without decoding
+* truncated headers
+"""
+
+from io import BytesIO
+import struct
+import unittest
+import zlib
+
+from PIL import Image
+from django.core.exceptions import ValidationError
+
+from img_manager.utils.pil.validate_image_header import validate_image_header
+
+FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+
+
+def png_chunk(chunk_type, data=b''):
+    chunk = chunk_type + data
+    return (struct.pack('>I', len(data)) + chunk
+            + struct.pack('>I', zlib.crc32(chunk)))
+
+
+def png_header(width, height):
+    """Return a PNG declaring the given size with no pixel data."""
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + png_chunk(b'IHDR', ihdr)
+            + png_chunk(b'IDAT'))
+
+
+class TestValidateImageHeader(unittest.TestCase):
+
+    def _image(self, size=(120, 80), image_format='JPEG'):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'red').save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    def test_valid_images(self):
+        for image_format in ('JPEG', 'PNG', 'GIF'):
+            result = validate_image_header(
+                self._image(image_format=image_format), FORMATS)
+            self.assertEqual(result, (image_format, (120, 80)))
+
+    def test_stream_is_rewound(self):
+        stream = BytesIO(self._image())
+        stream.seek(0)
+
+        validate_image_header(stream, FORMATS)
+
+        self.assertEqual(stream.tell(), 0)
+
+    def test_unknown_or_not_allowed_format(self):
+        with self.assertRaises(ValidationError):
+            validate_image_header(b'<html>' * 100, FORMATS)
+        with self.assertRaises(ValidationError):
+            validate_image_header(self._image(image_format='PNG'), ('JPEG',))
+
+    def test_pixel_budget(self):
+        header = png_header(20_000, 20_000)
+
+        with self.assertRaises(ValidationError):
+            validate_image_header(header, FORMATS, max_pixels=64_000_000)
+        self.assertEqual(
+            validate_image_header(png_header(4000, 3000), FORMATS,
+                                  max_pixels=64_000_000),
+            ('PNG', (4000, 3000)))
+
+    def test_decompression_bomb_limit(self):
+        with self.assertRaises(ValidationError):
+            validate_image_header(png_header(100_000, 100_000), FORMATS)
+
+    def test_truncated_header(self):
+        with self.assertRaises(ValidationError):
+            validate_image_header(self._image()[:20], FORMATS)
+
+
+if __name__ == '__main__':
+    unittest.main()
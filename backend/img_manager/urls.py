@@ -0,0 +1,13 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path('lookup/', views.avatar_lookup_view, name='avatar_lookup'),
+    path('id/<int:user_id>/<str:img_type>/<str:name>/',
+         views.avatar_versioned_view, name='avatar_versioned'),
+    path('id/<int:user_id>/<str:img_type>/', views.avatar_view,
+         name='avatar'),
+    path('<slug:slug>/<str:img_type>/', views.avatar_view,
+         name='avatar_by_slug'),
+]
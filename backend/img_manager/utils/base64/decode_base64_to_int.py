@@ -1,12 +1,13 @@
 from typing import Any
 import base64
 
-from users.models.services.utils.log_method import log_method
-from users.models.services.utils.is_debug_mode import is_debug_mode
-from .base64_utils_errors import (
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.is_debug_mode import is_debug_mode
+from img_manager.exceptions.base64_utils_errors import (
     ExpectedStringError,
+    EmptyStringError,
     NegativeIntegerOutputError,
-    InvalidBase64StringError,
+    DecodeBase64ToStringError,
 )
 
 @log_method
@@ -44,6 +45,6 @@ def decode_base64_to_int(base64_string: str) -> int:
 
         return decoded_int
     except (base64.binascii.Error, TypeError, ValueError) as e:
-        raise DecodeBase64ToStringError(base64_string) from e
+        raise DecodeBase64ToStringError(base64_string, e) from e
 
 
@@ -1,12 +1,13 @@
 from typing import Any
 import base64
 
-from users.models.services.utils.log_method import log_method
-from users.models.services.utils.is_debug_mode import is_debug_mode
-from .base64_utils_errors import (
+from backend.shared_utils.decorators.log_method import log_method
+from backend.shared_utils.environment.is_debug_mode import is_debug_mode
+from img_manager.exceptions.base64_utils_errors import (
     ExpectedIntegerError,
     ExpectedPositiveIntegerError,
     EmptyOutputError,
+    EncodeIntToBase64Error,
 )
 
 @log_method
@@ -46,7 +47,7 @@ def encode_int_to_base64(integer: int) -> str:
         return base64_str
 
     except (OverflowError, TypeError, ValueError) as e:
-        raise EncodeIntToBase64Error(integer) from e
+        raise EncodeIntToBase64Error(integer, e) from e
 
 
 
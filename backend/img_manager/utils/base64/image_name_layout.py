@@ -0,0 +1,192 @@
+"""
+Binary layout of profile image names.
+
+Version 1 of the layout packs the name fields at fixed byte offsets:
+
+    offset  size  field
+    0       1     marker (always 0x00)
+    1       1     layout version (1)
+    2       1     app_id
+    3       1     type_id
+    4       5     timestamp (unsigned, big-endian)
+    9       1-10  user_id (unsigned LEB128 varint)
+
+The bytes are encoded with URL-safe base64 without padding. The 9-byte header
+is a multiple of 3 bytes, so it always maps to the same 12 leading characters
+for the same app, type and timestamp and names can be indexed by prefix.
+
+Legacy names are the base64 form of the big-endian integer built from the
+decimal concatenation of app_id, type_id, timestamp and user_id. Their first
+byte is never 0x00 (minimal integer encoding), which is what the marker byte
+relies on to tell both formats apart.
+"""
+from typing import Tuple
+import base64
+import struct
+
+from img_manager.exceptions.image_name_layout_errors import (
+    FieldOutOfRangeError,
+    UnsupportedLayoutVersionError,
+    TruncatedImageNameError,
+)
+
+LAYOUT_MARKER = 0x00
+LAYOUT_VERSION = 1
+
+# marker, version, app_id, type_id, timestamp high byte, timestamp low 4 bytes
+HEADER = struct.Struct('>BBBBBI')
+HEADER_SIZE = HEADER.size
+HEADER_NAME_LENGTH = HEADER_SIZE * 4 // 3
+
+MAX_TIMESTAMP = 2 ** 40 - 1
+# User IDs are BigAutoField primary keys (signed 64-bit).
+MAX_USER_ID = 2 ** 63 - 1
+
+_PADDING = ('', '===', '==', '=')
+
+
+def encode_varint(value: int) -> bytes:
+    """
+    Encode a non-negative integer as an unsigned LEB128 varint.
+
+    Args:
+        value (int): The integer to encode.
+
+    Returns:
+        bytes: 1 byte per started 7 bits of the value.
+    """
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varint(data: bytes, offset: int) -> int:
+    """
+    Decode an unsigned LEB128 varint that ends the given data.
+
+    Args:
+        data (bytes): Data containing the varint.
+        offset (int): Position of the first varint byte.
+
+    Returns:
+        int: The decoded integer.
+
+    Raises:
+        TruncatedImageNameError: If the varint is missing or not terminated,
+            or if bytes follow its last byte.
+    """
+    value = 0
+    shift = 0
+    for position in range(offset, len(data)):
+        byte = data[position]
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            if position != len(data) - 1:
+                break
+            return value
+        shift += 7
+    raise TruncatedImageNameError(len(data))
+
+
+def pack_image_name(app_id: int, type_id: int,
+                    timestamp: int, user_id: int) -> bytes:
+    """
+    Pack the image name fields into the version 1 binary layout.
+
+    Args:
+        app_id (int): Application ID (0-255).
+        type_id (int): Image type ID (0-255).
+        timestamp (int): Creation timestamp (0 - 2**40-1).
+        user_id (int): User ID (0 - 2**63-1).
+
+    Returns:
+        bytes: The packed name.
+
+    Raises:
+        FieldOutOfRangeError: If a field does not fit into the layout.
+    """
+    for field_name, value, max_value in (
+        ('app_id', app_id, 0xFF),
+        ('type_id', type_id, 0xFF),
+        ('timestamp', timestamp, MAX_TIMESTAMP),
+        ('user_id', user_id, MAX_USER_ID),
+    ):
+        if not 0 <= value <= max_value:
+            raise FieldOutOfRangeError(field_name, value, max_value)
+
+    return HEADER.pack(
+        LAYOUT_MARKER, LAYOUT_VERSION, app_id, type_id,
+        timestamp >> 32, timestamp & 0xFFFFFFFF
+    ) + encode_varint(user_id)
+
+
+def unpack_image_name(data: bytes) -> Tuple[int, int, int, int]:
+    """
+    Unpack image name fields from the binary layout.
+
+    Args:
+        data (bytes): Packed name starting with the layout marker.
+
+    Returns:
+        Tuple[int, int, int, int]: app_id, type_id, timestamp and user_id.
+
+    Raises:
+        TruncatedImageNameError: If the data is shorter than the layout.
+        UnsupportedLayoutVersionError: If the layout version is unknown.
+    """
+    if len(data) <= HEADER_SIZE:
+        raise TruncatedImageNameError(len(data))
+
+    _, version, app_id, type_id, ts_high, ts_low = HEADER.unpack_from(data)
+    if version != LAYOUT_VERSION:
+        raise UnsupportedLayoutVersionError(version)
+
+    user_id = decode_varint(data, HEADER_SIZE)
+    return app_id, type_id, (ts_high << 32) | ts_low, user_id
+
+
+def is_binary_layout(data: bytes) -> bool:
+    """
+    Check whether decoded name bytes use the binary layout.
+
+    Args:
+        data (bytes): Name bytes decoded from base64.
+
+    Returns:
+        bool: True for the binary layout, False for a legacy name.
+    """
+    return bool(data) and data[0] == LAYOUT_MARKER
+
+
+def name_to_bytes(base64_name: str) -> bytes:
+    """
+    Decode a URL-safe base64 name without padding into bytes.
+
+    Args:
+        base64_name (str): Base64 encoded image name.
+
+    Returns:
+        bytes: The decoded bytes.
+
+    Raises:
+        binascii.Error: If the name is not valid base64.
+    """
+    return base64.urlsafe_b64decode(
+        base64_name + _PADDING[len(base64_name) & 3]
+    )
+
+
+def bytes_to_name(data: bytes) -> str:
+    """
+    Encode bytes into a URL-safe base64 name without padding.
+
+    Args:
+        data (bytes): Bytes to encode.
+
+    Returns:
+        str: Base64 encoded image name.
+    """
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
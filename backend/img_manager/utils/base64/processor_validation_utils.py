@@ -1,6 +1,7 @@
 from datetime import datetime
 
-from .processor_errors import (
+from backend.shared_utils.decorators.log_method import log_method
+from img_manager.exceptions.base64_validation_errors import (
     ExpectedIntegerError,
     InvalidAppIDError,
     InvalidSizeIDError,
@@ -73,4 +74,4 @@ def validate_timestamp(timestamp: int) -> None:
     try:
         datetime.utcfromtimestamp(timestamp)
     except (OSError, OverflowError, TypeError, ValueError) as e:
-        raise InvalidTimestampError(timestamp) from e
\ No newline at end of file
+        raise InvalidTimestampError(timestamp, e) from e
\ No newline at end of file
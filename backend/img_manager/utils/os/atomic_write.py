@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+from django.conf import settings
+
+
+def file_permissions() -> int:
+    """
+    Vrátí práva nově zapsaného souboru.
+
+    Použije se ``FILE_UPLOAD_PERMISSIONS``; pokud není nastaveno, práva
+    jako u běžně vytvořeného souboru (``0o666`` bez bitů z umask).
+    """
+    if settings.FILE_UPLOAD_PERMISSIONS is not None:
+        return settings.FILE_UPLOAD_PERMISSIONS
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def write_file_atomic(file_path, data: bytes) -> None:
+    """
+    Zapíše soubor atomicky.
+
+    Data se zapíší do dočasného souboru ve stejné složce a ten se pak
+    přejmenuje na cílovou cestu (``os.replace``), takže ostatní procesy
+    nikdy neuvidí rozepsaný soubor. Cílová složka je vytvořena, pokud
+    neexistuje. ``mkstemp`` vytváří soubor s právy 0600; před přejmenováním
+    se mu proto nastaví práva podle ``file_permissions``, aby soubor mohl
+    číst např. webový server běžící pod jiným uživatelem.
+
+    Args:
+        file_path: Absolutní cesta k zapisovanému souboru.
+        data: Obsah souboru.
+
+    Raises:
+        OSError: Pokud se soubor nepodaří zapsat (dočasný soubor je smazán).
+    """
+    directory = os.path.dirname(file_path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            os.fchmod(f.fileno(), file_permissions())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
@@ -1,11 +1,15 @@
 from pathlib import Path
-import os
 from typing import List
 
+from .scan_directory import scan_files_in_directory
+
 def list_files_in_directory(directory_path: Path) -> List[str]:
     """
     Retrieves a list of file names in the specified directory.
 
+    Only the directory itself is listed, subdirectories are skipped. Use
+    ``scan_files_in_directory`` to process large directories in batches.
+
     Args:
         directory_path (Path): The path to the directory.
 
@@ -13,39 +17,11 @@ def list_files_in_directory(directory_path: Path) -> List[str]:
         List[str]: A list of file names (including extensions) in the directory.
 
     Raises:
-        FileNotFoundError: If the specified path does not exist.
-        NotADirectoryError: If the specified path is a file, not a directory.
-        PermissionError: If there are insufficient permissions to access the directory.
-        OSError: For other issues with accessing files or the directory.
+        ListFileError: If the specified path does not exist, is a file, or
+            there are insufficient permissions to access the directory.
     """
-    try:
-
-        all_items = os.listdir(directory_path)
-        files = [
-            item for item in all_items
-            if (directory_path / item).is_file()
-        ]
-        return files
-
-    except FileNotFoundError:
-        text = "Error: The specified path was not found."
-        raise ListFileError(directory_path, text)
-    except NotADirectoryError:
-        text = "Error: The specified path refers to a file, not a directory."
-        raise ListFileError(directory_path, text)
-    except PermissionError:
-        text = "Error: Insufficient permissions to access the directory or files."
-        raise ListFileError(directory_path, text)
-    except OSError:
-        text = "Error: Problem accessing files or the directory."
-        raise ListFileError(directory_path, text)
-
-class UtilityError(Exception):
-    """Obecná výjimka pro chyby týkající se obrázků."""
-    pass
-
-class ListFileError(UtilityError):
-    """Výjimka pro neznámý typ obrázku."""
-    self.directory_path = directory_path
-    self.text = text
-    super().__init__(f"{text} Path: {directory_path}")
\ No newline at end of file
+    return [
+        name
+        for batch in scan_files_in_directory(directory_path, recursive=False)
+        for name in batch
+    ]
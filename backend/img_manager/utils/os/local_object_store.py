@@ -0,0 +1,120 @@
+import os
+from pathlib import Path
+from typing import Iterator, List, Union
+
+from img_manager.exceptions.object_store_errors import InvalidObjectKeyError
+from img_manager.exceptions.os_utils_errors import ListFileError
+from .atomic_write import write_file_atomic
+from .scan_directory import ScanEntry, scan_files_in_directory
+
+# Prefix rozepsaných souborů z write_file_atomic (nejsou to objekty)
+TEMP_PREFIX = '.tmp-'
+
+
+class LocalObjectStore:
+    """
+    Lokální náhrada objektového úložiště (bucketu) nad složkou.
+
+    Nabízí stejné operace jako objektová úložiště: ``put`` (atomický zápis
+    celého objektu), ``get``, ``exists``, ``delete``, ``list`` podle
+    prefixu klíče a ``scan`` (výpis jedné úrovně s oddělovačem '/').
+    Objekt s klíčem ``a/b/c`` je uložen v ``<root>/<bucket>/a/b/c``, takže
+    výpis podle prefixu prochází jen složky, do kterých prefix vede.
+
+    Args:
+        root: Složka s buckety.
+        bucket (str): Jméno bucketu (podsložka ``root``).
+    """
+
+    def __init__(self, root: Union[str, Path], bucket: str):
+        self.location = Path(root) / bucket
+
+    def put(self, key: str, data: bytes) -> None:
+        """Uloží objekt; existující objekt se stejným klíčem přepíše."""
+        write_file_atomic(self.object_path(key), data)
+
+    def get(self, key: str) -> bytes:
+        """
+        Vrátí obsah objektu.
+
+        Raises:
+            FileNotFoundError: Pokud objekt neexistuje.
+        """
+        return self.object_path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self.object_path(key).is_file()
+
+    def delete(self, key: str) -> bool:
+        """Smaže objekt a vrátí True, pokud existoval."""
+        try:
+            self.object_path(key).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def list(self, prefix: str = '') -> List[str]:
+        """
+        Vrátí seřazené klíče objektů začínající prefixem.
+
+        Prefix je řetězec, nemusí končit na hranici složky
+        (``master/3`` najde ``master/3f/...``).
+        """
+        prefix = str(prefix)
+        directory = prefix.rpartition('/')[0]
+        start = self.object_path(directory) if directory else self.location
+        keys = []
+        for dirpath, dirnames, filenames in os.walk(start):
+            relative = os.path.relpath(dirpath, self.location)
+            base = '' if relative == '.' else relative.replace(os.sep, '/') + '/'
+            keys.extend(base + name for name in filenames
+                        if not name.startswith(TEMP_PREFIX)
+                        and (base + name).startswith(prefix))
+            # Do podsložek, které prefixu nemohou odpovídat, se nevstupuje
+            dirnames[:] = [name for name in dirnames
+                           if (base + name + '/').startswith(prefix)
+                           or prefix.startswith(base + name + '/')]
+        return sorted(keys)
+
+    def scan(self, prefix: str = '') -> Iterator[ScanEntry]:
+        """
+        Postupně vrací objekty a "podsložky" přímo pod prefixem.
+
+        Odpovídá výpisu objektového úložiště s oddělovačem '/': do podsložek
+        se nevstupuje, vrátí se jen jejich prefix (klíč končící '/').
+        Složka se čte přes ``scan_files_in_directory`` po dávkách, takže
+        výpis nedrží v paměti ani celou složku. Neexistující prefix je
+        prázdný.
+
+        Args:
+            prefix (str): Prefix "složky" ('' nebo končící '/').
+
+        Yields:
+            ScanEntry: Klíč, velikost a čas změny objektu.
+
+        Raises:
+            OSError: Pokud složku nelze přečíst.
+        """
+        prefix = str(prefix)
+        directory = (self.object_path(prefix.rstrip('/')) if prefix
+                     else self.location)
+        try:
+            for batch in scan_files_in_directory(
+                    directory, recursive=False, with_stat=True,
+                    directories=True):
+                for name, size, mtime_ns in batch:
+                    if not name.startswith(TEMP_PREFIX):
+                        yield ScanEntry(prefix + name, size, mtime_ns)
+        except ListFileError as e:
+            if isinstance(e.__cause__,
+                          (FileNotFoundError, NotADirectoryError)):
+                return
+            raise OSError(str(e)) from e
+
+    def object_path(self, key: str) -> Path:
+        """Převede klíč na cestu k souboru objektu (klíč nesmí opustit bucket)."""
+        key = str(key)
+        parts = key.split('/')
+        if not key or any(part in ('', '.', '..') for part in parts):
+            raise InvalidObjectKeyError(key)
+        return self.location.joinpath(*parts)
@@ -0,0 +1,337 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
+import fcntl
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+INDEX_FILE = 'index'
+LOCK_FILE = 'lock'
+SEGMENT_NAME = 'segment-{:06d}.pack'
+SEGMENT_PATTERN = re.compile(r'segment-(\d{6})\.pack')
+
+# Záznam indexu: segment, offset, délka, čas zápisu (s), délka jména + jméno
+INDEX_ENTRY = struct.Struct('<IQIIH')
+# Délka záznamu, který maže jméno z indexu
+TOMBSTONE = 0xFFFFFFFF
+
+
+class PackEntry(NamedTuple):
+    """Umístění obrázku v segmentu a čas jeho zápisu (v sekundách)."""
+    segment: int
+    offset: int
+    length: int
+    written_at: int
+
+
+class PackStore:
+    """
+    Úložiště malých souborů přidávaných do velkých segmentů.
+
+    Obsah se přidává na konec aktuálního segmentu (``segment-NNNNNN.pack``),
+    dokud nepřekročí ``segment_size``; pak se založí další. Index
+    (``index``) je log záznamů ``jméno -> (segment, offset, délka)``, do
+    kterého se jen přidává; smazání je záznam s délkou ``TOMBSTONE``. Každý
+    proces drží index v paměti a dočítá jen nové záznamy, takže čtení
+    nepotřebuje ``open()`` ani inode na obrázek.
+
+    Čtení jde přes ``mmap`` segmentu: ``view()`` vrací ``memoryview`` bez
+    kopírování dat. Zápisy a kompakce jsou mezi procesy vyloučeny zámkem
+    (``fcntl.flock``), mezi vlákny ``threading.RLock``.
+
+    Místo po smazaných a přepsaných obrázcích uvolní ``compact()``.
+
+    Data segmentu se před zápisem záznamu do indexu uloží na disk
+    (``os.fsync``), takže ani po pádu index neukazuje na nezapsaná data.
+
+    Args:
+        directory: Složka se segmenty a indexem.
+        segment_size (int): Velikost, po jejímž překročení se založí nový
+            segment.
+    """
+
+    SEGMENT_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, directory: Union[str, Path], segment_size: int = None):
+        self.directory = Path(directory)
+        self.segment_size = segment_size or self.SEGMENT_SIZE
+        self._index: Dict[str, PackEntry] = {}
+        self._index_id: Tuple[int, int] = None
+        self._index_pos = 0
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.RLock()
+        self._lock_file = None
+
+    # Čtení
+
+    def view(self, name: str) -> memoryview:
+        """
+        Vrátí obsah obrázku jako výřez z namapovaného segmentu (bez kopie).
+
+        Raises:
+            FileNotFoundError: Pokud obrázek v indexu není.
+        """
+        with self._lock:
+            self._refresh()
+            for attempt in range(2):
+                entry = self._index.get(name)
+                if entry is None:
+                    raise FileNotFoundError(f"Pack entry not found: {name}")
+                if not entry.length:
+                    return memoryview(b'')
+                end = entry.offset + entry.length
+                try:
+                    return memoryview(self._map(entry.segment, end))[entry.offset:end]
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+                    # Segment smazala souběžná kompakce; načte se nový index
+                    self._reset()
+                    self._refresh()
+
+    def get(self, name: str) -> bytes:
+        """Vrátí obsah obrázku (kopii výřezu z ``view``)."""
+        return bytes(self.view(name))
+
+    def exists(self, name: str) -> bool:
+        with self._lock:
+            self._refresh()
+            return name in self._index
+
+    def entries(self) -> Dict[str, PackEntry]:
+        """Vrátí kopii indexu (jméno -> ``PackEntry``)."""
+        with self._lock:
+            self._refresh()
+            return dict(self._index)
+
+    def names(self) -> List[str]:
+        """Vrátí seřazená jména všech obrázků."""
+        return sorted(self.entries())
+
+    def index_mtime_ns(self) -> int:
+        """Vrátí čas poslední změny indexu (0, pokud index neexistuje)."""
+        try:
+            return os.stat(self.directory / INDEX_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    # Zápis
+
+    def put(self, name: str, data: bytes) -> None:
+        """Přidá obrázek; obrázek se stejným jménem nahradí."""
+        self.put_many({name: data})
+
+    def put_many(self, files: Dict[str, bytes]) -> None:
+        """Přidá více obrázků pod jedním zámkem a jedním zápisem do indexu."""
+        for name in files:
+            self._validate_name(name)
+        with self._exclusive():
+            written_at = int(time.time())
+            records = []
+            targets = {}
+            try:
+                for name, data in files.items():
+                    segment = self._active_segment(len(data))
+                    f = targets.get(segment)
+                    if f is None:
+                        f = targets[segment] = open(
+                            self._segment_path(segment), 'ab')
+                    offset = f.tell()
+                    f.write(data)
+                    # _active_segment čte velikost segmentu z disku
+                    f.flush()
+                    records.append((name, PackEntry(segment, offset,
+                                                    len(data), written_at)))
+                # Index smí ukázat jen na data, která už jsou na disku
+                for f in targets.values():
+                    os.fsync(f.fileno())
+            finally:
+                for f in targets.values():
+                    f.close()
+            self._append_index(records)
+
+    def delete(self, name: str) -> bool:
+        """Smaže obrázek z indexu a vrátí True, pokud v něm byl."""
+        with self._exclusive():
+            if name not in self._index:
+                return False
+            self._append_index([(name, PackEntry(0, 0, TOMBSTONE, 0))])
+            return True
+
+    def compact(self, keep: Callable[[str, PackEntry], bool],
+                dry_run: bool = False) -> Dict[str, int]:
+        """
+        Přepíše obrázky, pro které ``keep`` vrátí True, do nových segmentů.
+
+        Nové segmenty mají čísla za všemi dosavadními a nový index nahradí
+        starý atomicky (``os.replace``); pak se staré segmenty smažou.
+        Ostatní procesy poznají nový index podle jiného inode a načtou ho
+        znovu. Po dobu kompakce jsou zápisy zablokované.
+
+        Args:
+            keep: Funkce ``(jméno, PackEntry) -> bool``.
+            dry_run (bool): Jen spočítat, nic nezapisovat.
+
+        Returns:
+            Dict[str, int]: Počet ponechaných a vyřazených obrázků a velikost
+                segmentů před a po kompakci v bajtech.
+        """
+        with self._exclusive():
+            old_segments = self._segments()
+            live = sorted(((name, entry) for name, entry in self._index.items()
+                           if keep(name, entry)),
+                          key=lambda item: (item[1].segment, item[1].offset))
+            stats = {
+                'kept': len(live),
+                'dropped': len(self._index) - len(live),
+                'bytes_before': sum(self._segment_path(segment).stat().st_size
+                                    for segment in old_segments),
+                'bytes_after': sum(entry.length for _, entry in live),
+            }
+            if dry_run:
+                return stats
+
+            segment = (old_segments[-1] if old_segments else 0) + 1
+            target = open(self._segment_path(segment), 'wb')
+            records = []
+            try:
+                for name, entry in live:
+                    if target.tell() and target.tell() + entry.length > self.segment_size:
+                        target.close()
+                        segment += 1
+                        target = open(self._segment_path(segment), 'wb')
+                    end = entry.offset + entry.length
+                    offset = target.tell()
+                    if entry.length:
+                        target.write(self._map(entry.segment, end)[entry.offset:end])
+                    records.append((name, entry._replace(segment=segment,
+                                                         offset=offset)))
+                target.flush()
+                os.fsync(target.fileno())
+            finally:
+                target.close()
+
+            temp_index = self.directory / f'{INDEX_FILE}.tmp'
+            with open(temp_index, 'wb') as f:
+                f.write(b''.join(self._encode(name, entry)
+                                 for name, entry in records))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_index, self.directory / INDEX_FILE)
+
+            self._maps.clear()
+            for old in old_segments:
+                self._segment_path(old).unlink()
+            self._reset()
+            self._refresh()
+            return stats
+
+    # Pomocné metody
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """Zamkne úložiště pro zápis a načte nejnovější index."""
+        with self._lock:
+            if self._lock_file is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._lock_file = open(self.directory / LOCK_FILE, 'a+b')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            finally:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Dočte nové záznamy indexu (celý index, pokud byl nahrazen)."""
+        try:
+            stat = os.stat(self.directory / INDEX_FILE)
+        except FileNotFoundError:
+            if self._index_id is not None:
+                self._reset()
+            return
+        index_id = (stat.st_dev, stat.st_ino)
+        if index_id != self._index_id:
+            self._reset()
+            self._index_id = index_id
+        if stat.st_size <= self._index_pos:
+            return
+        with open(self.directory / INDEX_FILE, 'rb') as f:
+            f.seek(self._index_pos)
+            data = f.read(stat.st_size - self._index_pos)
+        self._index_pos += self._apply(data)
+
+    def _reset(self) -> None:
+        self._index = {}
+        self._index_id = None
+        self._index_pos = 0
+        self._maps.clear()
+
+    def _apply(self, data: bytes) -> int:
+        """Použije celé záznamy indexu z ``data`` a vrátí počet přečtených bajtů."""
+        position = 0
+        while position + INDEX_ENTRY.size <= len(data):
+            segment, offset, length, written_at, name_length = \
+                INDEX_ENTRY.unpack_from(data, position)
+            end = position + INDEX_ENTRY.size + name_length
+            if end > len(data):
+                break
+            name = data[position + INDEX_ENTRY.size:end].decode()
+            if length == TOMBSTONE:
+                self._index.pop(name, None)
+            else:
+                self._index[name] = PackEntry(segment, offset, length, written_at)
+            position = end
+        return position
+
+    def _append_index(self, records: Iterable[Tuple[str, PackEntry]]) -> None:
+        """Zapíše záznamy na konec indexu jedním zápisem (drží se zámek)."""
+        data = b''.join(self._encode(name, entry) for name, entry in records)
+        with open(self.directory / INDEX_FILE, 'ab') as f:
+            f.write(data)
+        self._refresh()
+
+    @staticmethod
+    def _encode(name: str, entry: PackEntry) -> bytes:
+        encoded = name.encode()
+        return INDEX_ENTRY.pack(entry.segment, entry.offset, entry.length,
+                                entry.written_at, len(encoded)) + encoded
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """Vrátí mapu segmentu pokrývající alespoň ``end`` bajtů."""
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            with open(self._segment_path(segment), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # Starou mapu uvolní garbage collector, až zaniknou její výřezy
+            self._maps[segment] = mapped
+        return mapped
+
+    def _active_segment(self, size: int) -> int:
+        """Vrátí číslo segmentu, do kterého se přidá obsah dané velikosti."""
+        segments = self._segments()
+        if not segments:
+            return 1
+        last = segments[-1]
+        current = self._segment_path(last).stat().st_size
+        if current and current + size > self.segment_size:
+            return last + 1
+        return last
+
+    def _segments(self) -> List[int]:
+        if not self.directory.exists():
+            return []
+        return sorted(int(match.group(1)) for match in map(
+            SEGMENT_PATTERN.fullmatch, os.listdir(self.directory)) if match)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / SEGMENT_NAME.format(segment)
+
+    @staticmethod
+    def _validate_name(name: str) -> None:
+        if not name or '/' in name or len(name.encode()) > 0xFFFF:
+            raise ValueError(f"Invalid pack entry name: '{name}'")
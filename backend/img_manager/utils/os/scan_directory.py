@@ -0,0 +1,114 @@
+from pathlib import Path
+import os
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from img_manager.exceptions.os_utils_errors import ListFileError
+
+
+class DirectoryEntry(NamedTuple):
+    """
+    One entry of a directory listed with ``with_stat``.
+
+    Subdirectories have a name ending with '/' and no size or mtime.
+    """
+    name: str
+    size: Optional[int]
+    mtime_ns: Optional[int]
+
+
+class ScanEntry(NamedTuple):
+    """
+    One entry of a storage listing (``scan`` of the path handlers).
+
+    ``key`` is the path relative to the storage root; "subdirectories"
+    (common prefixes) have a key ending with '/' and no size or mtime.
+    """
+    key: str
+    size: Optional[int]
+    mtime_ns: Optional[int]
+
+
+def scan_files_in_directory(
+        directory_path: Path,
+        batch_size: int = 1000,
+        recursive: bool = True,
+        with_stat: bool = False,
+        directories: bool = False,
+) -> Iterator[List[Union[str, DirectoryEntry]]]:
+    """
+    Yields names of files in the specified directory in batches.
+
+    The directory is read with ``os.scandir`` and the file type comes from
+    the cached ``DirEntry`` data (``d_type``), so on common filesystems no
+    ``stat`` call is made per file (only symbolic links are resolved, so
+    links to images are listed as before). With ``recursive`` the
+    subdirectories (e.g. shards of a fan-out layout) are scanned too and
+    only the file names, without the subdirectory part, are yielded;
+    symbolic links to directories are not followed.
+
+    With ``with_stat`` every file is yielded as a ``DirectoryEntry`` with
+    its size and mtime (one ``stat`` per file, the data storage listings
+    report); files removed during the scan are skipped. With
+    ``directories`` the subdirectories are yielded too, their names ending
+    with '/'.
+
+    Args:
+        directory_path (Path): The path to the directory.
+        batch_size (int): Maximal number of names in one batch.
+        recursive (bool): Whether to descend into subdirectories.
+        with_stat (bool): Whether to yield ``DirectoryEntry`` items.
+        directories (bool): Whether to yield subdirectories as well.
+
+    Yields:
+        List[str | DirectoryEntry]: File names (including extensions) or
+            entries, at most ``batch_size``.
+
+    Raises:
+        ListFileError: If the directory does not exist, is a file, or
+            cannot be read.
+    """
+    batch: List[Union[str, DirectoryEntry]] = []
+    pending = [os.fspath(directory_path)]
+
+    try:
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        if with_stat:
+                            try:
+                                stat = entry.stat()
+                            except FileNotFoundError:
+                                continue
+                            batch.append(DirectoryEntry(
+                                entry.name, stat.st_size, stat.st_mtime_ns))
+                        else:
+                            batch.append(entry.name)
+                    elif entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                        if not directories:
+                            continue
+                        name = f"{entry.name}/"
+                        batch.append(DirectoryEntry(name, None, None)
+                                     if with_stat else name)
+                    else:
+                        continue
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+        if batch:
+            yield batch
+
+    except FileNotFoundError as e:
+        text = "Error: The specified path was not found."
+        raise ListFileError(directory_path, text) from e
+    except NotADirectoryError as e:
+        text = "Error: The specified path refers to a file, not a directory."
+        raise ListFileError(directory_path, text) from e
+    except PermissionError as e:
+        text = "Error: Insufficient permissions to access the directory or files."
+        raise ListFileError(directory_path, text) from e
+    except OSError as e:
+        text = "Error: Problem accessing files or the directory."
+        raise ListFileError(directory_path, text) from e
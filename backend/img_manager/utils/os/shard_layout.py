@@ -0,0 +1,34 @@
+import hashlib
+from typing import Tuple
+
+# Number of hex characters of the MD5 digest available for shards
+DIGEST_LENGTH = 32
+
+
+def shard_directories(file_name: str, levels: int, width: int) -> Tuple[str, ...]:
+    """
+    Vrátí podsložky rozptýleného (fan-out) uložení souboru.
+
+    Podsložky jsou prefixy hashe jména souboru, takže se soubory
+    rovnoměrně rozloží i u jmen se stejným začátkem (zakódovaná jména
+    obrázků začínají stejnou hlavičkou). Např. pro 2 úrovně po 2 znacích
+    ``('3f', 'a0')``.
+
+    Args:
+        file_name: Jméno souboru (bez cesty).
+        levels: Počet úrovní podsložek (0 = bez podsložek).
+        width: Počet hexadecimálních znaků jména jedné podsložky.
+
+    Returns:
+        Tuple se jmény podsložek od nejvyšší úrovně.
+
+    Raises:
+        ValueError: Pokud rozložení potřebuje víc znaků, než má hash.
+    """
+    if levels <= 0:
+        return ()
+    if width <= 0 or levels * width > DIGEST_LENGTH:
+        raise ValueError(
+            f"Neplatné rozložení složek: {levels} úrovní po {width} znacích.")
+    digest = hashlib.md5(file_name.encode(), usedforsecurity=False).hexdigest()
+    return tuple(digest[i * width:(i + 1) * width] for i in range(levels))
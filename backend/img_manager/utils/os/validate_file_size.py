@@ -20,5 +20,28 @@ def validate_file_size(file_path: str, min_mb, max_mb) -> None:
         raise ValidationError(
             f"Velikost obrázku nesmí být menší než {min_mb} MB.")
     elif image_size > max_size_bytes:
+        raise ValidationError(
+            f"Velikost obrázku nesmí překročit {max_mb} MB.")
+
+
+def validate_size(file_size: int, min_mb, max_mb) -> None:
+    """
+    Metoda ověří velikost obrázku zadanou v bajtech (např. nahraného souboru
+    v paměti).
+
+    Args:
+        file_size: Velikost obrázku v bajtech.
+        min_mb: Minimální velikost obrázku pro ověření (MB).
+        max_mb: Maximální velikost obrázku pro ověření (MB).
+
+    Raises:
+        ValidationError: Pokud obrázek nevyhovuje nastaveným limitům.
+    """
+    min_size_bytes = min_mb * 1024 * 1024
+    max_size_bytes = max_mb * 1024 * 1024
+    if file_size < min_size_bytes:
+        raise ValidationError(
+            f"Velikost obrázku nesmí být menší než {min_mb} MB.")
+    elif file_size > max_size_bytes:
         raise ValidationError(
             f"Velikost obrázku nesmí překročit {max_mb} MB.")
\ No newline at end of file
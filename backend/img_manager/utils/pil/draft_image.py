@@ -0,0 +1,22 @@
+import math
+from PIL import Image
+
+
+def draft_square(image: Image.Image, side: int) -> None:
+    """
+    Nastaví JPEG dekodér tak, aby obrázek načetl rovnou zmenšený.
+
+    Dekodér zmenšuje v poměrech 1/2, 1/4 a 1/8 a nikdy pod požadovanou
+    velikost, takže středový čtverec obrázku bude mít stranu alespoň
+    ``side`` pixelů. U jiných formátů než JPEG nemá metoda žádný efekt.
+    Musí být zavolána před načtením obrazových dat.
+
+    Args:
+        image: Obrázek otevřený v PIL (dosud nenačtený).
+        side: Minimální strana středového čtverce po dekódování.
+    """
+    width, height = image.size
+    scale = side / min(width, height)
+    if scale >= 1:
+        return
+    image.draft('RGB', (math.ceil(width * scale), math.ceil(height * scale)))
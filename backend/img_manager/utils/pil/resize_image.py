@@ -18,13 +18,17 @@ def validate_tuple_with_two_integers(size: tuple):
     if not all(isinstance(dim, int) for dim in size):
         raise ValueError("Obě hodnoty v 'size' musí být celočíselné.")
 
-def resize_image(self, image: Image.Image, size: tuple) -> Image.Image:
+def resize_image(image: Image.Image, size: tuple, box: tuple = None,
+                 reducing_gap: float = None) -> Image.Image:
     """
     Metoda pro změnu velikosti obrázku podle daného rozměru.
 
     Args:
         image: Obrázek otevřený v PIL.
         size: Tuple pro nastavení velikosti obrázku.
+        box: Výřez obrázku, který se má zmenšit (bez kopie přes ``crop``).
+        reducing_gap: Pokud je zadán, obrázek se nejprve rychle zmenší
+            celočíselným ``reduce()`` a LANCZOS se počítá až z menšího obrázku.
 
     Returns:
         Obrázek se změněnou velikostí.
@@ -34,6 +38,7 @@ def resize_image(self, image: Image.Image, size: tuple) -> Image.Image:
     """
     try:
         validate_tuple_with_two_integers(size)
-        return image.resize(size, Image.LANCZOS)
+        return image.resize(size, Image.LANCZOS, box=box,
+                            reducing_gap=reducing_gap)
     except Exception as e:
         raise ValueError(f"Chyba při změně velikosti obrázku: {e}")
\ No newline at end of file
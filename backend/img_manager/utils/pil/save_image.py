@@ -1,3 +1,4 @@
+import io
 import os
 from PIL import Image
 
@@ -6,4 +7,21 @@ def save_image(self, img, path, format):
         saved_image = img.save(path, format=format)
         os.path.exists(saved_image)
     except shutil.Error as e:
-        print(f"Při ukládání souboru došlo k chybě: {e}")
\ No newline at end of file
+        print(f"Při ukládání souboru došlo k chybě: {e}")
+
+
+def encode_image(img: Image.Image, format: str, **params) -> bytes:
+    """
+    Zakóduje obrázek do bajtů v paměti (bez zápisu na disk).
+
+    Args:
+        img: Obrázek otevřený v PIL.
+        format: Formát obrázku (např. 'JPEG').
+        **params: Další parametry pro ``Image.save`` (např. dpi).
+
+    Returns:
+        Zakódovaný obrázek.
+    """
+    buffer = io.BytesIO()
+    img.save(buffer, format=format, **params)
+    return buffer.getvalue()
@@ -1,5 +1,6 @@
-import PIL
-def square_crop_center(self, image: Image.Image) -> Image.Image:
+from PIL import Image
+
+def square_crop_center(image: Image.Image) -> Image.Image:
     """
     Metoda ořeže obrázek na střed a poměr stran 1:1.
 
@@ -9,10 +10,21 @@ def square_crop_center(self, image: Image.Image) -> Image.Image:
     Returns:
         Vystředěný a čtvercově oříznutý obrázek.
     """
-    width, height = image.size
+    return image.crop(square_crop_box(image.size))
+
+
+def square_crop_box(size: tuple) -> tuple:
+    """
+    Vrátí výřez (left, top, right, bottom) středového čtverce obrázku.
+
+    Args:
+        size: Rozměry obrázku (šířka, výška).
+
+    Returns:
+        Tuple se souřadnicemi výřezu pro ``Image.crop`` nebo ``Image.resize``.
+    """
+    width, height = size
     new_size = min(width, height)
     left = (width - new_size) // 2
     top = (height - new_size) // 2
-    right = left + new_size
-    bottom = top + new_size
-    return image.crop((left, top, right, bottom))
\ No newline at end of file
+    return left, top, left + new_size, top + new_size
@@ -0,0 +1,91 @@
+from io import BytesIO
+from typing import Iterable, Optional, Tuple
+import logging
+import warnings
+
+from PIL import Image
+from django.core.exceptions import ValidationError
+
+# Leading bytes of the supported image formats
+MAGIC_BYTES = (
+    (b'\xff\xd8\xff', 'JPEG'),
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'GIF87a', 'GIF'),
+    (b'GIF89a', 'GIF'),
+)
+MAGIC_LENGTH = 16
+
+
+def detect_image_format(header: bytes) -> Optional[str]:
+    """Return the image format of the leading bytes of a file, if known.
+
+    Args:
+        header (bytes): At least the first 12 bytes of the file.
+
+    Returns:
+        Optional[str]: PIL format name ('JPEG', 'PNG', 'GIF', 'WEBP'),
+            None for unknown data.
+    """
+    for magic, image_format in MAGIC_BYTES:
+        if header.startswith(magic):
+            return image_format
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def validate_image_header(image, allowed_formats: Iterable[str],
+                          max_pixels: Optional[int] = None
+                          ) -> Tuple[str, Tuple[int, int]]:
+    """Validate an image from its header only, without decoding the pixels.
+
+    The format is detected from the magic bytes and the declared
+    dimensions are read by PIL's lazy ``Image.open``, which only parses the
+    header (usually the first few KB). Images above ``max_pixels`` or the
+    ``Image.MAX_IMAGE_PIXELS`` decompression bomb limit are rejected before
+    any pixel data is decoded.
+
+    Args:
+        image (bytes | BinaryIO): Image data or a seekable binary file
+            object. File objects are rewound to their original position.
+        allowed_formats (Iterable[str]): Accepted PIL format names.
+        max_pixels (Optional[int]): Maximum number of pixels (width x
+            height); None applies only ``Image.MAX_IMAGE_PIXELS``.
+
+    Returns:
+        Tuple[str, Tuple[int, int]]: The format and the declared size.
+
+    Raises:
+        ValidationError: If the format is not allowed, the header is
+            invalid or the image has too many pixels.
+    """
+    stream = BytesIO(image) if isinstance(
+        image, (bytes, bytearray, memoryview)) else image
+    allowed_formats = set(allowed_formats)
+    start = stream.tell()
+    try:
+        image_format = detect_image_format(stream.read(MAGIC_LENGTH))
+        if image_format not in allowed_formats:
+            raise ValidationError(
+                "The uploaded file is not a supported image format.")
+
+        stream.seek(start)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+                with Image.open(stream, formats=[image_format]) as img:
+                    width, height = img.size
+        except Image.DecompressionBombError as e:
+            raise ValidationError("The uploaded image is too large.") from e
+        except (OSError, SyntaxError, ValueError) as e:
+            logging.error("Failed to read image header", exc_info=True)
+            raise ValidationError(
+                "The uploaded file is not a valid image.") from e
+
+        limits = [limit for limit in (max_pixels, Image.MAX_IMAGE_PIXELS)
+                  if limit is not None]
+        if limits and width * height > min(limits):
+            raise ValidationError("The uploaded image is too large.")
+        return image_format, (width, height)
+    finally:
+        stream.seek(start)
@@ -1,3 +1,190 @@
-from django.shortcuts import render
+from typing import Optional
 
-# Create your views here.
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    HttpResponseRedirect,
+    JsonResponse,
+)
+from django.utils.http import parse_etags
+from django.views.decorators.http import require_safe
+
+from backend.shared_utils.environment.get_setting import get_setting
+from img_manager.core.path_handlers.get_path_handler import get_path_handler
+from img_manager.services.profile_images.avatar_lookup import avatar_lookup
+from img_manager.services.profile_images.avatars import (
+    AVATAR_FIELDS,
+    avatar_etag,
+    avatar_url,
+    get_image_name,
+    get_local_file,
+    resolve_avatar,
+)
+
+# Profile images are always encoded as JPEG (see NewImageProcessor)
+AVATAR_CONTENT_TYPE = 'image/jpeg'
+# Unversioned URLs may point to a new image at any time
+REVALIDATE = 'public, no-cache'
+
+
+@require_safe
+def avatar_view(request: HttpRequest, img_type: str,
+                user_id: Optional[int] = None,
+                slug: Optional[str] = None) -> HttpResponse:
+    """
+    Serve the current master or thumbnail of a user.
+
+    The response carries a strong ETag made of the image name and must be
+    revalidated; an ``If-None-Match`` with the current name is answered
+    with 304 after one indexed query, without reading the image. Pages
+    should prefer the immutable URL of ``avatar_versioned_view``.
+
+    Args:
+        request (HttpRequest): The incoming request.
+        img_type (str): 'master' or 'thumbnail'.
+        user_id (Optional[int]): ID of the user.
+        slug (Optional[str]): Slug of the user (if ``user_id`` is None).
+
+    Returns:
+        HttpResponse: The image, 304, or 404 for an unknown user or type.
+    """
+    relative_path = _resolve(img_type, user_id, slug)[1]
+    response = _not_modified(request, relative_path)
+    if response is None:
+        response = _serve(relative_path)
+    response['Cache-Control'] = REVALIDATE
+    return response
+
+
+@require_safe
+def avatar_versioned_view(request: HttpRequest, user_id: int, img_type: str,
+                          name: str) -> HttpResponse:
+    """
+    Serve an image of a user under a URL containing the image name.
+
+    The content of such a URL never changes, so it is cached as immutable
+    for PROFILE_IMAGE_CACHE_MAX_AGE seconds and a matching
+    ``If-None-Match`` is answered with 304 without any query or disk
+    access. A name that is no longer the user's image redirects to the
+    URL of the current one.
+
+    Args:
+        request (HttpRequest): The incoming request.
+        user_id (int): ID of the user.
+        img_type (str): 'master' or 'thumbnail'.
+        name (str): Name of the image.
+
+    Returns:
+        HttpResponse: The image, 304, a redirect, or 404.
+    """
+    if img_type not in AVATAR_FIELDS:
+        raise Http404("Unknown image type")
+    response = _not_modified(request, name)
+    if response is None:
+        user_id, relative_path = _resolve(img_type, user_id)
+        if get_image_name(relative_path) != name:
+            response = HttpResponseRedirect(
+                avatar_url(user_id, img_type, relative_path))
+            response['Cache-Control'] = REVALIDATE
+            return response
+        response = _serve(relative_path)
+    max_age = get_setting('PROFILE_IMAGE_CACHE_MAX_AGE', 31536000)
+    response['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    return response
+
+
+@require_safe
+def avatar_lookup_view(request: HttpRequest) -> JsonResponse:
+    """
+    Return avatar URLs of several users at once.
+
+    Users are given as comma-separated ``ids`` and ``slugs`` query
+    parameters (together at most PROFILE_IMAGE_LOOKUP_MAX). The URLs are
+    versioned (see ``avatar_versioned_view``).
+
+    Example:
+        GET /avatars/lookup/?ids=1,2&slugs=anna
+        {"avatars": {"1": {"id": 1, "slug": "...", "master": "...",
+                           "thumbnail": "..."}, "anna": {...}}}
+
+    Args:
+        request (HttpRequest): The incoming request.
+
+    Returns:
+        JsonResponse: Avatars keyed by the requested ID or slug (unknown
+            users are left out), 400 for invalid or too many users.
+    """
+    try:
+        user_ids = [int(user_id) for user_id in _split(request.GET.get('ids'))]
+        avatars = avatar_lookup.lookup(user_ids, _split(request.GET.get('slugs')))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'avatars': {
+        str(key): avatar.as_dict() for key, avatar in avatars.items()
+    }})
+
+
+def _split(value: Optional[str]) -> list:
+    """Split a comma-separated query parameter."""
+    return [item for item in (value or '').split(',') if item]
+
+
+def _resolve(img_type: str, user_id: Optional[int] = None,
+             slug: Optional[str] = None):
+    """Return (user ID, image path) of the avatar or raise Http404."""
+    if img_type not in AVATAR_FIELDS:
+        raise Http404("Unknown image type")
+    avatar = resolve_avatar(img_type, user_id, slug)
+    if avatar is None:
+        raise Http404("No such profile image")
+    return avatar
+
+
+def _not_modified(request: HttpRequest, name: str) -> Optional[HttpResponse]:
+    """Return 304 if the client already has the image (None otherwise)."""
+    etag = avatar_etag(name)
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match and etag in parse_etags(if_none_match):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+    return None
+
+
+def _serve(relative_path: str) -> HttpResponse:
+    """
+    Return the body of an image.
+
+    Local media files are offloaded to the web server when
+    PROFILE_IMAGE_SENDFILE is 'x-sendfile' (absolute path) or
+    'x-accel-redirect' (PROFILE_IMAGE_SENDFILE_PREFIX + relative path, an
+    internal location of the server); otherwise they are streamed. Images
+    in the object store or the thumbnail pack are read through the path
+    handler.
+    """
+    path_handler = get_path_handler()
+    local_file = get_local_file(path_handler, relative_path)
+    sendfile = get_setting('PROFILE_IMAGE_SENDFILE', '')
+    try:
+        if local_file is not None and sendfile:
+            response = HttpResponse(content_type=AVATAR_CONTENT_TYPE)
+            if sendfile == 'x-accel-redirect':
+                prefix = get_setting('PROFILE_IMAGE_SENDFILE_PREFIX',
+                                     '/protected-media/')
+                location = f"{prefix.rstrip('/')}/{relative_path}"
+                response['X-Accel-Redirect'] = location
+            else:
+                response['X-Sendfile'] = str(local_file)
+        elif local_file is not None:
+            response = FileResponse(open(local_file, 'rb'),
+                                    content_type=AVATAR_CONTENT_TYPE)
+        else:
+            response = HttpResponse(path_handler.get(relative_path),
+                                    content_type=AVATAR_CONTENT_TYPE)
+    except FileNotFoundError:
+        raise Http404("Profile image file not found")
+    response['ETag'] = avatar_etag(relative_path)
+    return response
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_image_changed',
+            field=models.DateTimeField(blank=True, db_index=True, null=True, verbose_name='Profile Image Changed'),
+        ),
+    ]
@@ -1,12 +1,17 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.utils.text import slugify
 
 from .managers.custom_user_managers import CustomUserManager
-# from .utils.username_utils import unique_username_from_email
+from .mixins.dirty_fields_mixin import DirtyFieldsMixin
+from ..utils.username_utils import (
+    USERNAME_SAVE_ATTEMPTS,
+    unique_username_from_email,
+)
 # from .utils.profile_image_validation import validate_image_and_size
 
-class CustomUser(AbstractUser):
+class CustomUser(DirtyFieldsMixin, AbstractUser):
 
     email = models.EmailField(
         verbose_name='Email',
@@ -45,6 +50,14 @@ class CustomUser(AbstractUser):
         default=dict,
     )
 
+    # Čas poslední změny profilového obrázku (pro inkrementální kontrolu)
+    profile_image_changed = models.DateTimeField(
+        verbose_name='Profile Image Changed',
+        null=True,
+        blank=True,
+        db_index=True,
+    )
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
@@ -55,10 +68,17 @@ class CustomUser(AbstractUser):
         # Automatické vytvoření unikátního username (Pokud není nastaveno)
         if not self.username:
             self.username = unique_username_from_email(self.email)
-
-        # Automatické vytvoření slugu (Pokud neodpovídá slugu)
-        if self.slug != slugify(self.username):
-            self.slug = slugify(self.username)
+            self._save_with_generated_username(*args, **kwargs)
+            return
+
+        # Automatické vytvoření slugu (Jen při změně username nebo slugu)
+        if self.get_dirty_fields(['username', 'slug']):
+            slug = slugify(self.username)
+            if self.slug != slug:
+                self.slug = slug
+                update_fields = kwargs.get('update_fields')
+                if update_fields is not None and 'slug' not in update_fields:
+                    kwargs['update_fields'] = [*update_fields, 'slug']
 
         # # Zpracování profilového obrázku
         # if self.pk:
@@ -70,6 +90,29 @@ class CustomUser(AbstractUser):
 
         super().save(*args, **kwargs)
 
+    def _save_with_generated_username(self, *args, **kwargs):
+        """
+        Uloží uživatele s vygenerovaným jménem (insert-and-retry).
+
+        Pokud jméno nebo jeho slug mezi výpočtem a vložením obsadila souběžná
+        registrace, vložení selže na unikátním indexu; jméno se pak vygeneruje
+        znovu (nejvýše USERNAME_SAVE_ATTEMPTS pokusů). Jiné porušení
+        unikátnosti (např. email) se předá dál.
+        """
+        for attempt in range(1, USERNAME_SAVE_ATTEMPTS + 1):
+            self.slug = slugify(self.username)
+            try:
+                with transaction.atomic(using=kwargs.get('using')):
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                taken = CustomUser._default_manager.using(
+                    kwargs.get('using')).filter(
+                    Q(username=self.username) | Q(slug=self.slug)
+                ).exclude(pk=self.pk).exists()
+                if not taken or attempt == USERNAME_SAVE_ATTEMPTS:
+                    raise
+                self.username = unique_username_from_email(self.email)
 
 
 
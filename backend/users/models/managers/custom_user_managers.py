@@ -5,13 +5,68 @@ This module contains a custom user manager that extends Django's BaseUserManager
 to handle user creation and superuser creation with email as the unique identifier.
 """
 
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import time
+
 from django.contrib.auth.base_user import BaseUserManager
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from backend.shared_utils.database.close_connections import \
+    close_connections_before_fork
+from backend.shared_utils.database.init_worker import init_worker
+from users.utils.username_utils import (
+    UsernameAllocator,
+    taken_usernames_and_slugs,
+    username_base,
+)
+
+
+@dataclass
+class BulkCreateReport:
+    """
+    Throughput of ``CustomUserManager.bulk_create_users``.
+
+    Attributes:
+        created (int): Number of inserted users.
+        hashing_seconds (float): Time spent hashing passwords.
+        insert_seconds (float): Time spent allocating usernames and
+            inserting the users.
+        workers (int): Number of processes hashing the passwords.
+    """
+    created: int
+    hashing_seconds: float
+    insert_seconds: float
+    workers: int
+
+    @property
+    def seconds(self) -> float:
+        return self.hashing_seconds + self.insert_seconds
+
+    @property
+    def users_per_second(self) -> float:
+        return self.created / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"Created {self.created} users in {self.seconds:.1f} s "
+                f"({self.users_per_second:.0f} users/s; hashing "
+                f"{self.hashing_seconds:.1f} s with {self.workers} workers, "
+                f"insert {self.insert_seconds:.1f} s)")
 
 
 class CustomUserManager(BaseUserManager):
     """
     Custom user manager for creating users and superusers with email."""
 
+    # Number of users inserted by one bulk_create
+    BULK_BATCH_SIZE = 1000
+
     def create_user(self, email: str, password: str, **extra_fields) -> 'User':
         """
         Create and save a regular user with the given email and password.
@@ -62,4 +117,141 @@ class CustomUserManager(BaseUserManager):
         if extra_fields.get("is_superuser") is not True:
             raise ValueError("Superuser must have is_superuser=True.")
 
-        return self.create_user(email, password, **extra_fields)
\ No newline at end of file
+        return self.create_user(email, password, **extra_fields)
+
+    def bulk_create_users(self, rows: Iterable[Dict],
+                          batch_size: Optional[int] = None,
+                          workers: int = 1) -> BulkCreateReport:
+        """
+        Create many users at once (e.g. an import from another system).
+
+        Unlike ``create_user`` called per row, passwords are hashed in
+        ``workers`` processes, missing usernames and slugs are allocated in
+        memory against the usernames and slugs loaded by
+        ``_username_allocator``, and the users are inserted with
+        ``bulk_create`` in one transaction. A given username keeps its name;
+        if its slug is taken, the first free ``slug1``, ``slug2``, ... is
+        used.
+        Users get the shared default profile images by reference (no file
+        is copied). ``save`` is not called for the users.
+
+        Args:
+            rows: Dicts with 'email', 'password' and optionally 'username'
+                and other fields of the user model.
+            batch_size: Users inserted by one query
+                (default BULK_BATCH_SIZE).
+            workers: Number of processes hashing the passwords.
+
+        Returns:
+            BulkCreateReport: Number of created users and the throughput.
+
+        Raises:
+            ValueError: If a row has no email or password.
+            IntegrityError: If an email or a given username already exists.
+        """
+        rows = [dict(row) for row in rows]
+        for row in rows:
+            if not row.get('email'):
+                raise ValueError("E-mail must be provided.")
+            if not row.get('password'):
+                raise ValueError("Password must be provided.")
+
+        start = time.perf_counter()
+        passwords = self._hash_passwords(
+            [row.pop('password') for row in rows], workers)
+        hashing_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        defaults = self._default_image_fields()
+        allocator = self._username_allocator(rows)
+        slugs = [allocator.reserve(row['username'])
+                 if row.get('username') else None for row in rows]
+
+        users: List = []
+        for row, slug, password in zip(rows, slugs, passwords):
+            email = self.normalize_email(row.pop('email'))
+            username = row.pop('username', None)
+            if not username:
+                username = allocator.allocate(username_base(email))
+                slug = slugify(username)
+            fields = {**defaults,
+                      'backup_data': dict(defaults['backup_data']), **row}
+            users.append(self.model(email=email, username=username,
+                                    slug=slug, password=password, **fields))
+
+        with transaction.atomic(using=self.db):
+            self.bulk_create(users, batch_size=batch_size or self.BULK_BATCH_SIZE)
+
+        return BulkCreateReport(
+            created=len(users),
+            hashing_seconds=hashing_seconds,
+            insert_seconds=time.perf_counter() - start,
+            workers=max(1, workers),
+        )
+
+    @staticmethod
+    def _hash_passwords(passwords: List[str], workers: int) -> List[str]:
+        """Hash the passwords, in worker processes if configured."""
+        if workers <= 1 or len(passwords) <= 1:
+            return [make_password(password) for password in passwords]
+
+        # Forked workers must not share the DB connections of this process;
+        # all hashing is done before the import touches the database again
+        close_connections_before_fork()
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=init_worker) as executor:
+            return list(executor.map(make_password, passwords,
+                                     chunksize=chunksize))
+
+    def _username_allocator(self, rows: List[Dict]) -> UsernameAllocator:
+        """
+        Load the usernames and slugs the imported users can collide with.
+
+        Given usernames and their slugs are looked up exactly (one query per
+        batch). The bases of generated usernames, and the slugs that are
+        taken or shared by several rows (so their free numbered variant can
+        be picked), are then looked up by prefix, ``BASES_PER_QUERY`` of
+        them in one query.
+        """
+        allocator = UsernameAllocator()
+        given = [row['username'] for row in rows if row.get('username')]
+        for index in range(0, len(given), self.BULK_BATCH_SIZE):
+            batch = given[index:index + self.BULK_BATCH_SIZE]
+            allocator.update(*self._taken(
+                Q(username__in=batch)
+                | Q(slug__in=[slugify(username) for username in batch])))
+
+        slug_counts = Counter(slugify(username) for username in given)
+        prefixes = [slug for slug, count in slug_counts.items()
+                    if count > 1 or slug in allocator.slugs]
+        prefixes.extend(username_base(row['email'])
+                        for row in rows if not row.get('username'))
+        allocator.update(*taken_usernames_and_slugs(*prefixes))
+        return allocator
+
+    def _taken(self, condition: Q) -> Tuple[Set[str], Set[str]]:
+        """Return the usernames and slugs of the users matching condition."""
+        usernames, slugs = set(), set()
+        for username, slug in self.filter(condition).values_list(
+                'username', 'slug'):
+            usernames.add(username)
+            slugs.add(slug)
+        return usernames, slugs
+
+    @staticmethod
+    def _default_image_fields() -> Dict:
+        """Return the profile image fields of a user with default images."""
+        from img_manager.core.path_handlers.get_path_handler import \
+            get_path_handler
+
+        path_handler = get_path_handler()
+        master = str(path_handler.get_shared_default('master'))
+        thumbnail = str(path_handler.get_shared_default('thumbnail'))
+        return {
+            'profile_image': master,
+            'profile_image_thumbnail': thumbnail,
+            'backup_data': {'profile_image': master,
+                            'profile_image_thumbnail': thumbnail},
+            'profile_image_changed': timezone.now(),
+        }
@@ -0,0 +1,113 @@
+"""
+Provides DirtyFieldsMixin for saving only the changed fields of a model.
+
+The mixin remembers the values of the fields loaded from the database and
+``save`` of an existing instance writes only the fields changed since then
+(``update_fields``), so saves after a login or an image change update a
+few columns instead of the whole row.
+"""
+
+import copy
+from typing import Dict, Iterable, Optional, Set
+
+from django.db import models
+
+# Value of a field not loaded from the database (deferred)
+_NOT_LOADED = object()
+
+
+class DirtyFieldsMixin:
+    """
+    Model mixin tracking fields changed since the instance was loaded.
+
+    The mixin is listed before the model base class (it has no fields and
+    no Meta, so the Meta of the model base is inherited as before).
+
+    Instances created in code (not loaded) are saved with all fields, as
+    are saves with ``force_insert``; after every save the saved values
+    become the new loaded state. File fields are compared by name and
+    JSON values are copied, so in-place changes of a dict are detected.
+
+    Example:
+        user = CustomUser.objects.get(pk=1)
+        user.last_name = "Doe"
+        user.get_dirty_fields()  # {'last_name'}
+        user.save()  # UPDATE ... SET last_name = ...
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._store_loaded_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields,
+                                from_queryset=from_queryset)
+        self._store_loaded_values(fields)
+
+    def get_dirty_fields(self, names: Optional[Iterable[str]] = None
+                         ) -> Set[str]:
+        """
+        Return names of the fields changed since the instance was loaded.
+
+        Args:
+            names (Optional[Iterable[str]]): Check only these fields
+                (all concrete fields if None).
+
+        Returns:
+            Set[str]: Names of changed fields; all checked non-primary-key
+                fields if the instance was not loaded from the database.
+        """
+        loaded = self.__dict__.get('_loaded_values')
+        fields = [field for field in self._meta.concrete_fields
+                  if not field.primary_key]
+        if names is not None:
+            names = set(names)
+            fields = [field for field in fields if field.name in names]
+        if loaded is None:
+            return {field.name for field in fields}
+        return {
+            field.name for field in fields
+            if field.attname in self.__dict__
+            and loaded.get(field.attname, _NOT_LOADED)
+            != self._field_state(field, copy_value=False)
+        }
+
+    def save(self, *args, **kwargs):
+        """
+        Save the instance, writing only the dirty fields of a loaded one.
+
+        An explicit ``update_fields`` is respected; an instance without
+        changes is not written at all.
+        """
+        if (kwargs.get('update_fields') is None and not args
+                and not kwargs.get('force_insert')
+                and not self._state.adding
+                and self.__dict__.get('_loaded_values') is not None):
+            kwargs['update_fields'] = self.get_dirty_fields()
+        super().save(*args, **kwargs)
+        self._store_loaded_values(kwargs.get('update_fields'))
+
+    def _store_loaded_values(self, fields: Optional[Iterable[str]] = None
+                             ) -> None:
+        """Remember the current values of the fields (all if None)."""
+        loaded: Dict[str, object] = self.__dict__.get('_loaded_values') or {}
+        names = set(fields) if fields is not None else None
+        for field in self._meta.concrete_fields:
+            if names is not None and field.name not in names \
+                    and field.attname not in names:
+                continue
+            if field.attname in self.__dict__:
+                loaded[field.attname] = self._field_state(field)
+        self.__dict__['_loaded_values'] = loaded
+
+    def _field_state(self, field: models.Field,
+                     copy_value: bool = True) -> object:
+        """Return a comparable value of a field (a copy if mutable)."""
+        value = getattr(self, field.attname)
+        if isinstance(field, models.FileField):
+            return value.name if value else ''
+        if copy_value and isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
@@ -0,0 +1,126 @@
+"""
+Tests for CustomUserManager.bulk_create_users.
+
+This module contains unit tests for the bulk import of users: usernames and
+slugs allocated against existing users, slugs of given usernames
+deduplicated, passwords hashed (also in worker processes), shared default
+profile images and the throughput report.
+"""
+
+from pathlib import Path
+import tempfile
+
+from PIL import Image
+from django.test import TestCase, override_settings
+
+from users.models.custom_user import CustomUser
+from users.utils.username_utils import BASES_PER_QUERY
+from img_manager.core.config.profile_images.paths import ProfileImagePaths
+from img_manager.core.path_handlers import path_handler_local
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class BulkCreateUsersTests(TestCase):
+    """Test cases for bulk_create_users."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self._settings = override_settings(
+            MEDIA_ROOT=str(self.root / 'media'),
+            STATIC_ROOT=str(self.root / 'static'),
+            PASSWORD_HASHERS=FAST_HASHERS,
+            PROFILE_IMAGE_STORAGE_BACKEND='local',
+            PROFILE_IMAGE_THUMBNAIL_PACK=False,
+        )
+        self._settings.enable()
+        path_handler_local._load_shared_default.cache_clear()
+        path_handler_local._installed_shared_defaults.clear()
+        for img_type in ('master', 'thumbnail'):
+            source = (self.root / 'static'
+                      / ProfileImagePaths().get_default_image_path(img_type))
+            source.parent.mkdir(parents=True, exist_ok=True)
+            Image.new('RGB', (64, 64), 'gray').save(source, format='JPEG')
+        CustomUser.objects.create(email="info@example.com", username="info")
+
+    def tearDown(self):
+        self._settings.disable()
+        self._temp_dir.cleanup()
+
+    def test_bulk_create(self):
+        """Test usernames, slugs, passwords and default images of new users."""
+        rows = [
+            {'email': "info@example.org", 'password': "secret1"},
+            {'email': "Info@Example.net", 'password': "secret2"},
+            {'email': "anna@example.com", 'password': "secret3",
+             'username': "info2", 'first_name': "Anna"},
+        ]
+
+        # Given name, taken names of the base, two batches of inserts,
+        # the savepoint and its release
+        with self.assertNumQueries(6):
+            report = CustomUser.objects.bulk_create_users(rows, batch_size=2)
+
+        self.assertEqual(report.created, 3)
+        users = {user.email: user for user in CustomUser.objects.all()}
+        self.assertEqual(users["info@example.org"].username, "info1")
+        self.assertEqual(users["Info@example.net"].username, "info3")
+        self.assertEqual(users["anna@example.com"].slug, "info2")
+        self.assertEqual(users["anna@example.com"].first_name, "Anna")
+        self.assertTrue(users["info@example.org"].check_password("secret1"))
+
+        master = users["info@example.org"].profile_image.name
+        self.assertEqual(users["anna@example.com"].profile_image.name, master)
+        self.assertEqual(users["anna@example.com"].backup_data['profile_image'],
+                         master)
+        self.assertTrue((self.root / 'media' / master).is_file())
+
+    def test_given_username_with_taken_slug(self):
+        """Test that slugs of given usernames are deduplicated."""
+        rows = [
+            {'email': "anna@example.com", 'password': "secret1",
+             'username': "Info"},
+            {'email': "eva@example.com", 'password': "secret2",
+             'username': "INFO"},
+            {'email': "info@example.org", 'password': "secret3"},
+        ]
+
+        CustomUser.objects.bulk_create_users(rows)
+
+        users = {user.email: user for user in CustomUser.objects.all()}
+        self.assertEqual(users["anna@example.com"].username, "Info")
+        self.assertEqual(users["anna@example.com"].slug, "info1")
+        self.assertEqual(users["eva@example.com"].slug, "info2")
+        self.assertEqual(users["info@example.org"].username, "info3")
+        self.assertEqual(users["info@example.org"].slug, "info3")
+
+    def test_bases_loaded_in_batches(self):
+        """Test that taken names of many bases are loaded in few queries."""
+        rows = [{'email': f"user{i}@example.com", 'password': "secret"}
+                for i in range(2 * BASES_PER_QUERY + 1)]
+        rows.append({'email': "info@example.org", 'password': "secret"})
+
+        with self.assertNumQueries(3):
+            allocator = CustomUser.objects._username_allocator(rows)
+
+        self.assertEqual(allocator.allocate('info'), 'info1')
+        self.assertEqual(allocator.allocate('user7'), 'user7')
+
+    def test_hashing_in_workers(self):
+        """Test passwords hashed in a process pool."""
+        rows = [{'email': f"user{i}@example.com", 'password': f"secret{i}"}
+                for i in range(4)]
+
+        report = CustomUser.objects.bulk_create_users(rows, workers=2)
+
+        self.assertEqual(report.workers, 2)
+        self.assertIn("users/s", str(report))
+        user = CustomUser.objects.get(email="user3@example.com")
+        self.assertTrue(user.check_password("secret3"))
+
+    def test_missing_password(self):
+        """Test that a row without a password raises ValueError."""
+        with self.assertRaises(ValueError):
+            CustomUser.objects.bulk_create_users([{'email': "a@example.com"}])
+        self.assertEqual(CustomUser.objects.count(), 1)
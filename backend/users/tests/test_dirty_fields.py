@@ -0,0 +1,76 @@
+"""
+Tests for the dirty-field tracking of CustomUser.
+
+This module contains unit tests for DirtyFieldsMixin on the CustomUser
+model: detection of changed fields (also in-place changes of JSON data),
+saves writing only the changed columns and the slug recomputed only after
+a change of the username.
+"""
+
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from users.models import custom_user
+from users.models.custom_user import CustomUser
+
+
+class DirtyFieldsTests(TestCase):
+    """Test cases for the dirty-field tracking."""
+
+    def setUp(self):
+        CustomUser.objects.create(email="anna@example.com", username="anna")
+        self.user = CustomUser.objects.get(email="anna@example.com")
+
+    def test_dirty_fields(self):
+        """Test fields reported as changed since the load."""
+        self.assertEqual(self.user.get_dirty_fields(), set())
+
+        self.user.first_name = "Anna"
+        self.user.backup_data['profile_image'] = 'users/a.jpg'
+        self.user.profile_image = 'users/a.jpg'
+
+        self.assertEqual(self.user.get_dirty_fields(),
+                         {'first_name', 'backup_data', 'profile_image'})
+
+    def test_save_writes_changed_fields(self):
+        """Test that only changed columns are updated."""
+        self.user.first_name = "Anna"
+
+        with CaptureQueriesContext(connection) as queries:
+            self.user.save()
+
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertIn('"first_name"', sql)
+        self.assertNotIn('"email"', sql)
+        self.assertEqual(self.user.get_dirty_fields(), set())
+
+        with self.assertNumQueries(0):
+            self.user.save()
+
+    def test_slug_only_after_username_change(self):
+        """Test that the slug is recomputed only when the username changed."""
+        with mock.patch.object(custom_user, 'slugify',
+                               wraps=custom_user.slugify) as slugify:
+            self.user.last_name = "Doe"
+            self.user.save()
+            slugify.assert_not_called()
+
+            self.user.username = "Anna.Doe"
+            self.user.save()
+            slugify.assert_called_once_with("Anna.Doe")
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.slug, "annadoe")
+
+    def test_explicit_update_fields(self):
+        """Test that the slug is added to explicit update_fields."""
+        self.user.username = "hana"
+        self.user.save(update_fields=['username'])
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.slug, "hana")
+        self.assertEqual(self.user.get_dirty_fields(), set())
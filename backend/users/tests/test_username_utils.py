@@ -0,0 +1,85 @@
+"""
+Tests for the generation of unique usernames.
+
+This module contains unit tests for `unique_username_from_email` and the
+retry of `CustomUser.save` when a generated username or its slug is taken
+by a concurrent sign-up.
+"""
+
+from unittest import mock
+
+from django.db.utils import IntegrityError
+from django.test import TestCase
+
+from users.models.custom_user import CustomUser
+from users.utils.username_utils import (
+    next_free_username,
+    unique_username_from_email,
+)
+
+
+class UsernameUtilsTests(TestCase):
+    """Test cases for the username generation."""
+
+    def _create(self, username):
+        return CustomUser.objects.create(
+            email=f"{username}@example.com", username=username)
+
+    def test_one_query_for_colliding_prefix(self):
+        """Test that the next free suffix is found with one query."""
+        for username in ("info", "info1", "info2", "info4", "information"):
+            self._create(username)
+
+        with self.assertNumQueries(1):
+            username = unique_username_from_email("Info@example.com")
+        self.assertEqual(username, "info3")
+
+    def test_next_free_username(self):
+        """Test the suffix computed from a set of taken usernames."""
+        self.assertEqual(next_free_username("john", set()), "john")
+        self.assertEqual(next_free_username("john", {"john", "john1"}), "john2")
+
+    def test_retry_on_concurrent_signup(self):
+        """Test that a username taken before the insert is generated again."""
+        self._create("anna")
+        real = unique_username_from_email
+
+        with mock.patch(
+            "users.models.custom_user.unique_username_from_email",
+            side_effect=["anna", real("anna@example.org")],
+        ):
+            user = CustomUser.objects.create_user(
+                email="anna@example.org", password="password123")
+
+        self.assertEqual(user.username, "anna1")
+        self.assertEqual(user.slug, "anna1")
+
+    def test_taken_slug_is_skipped(self):
+        """Test that a username whose slug is taken is not generated."""
+        CustomUser.objects.create(email="anna@example.com", username="Anna")
+
+        self.assertEqual(unique_username_from_email("anna@example.org"),
+                         "anna1")
+
+    def test_retry_on_concurrent_slug(self):
+        """Test that a username whose slug got taken is generated again."""
+        CustomUser.objects.create(email="anna@example.com", username="Anna")
+        real = unique_username_from_email
+
+        with mock.patch(
+            "users.models.custom_user.unique_username_from_email",
+            side_effect=["anna", real("anna@example.org")],
+        ):
+            user = CustomUser.objects.create_user(
+                email="anna@example.org", password="password123")
+
+        self.assertEqual(user.username, "anna1")
+        self.assertEqual(user.slug, "anna1")
+
+    def test_other_integrity_error_is_raised(self):
+        """Test that a duplicate email is not retried."""
+        self._create("anna")
+
+        with self.assertRaises(IntegrityError):
+            CustomUser.objects.create_user(
+                email="anna@example.com", password="password123")
@@ -1,3 +1,15 @@
+from typing import Container, Dict, Iterable, Set, Tuple
+
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Počet pokusů o uložení uživatele, jehož vygenerované jméno mezitím
+# obsadila souběžná registrace
+USERNAME_SAVE_ATTEMPTS = 5
+
+# Počet základů jmen, jejichž obsazená jména a slugy načte jeden dotaz
+BASES_PER_QUERY = 100
+
 
 def unique_username_check(username):
     # Vytvoření jedinečného jména z uživatelovo emailu
@@ -12,16 +24,135 @@ def unique_username_check(username):
     #
     # return username
 
-def unique_username_from_email(email):
-    # Vytvoření jedinečného jména z uživatelovo emailu
 
-    base_username = email.split('@')[0].lower()
-    username = base_username
-    counter = 1
+def username_base(email: str) -> str:
+    """Vrátí základ uživatelského jména (část emailu před @ malými písmeny)."""
+    return email.split('@')[0].lower()
+
+
+def taken_usernames_and_slugs(*bases: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Vrátí obsazená jména a slugy, které začínají některým ze základů.
+
+    Podmínky ``username__startswith`` a ``slug__startswith`` používají
+    indexy, které Django pro unikátní textové sloupce vytváří (na PostgreSQL
+    ``varchar_pattern_ops``). Slug jména ``base`` + číslo vždy začíná slugem
+    základu, takže výsledek pokrývá všechna jména řady ``base``, ``base1``...
+    Podmínky pro ``BASES_PER_QUERY`` základů se spojí do jednoho dotazu.
+
+    Args:
+        *bases (str): Základy uživatelských jmen.
+
+    Returns:
+        Tuple[Set[str], Set[str]]: Obsazená jména a obsazené slugy.
+    """
+    from users.models.custom_user import CustomUser
+
+    bases = list(dict.fromkeys(bases))
+    usernames, slugs = set(), set()
+    for index in range(0, len(bases), BASES_PER_QUERY):
+        condition = Q()
+        for base in bases[index:index + BASES_PER_QUERY]:
+            condition |= (Q(username__startswith=base)
+                          | Q(slug__startswith=slugify(base)))
+        for username, slug in CustomUser.objects.filter(
+                condition).values_list('username', 'slug'):
+            usernames.add(username)
+            slugs.add(slug)
+    return usernames, slugs
+
+
+def next_free_username(base: str, taken: Container[str]) -> str:
+    """
+    Vrátí první volné jméno z řady ``base``, ``base1``, ``base2``, ...
+
+    Args:
+        base (str): Základ uživatelského jména.
+        taken (Container[str]): Obsazená jména.
 
-    from ..custom_user import CustomUser
-    while CustomUser.objects.filter(username=username).exists():
-        username = f"{base_username}{counter}"
+    Returns:
+        str: Volné uživatelské jméno.
+    """
+    username = base
+    counter = 1
+    while username in taken:
+        username = f"{base}{counter}"
         counter += 1
+    return username
+
+
+def unique_username_from_email(email):
+    """
+    Vytvoří jedinečné uživatelské jméno z emailu uživatele.
+
+    Obsazená jména a slugy se načtou jedním dotazem a volná přípona se
+    dopočítá v Pythonu (dříve jeden dotaz na každé číslo přípony). Jméno je
+    volné, pokud není obsazené ono ani jeho slug. Jméno může do uložení
+    obsadit souběžná registrace; ``CustomUser.save`` proto při
+    IntegrityError vygeneruje jméno znovu.
+
+    Args:
+        email (str): Email uživatele.
+
+    Returns:
+        str: Jedinečné uživatelské jméno.
+    """
+    base_username = username_base(email)
+    allocator = UsernameAllocator(*taken_usernames_and_slugs(base_username))
+    return allocator.allocate(base_username)
+
+
+class UsernameAllocator:
+    """
+    Přiděluje jedinečná jména a slugy mnoha uživatelům bez dotazů.
+
+    Obsazená jména a slugy se předají předem (např. načtené dotazem na
+    prefix každého základu před hromadným importem) a přidělená jména se
+    k nim přidávají. Pro každý základ si pamatuje poslední použité číslo,
+    takže N uživatelů se stejným základem stojí O(N), ne O(N²).
+
+    Example:
+        allocator = UsernameAllocator(usernames, slugs)
+        allocator.allocate('info')  # 'info3'
+    """
+
+    def __init__(self, usernames: Iterable[str] = (),
+                 slugs: Iterable[str] = ()):
+        self.usernames: Set[str] = set(usernames)
+        self.slugs: Set[str] = set(slugs)
+        self._counters: Dict[str, int] = {}
+
+    def update(self, usernames: Iterable[str] = (),
+               slugs: Iterable[str] = ()) -> None:
+        """Přidá další obsazená jména a slugy (např. pro další základ)."""
+        self.usernames.update(usernames)
+        self.slugs.update(slugs)
+
+    def reserve(self, username: str) -> str:
+        """
+        Označí jméno (zadané uživatelem) jako obsazené a vrátí jeho slug.
+
+        Je-li slug jména již obsazený, použije se první volný slug z řady
+        ``slug``, ``slug1``, ``slug2``, ...
+        """
+        self.usernames.add(username)
+        slug = next_free_username(slugify(username), self.slugs)
+        self.slugs.add(slug)
+        return slug
+
+    def allocate(self, base: str) -> str:
+        """
+        Vrátí a obsadí první volné jméno z řady ``base``, ``base1``, ...
 
-    return username
\ No newline at end of file
+        Jméno je volné, pokud není obsazené ono ani jeho slug.
+        """
+        counter = self._counters.get(base, 0)
+        while True:
+            username = f"{base}{counter}" if counter else base
+            counter += 1
+            if (username not in self.usernames
+                    and slugify(username) not in self.slugs):
+                break
+        self._counters[base] = counter
+        self.reserve(username)
+        return username